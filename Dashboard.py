@@ -1,26 +1,52 @@
 # dashboard_defense_brics_avance.py
+import time
+# Début du rerun, avant les imports : le premier rendu à froid compte leur chargement
+DEPART_SCRIPT = time.perf_counter()
+import html
+import threading
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
 import warnings
+
+from caching import (cache_comparaisons, cache_donnees, cache_figures, cache_previsions, cache_scenarios,
+                     cache_sensibilites)
+from data_layer import (BRANCHES_OPTIONS, INDICATEURS_KPI, PAYS_MEMBRES, PROGRAMMES_OPTIONS, SELECTION_SCENARIOS,
+                        generer_comparaison, generer_donnees, get_advanced_config, instantane_kpi, normaliser_base_100)
+from data_sources import source_donnees
+from diagnostics import MESURES_RENDU, chronometrage, instrumenter_sections
+from downsampling import budget_par_trace, indices_lttb, trace_ligne
+from forecast_engine import MODELES, NIVEAUX_CONFIANCE, ajuster_modeles, prevoir
+from instantane import charger_instantane
+from lazy_imports import importer_differe
+from precompute import charger_artefact
+from project_index import FACETTES, TRIS, index_projets
+from recompute_graph import GrapheRecalcul, memes_arguments
+from records import tableau
+from scenario_engine import INDICATEURS_SCENARIO, OPTIONS_TRAJECTOIRES, SCENARIOS, simuler_scenario
+from sensitivity_engine import INDICATEURS_SENSIBLES, LIBELLES_PARAMETRES, PLANS, analyser_sensibilite
+from simulation_engine import axe_temporel
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse Stratégique Avancée - BRICS",
-    page_icon="🌍",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Bibliothèques lourdes chargées à la première utilisation par une section
+pd = importer_differe("pandas")
+px = importer_differe("plotly.express")
+go = importer_differe("plotly.graph_objects")
+plotly_subplots = importer_differe("plotly.subplots")
+
+# Projets par page de la liste des coopérations
+PROJETS_PAR_PAGE = 20
+
+# Couleur de chaque membre dans les graphiques de comparaison
+COULEURS_MEMBRES = {
+    "Chine": "#DE2910",
+    "Russie": "#0039A6",
+    "Inde": "#FF9933",
+    "Brésil": "#009C3B",
+    "Afrique du Sud": "#FFB612"
+}
 
-# CSS personnalisé avancé
-st.markdown("""
+# CSS personnalisé avancé, repris par le rapport HTML hors ligne
+CSS_DASHBOARD = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -92,180 +118,196 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
+def configure_page():
+    """Configuration de la page et CSS, avant tout autre élément Streamlit"""
+    # Configuration de la page
+    st.set_page_config(
+        page_title="Analyse Stratégique Avancée - BRICS",
+        page_icon="🌍",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # CSS personnalisé avancé
+    st.markdown(CSS_DASHBOARD, unsafe_allow_html=True)
+
+# Chaque section (create_*, display_*, render_*) et la génération des données sont chronométrées
+@instrumenter_sections()
 class DefenseBricsDashboardAvance:
+    """Modèle immuable (options, graphe de recalcul) partagé par les sessions ; état du rerun par thread"""
+    
     def __init__(self):
         self.branches_options = self.define_branches_options()
         self.programmes_options = self.define_programmes_options()
-        self.member_capabilities = self.define_member_capabilities()
-        self.cooperation_projects = self.define_cooperation_projects()
+        self.sections_options = self.define_sections_options()
+        self.recompute_graph = self.define_recompute_graph()
+        # Chaque rerun s'exécute dans le thread de sa session : exécution du graphe et gains du cache
+        self._rerun = threading.local()
+    
+    @property
+    def execution(self):
+        return getattr(self._rerun, "execution", None)
+    
+    @execution.setter
+    def execution(self, execution):
+        self._rerun.execution = execution
+    
+    @property
+    def temps_figures_economise(self):
+        return getattr(self._rerun, "temps_figures_economise", 0.0)
+    
+    @temps_figures_economise.setter
+    def temps_figures_economise(self, secondes):
+        self._rerun.temps_figures_economise = secondes
+    
+    @property
+    def member_capabilities(self):
+        # Relu à chaque accès : la source ne relit la table que si sa version a changé
+        return self.define_member_capabilities()
+    
+    @property
+    def cooperation_projects(self):
+        return self.define_cooperation_projects()
         
     def define_branches_options(self):
-        return [
-            "BRICS - Vue d'Ensemble", "Chine", "Russie", "Inde", 
-            "Brésil", "Afrique du Sud", "Coopérations BRICS",
-            "Nouveaux Membres (2024)"
-        ]
+        return tuple(BRANCHES_OPTIONS)
     
     def define_programmes_options(self):
-        return [
-            "Coopération Militaire BRICS", "Exercices Conjoints", 
-            "Transferts de Technologie", "Défense Anti-Missile",
-            "Marine BRICS", "Cybersécurité Collective",
-            "Industrie de Défense Intégrée"
-        ]
+        return tuple(PROGRAMMES_OPTIONS)
+    
+    def define_sections_options(self):
+        return (
+            "📊 Tableau de Bord", 
+            "🔬 Analyse Technique", 
+            "🌍 Contexte Géopolitique", 
+            "🇧🇷🇷🇺🇮🇳🇨🇳🇿🇦 Membres BRICS",
+            "⚖️ Comparaison Membres",
+            "⚠️ Évaluation Menaces",
+            "🤝 Coopérations BRICS",
+            "🎚️ Sensibilité du Modèle",
+            "💎 Synthèse Stratégique"
+        )
+    
+    def define_recompute_graph(self):
+        """Données et figures dépendant des contrôles du sidebar, recalculées seulement si ceux-ci changent
+
+        Chaque nœud est construit par la méthode que passent les sections à
+        get_node_value, avec les mêmes arguments positionnels.
+        """
+        graphe = GrapheRecalcul()
+        # Les données ne dépendent pas du scénario : seules les bandes Monte Carlo en dépendent
+        graphe.ajouter("donnees", self.get_cached_data, controles=("selection",),
+                       arguments=lambda selection: (selection,))
+        graphe.ajouter("bandes", self.get_scenario_bands, controles=("selection", "scenario", "n_trajectoires"),
+                       arguments=lambda selection, scenario, n_trajectoires: (selection, scenario, n_trajectoires))
+        graphe.ajouter("kpi", instantane_kpi, parents=("donnees",), arguments=lambda donnees: (donnees[0],))
+        graphe.ajouter("figure_capacites", self.build_capabilities_figure, parents=("donnees",),
+                       arguments=lambda donnees: (donnees[0],))
+        graphe.ajouter("figure_cooperations", self.build_strategic_cooperation_figure, parents=("donnees",),
+                       arguments=lambda donnees: (donnees[0],))
+        graphe.ajouter("figures_eventails", self.build_scenario_fan_figures,
+                       controles=("scenario",), parents=("donnees", "bandes"),
+                       arguments=lambda scenario, donnees, bandes: (donnees[0], scenario, bandes))
+        graphe.ajouter("figure_cooperation_structuree", self.build_structured_cooperation_figure,
+                       parents=("donnees",), arguments=lambda donnees: (donnees[0],))
+        # Tous les membres à la fois : indépendant de la sélection
+        graphe.ajouter("comparaison", self.get_comparison_cube, arguments=lambda: ())
+        # Ajustés une fois par jeu de données : changer d'horizon ne fait que projeter
+        graphe.ajouter("previsions", self.get_forecast_models, controles=("selection",),
+                       arguments=lambda selection: (selection,))
+        return graphe
     
     def define_member_capabilities(self):
-        return {
-            "Chine": {
-                "budget": 230.0,
-                "personnel": 2035,
-                "nucleaire": "Oui",
-                "porte_avions": 3,
-                "icbm": "DF-41, DF-31AG",
-                "technologies": "Hypersonique, IA, Cyber"
-            },
-            "Russie": {
-                "budget": 65.0,
-                "personnel": 1014,
-                "nucleaire": "Oui", 
-                "porte_avions": 1,
-                "icbm": "RS-28 Sarmat, RS-24 Yars",
-                "technologies": "Hypersonique, Guerre électronique"
-            },
-            "Inde": {
-                "budget": 73.0,
-                "personnel": 1455,
-                "nucleaire": "Oui",
-                "porte_avions": 2,
-                "icbm": "Agni-V, Agni-VI",
-                "technologies": "Missiles, Spatial, Cyber"
-            },
-            "Brésil": {
-                "budget": 22.0,
-                "personnel": 334,
-                "nucleaire": "Non",
-                "porte_avions": 0,
-                "forces": "Amazonie, Surveillance maritime",
-                "technologies": "Sous-marins, Systèmes de surveillance"
-            },
-            "Afrique du Sud": {
-                "budget": 3.0,
-                "personnel": 72,
-                "nucleaire": "Non",
-                "forces": "Forces spéciales, Paix ONU",
-                "technologies": "Cybersécurité, Renseignement"
-            }
-        }
+        return source_donnees().capacites_membres()
     
     def define_cooperation_projects(self):
-        return {
-            "Exercice Naval BRICS": {"pays": "Tous", "type": "Exercice conjoint", "statut": "Actif", "frequence": "Annuel"},
-            "Système de Communication Sécurisé": {"pays": "Chine/Russie/Inde", "type": "Communication", "statut": "Développement", "objectif": "2026"},
-            "Centre Cyber BRICS": {"pays": "Chine/Russie", "type": "Cybersécurité", "statut": "Opérationnel", "localisation": "Moscou/Pékin"},
-            "Développement Missilistique": {"pays": "Chine/Russie/Inde", "type": "Technologie", "statut": "Coopération", "domaines": "Hypersonique, Croisière"},
-            "Surveillance Spatiale": {"pays": "Chine/Russie", "type": "Espace", "statut": "Partage données", "satellites": "Reconnaissance"}
-        }
+        return source_donnees().projets_cooperation()
     
-    def generate_advanced_data(self, selection):
+    def generate_advanced_data(self, selection, debut=2000, fin=2027, resolution="annuelle"):
         """Génère des données avancées et détaillées pour les BRICS"""
-        annees = list(range(2000, 2028))
-        
-        config = self.get_advanced_config(selection)
-        
-        data = {
-            'Annee': annees,
-            'Budget_Defense_Mds': self.simulate_advanced_budget(annees, config),
-            'Personnel_Milliers': self.simulate_advanced_personnel(annees, config),
-            'PIB_Militaire_Pourcent': self.simulate_military_gdp_percentage(annees),
-            'Exercices_Militaires': self.simulate_advanced_exercises(annees, config),
-            'Readiness_Operative': self.simulate_advanced_readiness(annees),
-            'Capacite_Dissuasion': self.simulate_advanced_deterrence(annees),
-            'Temps_Mobilisation_Jours': self.simulate_advanced_mobilization(annees),
-            'Exercices_Conjoints': self.simulate_joint_exercises(annees),
-            'Developpement_Technologique': self.simulate_tech_development(annees),
-            'Capacite_Navale': self.simulate_naval_capacity(annees),
-            'Couverture_AD': self.simulate_air_defense_coverage(annees),
-            'Cooperation_Structured': self.simulate_structured_cooperation(annees),
-            'Cyber_Capabilities': self.simulate_cyber_capabilities(annees),
-            'Production_Armements': self.simulate_weapon_production(annees)
-        }
-        
-        # Données spécifiques aux programmes
-        if 'cooperation' in config.get('priorites', []):
-            data.update({
-                'Projets_Cooperation': self.simulate_cooperation_projects(annees),
-                'Echanges_Technologiques': self.simulate_tech_exchanges(annees),
-                'Exercices_BRICS': self.simulate_brics_exercises(annees)
-            })
-        
-        if 'nucleaire' in config.get('priorites', []):
-            data.update({
-                'Stock_Ogives_Nucleaires': self.simulate_nuclear_arsenal(annees),
-                'Portee_Missiles_Km': self.simulate_missile_range(annees),
-                'Triade_Nucleaire': self.simulate_nuclear_triad(annees)
-            })
-        
-        if 'marine' in config.get('priorites', []):
-            data.update({
-                'Porte_Avions': self.simulate_aircraft_carriers(annees),
-                'Sous_Marins': self.simulate_submarines(annees),
-                'Projection_Maritime': self.simulate_maritime_projection(annees)
-            })
-        
-        if 'innovation' in config.get('priorites', []):
-            data.update({
-                'Recherche_Defense': self.simulate_defense_research(annees),
-                'Technologies_Emergentes': self.simulate_emerging_tech(annees),
-                'Exportations_Armes': self.simulate_weapon_exports(annees)
-            })
-        
-        return pd.DataFrame(data), config
+        return generer_donnees(selection, debut, fin, resolution)
+    
+    def get_cached_data(self, selection, debut=2000, fin=2027, resolution="annuelle"):
+        """Données générées, partagées entre sessions via le cache du processus (lecture seule)"""
+        def calcul():
+            # Vue précalculée lue depuis l'artefact projeté en mémoire, sinon simulation
+            artefact = charger_artefact()
+            df = artefact.donnees(selection, debut, fin, resolution) if artefact else None
+            if df is None:
+                return self.generate_advanced_data(selection, debut, fin, resolution)
+            return df, self.get_advanced_config(selection)
+        
+        cle = (selection, debut, fin, resolution)
+        return cache_donnees.get_or_compute(cle, calcul)
+    
+    def get_scenario_bands(self, selection, scenario, n_trajectoires, debut=2000, fin=2027, resolution="annuelle"):
+        """Bandes P5/P50/P95 du scénario Monte Carlo, partagées entre sessions"""
+        def calcul():
+            artefact = charger_artefact()
+            bandes = artefact.bandes(selection, scenario, n_trajectoires, debut, fin, resolution) if artefact else None
+            if bandes is not None:
+                return bandes
+            df, _ = self.get_cached_data(selection, debut, fin, resolution)
+            base = {nom: df[nom].to_numpy() for nom in INDICATEURS_SCENARIO}
+            return simuler_scenario(df['Annee'].to_numpy(), base, scenario, n_trajectoires)
+        
+        cle = (selection, scenario, n_trajectoires, debut, fin, resolution)
+        return cache_scenarios.get_or_compute(cle, calcul)
+    
+    def get_comparison_cube(self, membres=tuple(PAYS_MEMBRES), debut=2000, fin=2027, resolution="annuelle"):
+        """Cube membre × période × indicateur calculé en un seul appel, partagé entre sessions"""
+        cle = (tuple(membres), debut, fin, resolution)
+        return cache_comparaisons.get_or_compute(cle, lambda: generer_comparaison(membres, debut, fin, resolution))
+    
+    def get_sensitivity_analysis(self, selection, indicateur, plan, n_evaluations, amplitude,
+                                 debut=2000, fin=2027, resolution="annuelle"):
+        """Sensibilité d'un indicateur à ses coefficients, évaluée en un seul lot et partagée entre sessions"""
+        cle = (selection, indicateur, plan, n_evaluations, amplitude, debut, fin, resolution)
+        return cache_sensibilites.get_or_compute(cle, lambda: analyser_sensibilite(
+            indicateur, self.get_advanced_config(selection), axe_temporel(debut, fin, resolution),
+            plan, n_evaluations, amplitude / 100
+        ))
+    
+    def get_forecast_models(self, selection, debut=2000, fin=2027, resolution="annuelle"):
+        """Modèles de prévision ajustés à tous les indicateurs des données, partagés entre sessions"""
+        def calcul():
+            df, _ = self.get_cached_data(selection, debut, fin, resolution)
+            indicateurs = [nom for nom in df.columns if nom != 'Annee']
+            return ajuster_modeles(df['Annee'].to_numpy(), df[indicateurs].to_numpy(), indicateurs)
+        
+        cle = (selection, debut, fin, resolution)
+        return cache_previsions.get_or_compute(cle, calcul)
+    
+    def get_snapshot_memory(self):
+        """Mémoire du graphe pour une nouvelle session, amorcée avec l'instantané de la vue par défaut"""
+        instantane = charger_instantane()
+        return instantane.memoire_graphe(self.recompute_graph) if instantane else {}
+    
+    def plot_cached_figure(self, nom, donnees, construction):
+        """Affiche une figure construite une seule fois par contenu de données, partagée entre sessions"""
+        fig, gain = cache_figures.figure(nom, donnees, construction)
+        self.temps_figures_economise += gain
+        self.render_figure(fig)
+    
+    def render_figure(self, fig):
+        """Envoie une figure au navigateur (sérialisation Plotly chronométrée à part)"""
+        st.plotly_chart(fig, use_container_width=True)
+    
+    def get_node_value(self, nom, construction, *args):
+        """Valeur d'un nœud du graphe de recalcul ; calcul direct hors rerun du dashboard,
+        ou si les arguments ne sont pas ceux du nœud sur ce rerun (autre sélection, autre DataFrame)"""
+        if self.execution is None:
+            return construction(*args)
+        attendus = self.execution.arguments(nom)
+        if attendus is not None and not memes_arguments(args, attendus):
+            return construction(*args)
+        return self.execution.valeur(nom)
     
     def get_advanced_config(self, selection):
         """Configuration avancée avec plus de détails pour les BRICS"""
-        configs = {
-            "BRICS - Vue d'Ensemble": {
-                "type": "alliance_multipolaire",
-                "budget_base": 400.0,
-                "personnel_base": 4900,
-                "exercices_base": 180,
-                "priorites": ["cooperation", "nucleaire", "marine", "innovation", "cyber"],
-                "doctrines": ["Multipolarité", "Souveraineté stratégique", "Défense collective"],
-                "objectifs": "Contrepoids à l'hégémonie occidentale"
-            },
-            "Chine": {
-                "type": "puissance_mondiale",
-                "budget_base": 230.0,
-                "personnel_base": 2035,
-                "priorites": ["marine", "missiles", "cyber", "espace"],
-                "capacites": ["Force de frappe nucléaire", "Marine bleue", "Guerre électronique"],
-                "doctrine": "Défense active périphérique"
-            },
-            "Russie": {
-                "type": "puissance_nucleaire",
-                "budget_base": 65.0,
-                "personnel_base": 1014,
-                "priorites": ["nucleaire", "missiles", "cyber", "asymetrique"],
-                "capacites": ["Triade nucléaire", "Systèmes hypersoniques", "Guerre hybride"],
-                "doctrine": "Dissuasion stratégique élargie"
-            },
-            "Coopérations BRICS": {
-                "type": "cooperation_strategique",
-                "budget_base": 15.0,
-                "priorites": ["exercices_conjoints", "transfert_technologie", "intelligence_collective"],
-                "projets": ["Exercices navals", "Centre cyber", "Systèmes C4ISR"],
-                "objectifs": "Autonomie stratégique collective"
-            }
-        }
-        
-        return configs.get(selection, {
-            "type": "membre_brics",
-            "personnel_base": 300,
-            "exercices_base": 25,
-            "priorites": ["defense_generique"]
-        })
+        return get_advanced_config(selection)
     
     def simulate_advanced_budget(self, annees, config):
         """Simulation avancée du budget avec variations géopolitiques"""
@@ -443,11 +485,11 @@ class DefenseBricsDashboardAvance:
         if type_analyse == "Vue d'Ensemble BRICS":
             selection = st.sidebar.selectbox("Niveau d'analyse:", self.branches_options)
         elif type_analyse == "Analyse par Pays":
-            selection = st.sidebar.selectbox("Pays membre:", ["Chine", "Russie", "Inde", "Brésil", "Afrique du Sud"])
+            selection = st.sidebar.selectbox("Pays membre:", PAYS_MEMBRES)
         elif type_analyse == "Coopérations Stratégiques":
             selection = st.sidebar.selectbox("Programme de coopération:", self.programmes_options)
         else:
-            selection = "Scénarios Géopolitiques"
+            selection = SELECTION_SCENARIOS
         
         # Options avancées
         st.sidebar.markdown("### 🔧 OPTIONS AVANCÉES")
@@ -455,10 +497,19 @@ class DefenseBricsDashboardAvance:
         show_cooperation = st.sidebar.checkbox("Analyse des coopérations", value=True)
         show_technical = st.sidebar.checkbox("Détails techniques", value=True)
         threat_assessment = st.sidebar.checkbox("Évaluation des menaces", value=True)
+        rendu_a_la_demande = st.sidebar.checkbox("Rendu à la demande des onglets", value=True,
+                                                 help="Ne construit que l'onglet affiché")
+        diagnostics = st.sidebar.checkbox("Diagnostics de rendu", value=False,
+                                          help="Durées par section sur ce rendu et percentiles glissants")
         
         # Paramètres de simulation
         st.sidebar.markdown("### ⚙️ PARAMÈTRES DE SIMULATION")
-        scenario = st.sidebar.selectbox("Scénario:", ["Coopération Renforcée", "Expansion BRICS+", "Confrontation avec l'Occident", "Autonomie Stratégique"])
+        scenario = st.sidebar.selectbox("Scénario:", list(SCENARIOS))
+        n_trajectoires = st.sidebar.select_slider("Trajectoires Monte Carlo:",
+                                                  options=OPTIONS_TRAJECTOIRES, value=10_000)
+        
+        # Filtres de la base des coopérations
+        filtres_projets = self.create_project_filters()
         
         return {
             'selection': selection,
@@ -467,17 +518,39 @@ class DefenseBricsDashboardAvance:
             'show_cooperation': show_cooperation,
             'show_technical': show_technical,
             'threat_assessment': threat_assessment,
-            'scenario': scenario
+            'rendu_a_la_demande': rendu_a_la_demande,
+            'diagnostics': diagnostics,
+            'scenario': scenario,
+            'n_trajectoires': n_trajectoires,
+            'filtres_projets': filtres_projets
         }
     
+    def create_project_filters(self):
+        """Facettes des projets de coopération, chaque valeur suivie de son nombre de projets sous les autres filtres"""
+        index = index_projets(self.cooperation_projects)
+        libelles = {"pays": "Pays participants:", "type": "Type:", "statut": "Statut:"}
+        
+        # Les widgets ont déjà leur nouvelle valeur dans l'état de session : les comptes suivent la saisie
+        filtres = {facette: st.session_state.get(f"filtre_{facette}", []) for facette in FACETTES}
+        comptes = index.comptes_facettes(filtres, st.session_state.get("filtre_recherche", ""))
+        
+        with st.sidebar.expander("🔎 FILTRES DES PROJETS"):
+            recherche = st.text_input("Mots-clés:", key="filtre_recherche")
+            for facette in FACETTES:
+                filtres[facette] = st.multiselect(
+                    libelles[facette], index.valeurs[facette], key=f"filtre_{facette}",
+                    format_func=lambda valeur, facette=facette: f"{valeur} ({comptes[facette].get(valeur, 0)})"
+                )
+        return {**filtres, 'recherche': recherche}
+    
     def display_strategic_metrics(self, df, config):
         """Métriques stratégiques avancées"""
         st.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE BRICS</h3>', 
                    unsafe_allow_html=True)
         
-        derniere_annee = df['Annee'].max()
-        data_actuelle = df[df['Annee'] == derniere_annee].iloc[0]
-        data_2000 = df[df['Annee'] == 2000].iloc[0]
+        # Valeurs des cartes et variations depuis 2000, lues par position sur l'index de périodes
+        kpi = self.get_node_value("kpi", instantane_kpi, df)
+        actuel, croissance = kpi['actuel'], kpi['croissance_pct']
         
         # Première ligne de métriques
         col1, col2, col3, col4 = st.columns(4)
@@ -489,7 +562,7 @@ class DefenseBricsDashboardAvance:
                 <h2>{:.0f} Md$</h2>
                 <p>📈 {:.1f}% du PIB BRICS</p>
             </div>
-            """.format(data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
+            """.format(actuel['Budget_Defense_Mds'], actuel['PIB_Militaire_Pourcent']), 
             unsafe_allow_html=True)
         
         with col2:
@@ -499,8 +572,7 @@ class DefenseBricsDashboardAvance:
                 <h2>{:,.0f}K</h2>
                 <p>⚔️ +{:.1f}% depuis 2000</p>
             </div>
-            """.format(data_actuelle['Personnel_Milliers'], 
-                     ((data_actuelle['Personnel_Milliers'] - data_2000['Personnel_Milliers']) / data_2000['Personnel_Milliers']) * 100), 
+            """.format(actuel['Personnel_Milliers'], croissance['Personnel_Milliers']), 
             unsafe_allow_html=True)
         
         with col3:
@@ -510,8 +582,8 @@ class DefenseBricsDashboardAvance:
                 <h2>{:.0f}%</h2>
                 <p>🚀 {} ogives stratégiques</p>
             </div>
-            """.format(data_actuelle['Capacite_Dissuasion'], 
-                     int(data_actuelle.get('Stock_Ogives_Nucleaires', 0))), 
+            """.format(actuel['Capacite_Dissuasion'], 
+                     int(np.nan_to_num(actuel['Stock_Ogives_Nucleaires']))), 
             unsafe_allow_html=True)
         
         with col4:
@@ -521,49 +593,43 @@ class DefenseBricsDashboardAvance:
                 <h2>{:.0f}%</h2>
                 <p>🔧 {} projets conjoints</p>
             </div>
-            """.format(data_actuelle['Cooperation_Structured'], 
-                     int(data_actuelle.get('Projets_Cooperation', 0))), 
+            """.format(actuel['Cooperation_Structured'], 
+                     int(np.nan_to_num(actuel['Projets_Cooperation']))), 
             unsafe_allow_html=True)
         
         # Deuxième ligne de métriques
         col5, col6, col7, col8 = st.columns(4)
         
         with col5:
-            reduction_temps = ((data_2000['Temps_Mobilisation_Jours'] - data_actuelle['Temps_Mobilisation_Jours']) / 
-                             data_2000['Temps_Mobilisation_Jours']) * 100
             st.metric(
                 "⏱️ Temps Mobilisation",
-                f"{data_actuelle['Temps_Mobilisation_Jours']:.1f} jours",
-                f"{reduction_temps:+.1f}%"
+                f"{actuel['Temps_Mobilisation_Jours']:.1f} jours",
+                f"{-croissance['Temps_Mobilisation_Jours']:+.1f}%"
             )
         
         with col6:
-            croissance_navale = ((data_actuelle['Capacite_Navale'] - data_2000['Capacite_Navale']) / 
-                               data_2000['Capacite_Navale']) * 100
             st.metric(
                 "🌊 Puissance Navale",
-                f"{data_actuelle['Capacite_Navale']:.1f}%",
-                f"{croissance_navale:+.1f}%"
+                f"{actuel['Capacite_Navale']:.1f}%",
+                f"{croissance['Capacite_Navale']:+.1f}%"
             )
         
         with col7:
             if 'Portee_Missiles_Km' in df.columns:
-                croissance_portee = ((data_actuelle['Portee_Missiles_Km'] - data_2000.get('Portee_Missiles_Km', 2000)) / 
-                                   data_2000.get('Portee_Missiles_Km', 2000)) * 100
                 st.metric(
                     "🎯 Portée Missiles Moyenne",
-                    f"{data_actuelle['Portee_Missiles_Km']:,.0f} km",
-                    f"{croissance_portee:+.1f}%"
+                    f"{actuel['Portee_Missiles_Km']:,.0f} km",
+                    f"{croissance['Portee_Missiles_Km']:+.1f}%"
                 )
         
         with col8:
             st.metric(
                 "📊 Préparation Opérationnelle",
-                f"{data_actuelle['Readiness_Operative']:.1f}%",
-                f"+{(data_actuelle['Readiness_Operative'] - data_2000['Readiness_Operative']):.1f}%"
+                f"{actuel['Readiness_Operative']:.1f}%",
+                f"+{kpi['variation']['Readiness_Operative']:.1f}%"
             )
     
-    def create_comprehensive_analysis(self, df, config):
+    def create_comprehensive_analysis(self, df, config, scenario=None, bandes=None):
         """Analyse complète multidimensionnelle"""
         st.markdown('<h3 class="section-header">📊 ANALYSE MULTIDIMENSIONNELLE BRICS</h3>', 
                    unsafe_allow_html=True)
@@ -573,64 +639,125 @@ class DefenseBricsDashboardAvance:
         
         with col1:
             # Évolution des capacités principales
-            fig = go.Figure()
-            
-            capacites = ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Cooperation_Structured']
-            noms = ['Préparation Opér.', 'Dissuasion Strat.', 'Capacités Cyber', 'Coopération BRICS']
-            couleurs = ['#FF9933', '#0055A4', '#4B0082', '#008000']
-            
-            for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
-                if cap in df.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df['Annee'], y=df[cap],
-                        mode='lines', name=nom,
-                        line=dict(color=couleur, width=4),
-                        hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
-                    ))
-            
-            fig.update_layout(
-                title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES BRICS (2000-2027)",
-                xaxis_title="Année",
-                yaxis_title="Niveau de Capacité (%)",
-                height=500,
-                template="plotly_white",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_figure(self.get_node_value("figure_capacites", self.build_capabilities_figure, df))
         
         with col2:
             # Analyse des coopérations stratégiques
-            strategic_data = []
-            strategic_names = []
-            
-            if 'Exercices_Conjoints' in df.columns:
-                strategic_data.append(df['Exercices_Conjoints'])
-                strategic_names.append('Exercices Conjoints')
-            
-            if 'Projets_Cooperation' in df.columns:
-                strategic_data.append(df['Projets_Cooperation'])
-                strategic_names.append('Projets Coopération')
-            
-            if 'Echanges_Technologiques' in df.columns:
-                strategic_data.append(df['Echanges_Technologiques'])
-                strategic_names.append('Échanges Technologiques')
-            
-            if strategic_data:
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                
-                for i, (data, nom) in enumerate(zip(strategic_data, strategic_names)):
-                    fig.add_trace(
-                        go.Scatter(x=df['Annee'], y=data, name=nom,
-                                 line=dict(width=4)),
-                        secondary_y=(i > 0)
-                    )
-                
-                fig.update_layout(
-                    title="🤝 COOPÉRATIONS STRATÉGIQUES - ÉVOLUTION COMPARÉE",
-                    height=500,
-                    template="plotly_white"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            fig = self.get_node_value("figure_cooperations", self.build_strategic_cooperation_figure, df)
+            if fig is not None:
+                self.render_figure(fig)
+        
+        # Éventails Monte Carlo du scénario sélectionné
+        if bandes:
+            self.create_scenario_fan_charts(df, scenario, bandes)
+    
+    def build_capabilities_figure(self, df):
+        """Évolution des capacités stratégiques principales"""
+        fig = go.Figure()
+        
+        capacites = ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Cooperation_Structured']
+        noms = ['Préparation Opér.', 'Dissuasion Strat.', 'Capacités Cyber', 'Coopération BRICS']
+        couleurs = ['#FF9933', '#0055A4', '#4B0082', '#008000']
+        
+        presentes = [cap for cap in capacites if cap in df.columns]
+        for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
+            if cap in df.columns:
+                fig.add_trace(trace_ligne(
+                    df['Annee'], df[cap], n_traces=len(presentes),
+                    mode='lines', name=nom,
+                    line=dict(color=couleur, width=4),
+                    hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
+                ))
+        
+        fig.update_layout(
+            title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES BRICS (2000-2027)",
+            xaxis_title="Année",
+            yaxis_title="Niveau de Capacité (%)",
+            height=500,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    
+    def build_strategic_cooperation_figure(self, df):
+        """Coopérations stratégiques comparées, ou None sans indicateur de coopération"""
+        strategic_data = []
+        strategic_names = []
+        
+        if 'Exercices_Conjoints' in df.columns:
+            strategic_data.append(df['Exercices_Conjoints'])
+            strategic_names.append('Exercices Conjoints')
+        
+        if 'Projets_Cooperation' in df.columns:
+            strategic_data.append(df['Projets_Cooperation'])
+            strategic_names.append('Projets Coopération')
+        
+        if 'Echanges_Technologiques' in df.columns:
+            strategic_data.append(df['Echanges_Technologiques'])
+            strategic_names.append('Échanges Technologiques')
+        
+        if not strategic_data:
+            return None
+        
+        fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
+        
+        for i, (data, nom) in enumerate(zip(strategic_data, strategic_names)):
+            fig.add_trace(
+                trace_ligne(df['Annee'], data, n_traces=len(strategic_data), name=nom,
+                          line=dict(width=4)),
+                secondary_y=(i > 0)
+            )
+        
+        fig.update_layout(
+            title="🤝 COOPÉRATIONS STRATÉGIQUES - ÉVOLUTION COMPARÉE",
+            height=500,
+            template="plotly_white"
+        )
+        return fig
+    
+    def create_scenario_fan_charts(self, df, scenario, bandes):
+        """Éventails P5/P50/P95 des indicateurs du scénario"""
+        st.markdown(f"#### 🎲 SCÉNARIO « {scenario.upper()} » - BANDES MONTE CARLO P5 / P50 / P95")
+        
+        figures = self.get_node_value("figures_eventails", self.build_scenario_fan_figures, df, scenario, bandes)
+        colonnes = st.columns(2)
+        for i, fig in enumerate(figures):
+            with colonnes[i % 2]:
+                self.render_figure(fig)
+    
+    def build_scenario_fan_figures(self, df, scenario, bandes):
+        """Une figure en éventail par indicateur du scénario"""
+        titres = {
+            'Budget_Defense_Mds': "💰 Budget Défense (Md$)",
+            'Readiness_Operative': "📊 Préparation Opérationnelle (%)",
+            'Capacite_Navale': "🌊 Capacité Navale (%)",
+            'Cyber_Capabilities': "💻 Capacités Cyber (%)"
+        }
+        couleurs = {
+            'Budget_Defense_Mds': ('#FF9933', 'rgba(255, 153, 51, 0.25)'),
+            'Readiness_Operative': ('#0055A4', 'rgba(0, 85, 164, 0.25)'),
+            'Capacite_Navale': ('#008000', 'rgba(0, 128, 0, 0.25)'),
+            'Cyber_Capabilities': ('#4B0082', 'rgba(75, 0, 130, 0.25)')
+        }
+        
+        figures = []
+        for indicateur, (p5, p50, p95) in bandes.items():
+            ligne, remplissage = couleurs[indicateur]
+            # Points communs aux quatre traces (choisis sur la médiane) pour que la bande reste fermée
+            communs = indices_lttb(df['Annee'], p50, budget_par_trace(4))
+            fig = go.Figure()
+            fig.add_trace(trace_ligne(df['Annee'], p95, indices=communs, mode='lines', line=dict(width=0),
+                                      name='P95', showlegend=False))
+            fig.add_trace(trace_ligne(df['Annee'], p5, indices=communs, mode='lines', line=dict(width=0),
+                                      fill='tonexty', fillcolor=remplissage, name='P5 - P95'))
+            fig.add_trace(trace_ligne(df['Annee'], p50, indices=communs, mode='lines', name='Médiane (P50)',
+                                      line=dict(color=ligne, width=3)))
+            fig.add_trace(trace_ligne(df['Annee'], df[indicateur], indices=communs, mode='lines', name='Référence',
+                                      line=dict(color='grey', width=2, dash='dash')))
+            fig.update_layout(title=titres[indicateur], height=350, template="plotly_white",
+                              legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+            figures.append(fig)
+        return figures
     
     def create_geopolitical_analysis(self, df, config):
         """Analyse géopolitique avancée"""
@@ -670,29 +797,35 @@ class DefenseBricsDashboardAvance:
                 'Membres': [5, 5, 5, 5, 5, 5, 11],
                 'PIB_Mondial': [18, 19, 23, 24, 26, 27, 32]  # %
             }
-            expansion_df = pd.DataFrame(expansion_data)
-            
-            fig = px.line(expansion_df, x='Année', y='Membres', 
-                         title="📈 EXPANSION DES BRICS - MEMBRES ET INFLUENCE",
-                         labels={'Membres': 'Nombre de Membres'},
-                         markers=True)
-            fig.add_trace(go.Scatter(x=expansion_df['Année'], y=expansion_df['PIB_Mondial'], 
-                                   mode='lines+markers', name='Part du PIB Mondial (%)',
-                                   yaxis='y2'))
-            fig.update_layout(yaxis2=dict(title='Part du PIB Mondial (%)', overlaying='y', side='right'))
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("expansion", expansion_data, self.build_expansion_figure)
             
             # Indice de coopération stratégique
-            cooperation = [min(20 + 4 * (annee - 2009), 75) for annee in df['Annee'] if annee >= 2009] + [0] * (2009 - min(df['Annee']))
-            annees_coop = [annee for annee in df['Annee'] if annee >= 2009] + [2009] * (2009 - min(df['Annee']))
-            
-            fig = px.area(x=annees_coop, y=cooperation,
-                         title="🕊️ COOPÉRATION STRATÉGIQUE BRICS",
-                         labels={'x': 'Année', 'y': 'Niveau de Coopération (%)'})
-            fig.update_traces(fillcolor='rgba(255, 153, 51, 0.3)', line_color='#FF9933')
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_figure(self.get_node_value("figure_cooperation_structuree",
+                                                   self.build_structured_cooperation_figure, df))
+    
+    def build_structured_cooperation_figure(self, df):
+        """Indice de coopération stratégique structurée"""
+        fig = go.Figure(trace_ligne(df['Annee'], df['Cooperation_Structured'], mode='lines', fill='tozeroy',
+                                    fillcolor='rgba(255, 153, 51, 0.3)', line_color='#FF9933',
+                                    hovertemplate="Année: %{x}<br>Niveau: %{y:.1f}%<extra></extra>"))
+        fig.update_layout(title="🕊️ COOPÉRATION STRATÉGIQUE BRICS", xaxis_title='Année',
+                          yaxis_title='Niveau de Coopération (%)', height=300)
+        return fig
+    
+    def build_expansion_figure(self, expansion_data):
+        """Expansion des BRICS : membres et part du PIB mondial"""
+        expansion_df = pd.DataFrame(expansion_data)
+        
+        fig = px.line(expansion_df, x='Année', y='Membres', 
+                     title="📈 EXPANSION DES BRICS - MEMBRES ET INFLUENCE",
+                     labels={'Membres': 'Nombre de Membres'},
+                     markers=True)
+        fig.add_trace(go.Scatter(x=expansion_df['Année'], y=expansion_df['PIB_Mondial'], 
+                               mode='lines+markers', name='Part du PIB Mondial (%)',
+                               yaxis='y2'))
+        fig.update_layout(yaxis2=dict(title='Part du PIB Mondial (%)', overlaying='y', side='right'))
+        fig.update_layout(height=400)
+        return fig
     
     def create_member_analysis(self, df, config):
         """Analyse des capacités des membres"""
@@ -702,25 +835,16 @@ class DefenseBricsDashboardAvance:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Contributions des membres
-            contributions_data = []
-            for pays, data in self.member_capabilities.items():
-                contributions_data.append({
-                    'Pays': pays,
-                    'Budget (Md$)': data['budget'],
-                    'Personnel (K)': data['personnel'],
-                    'Nucléaire': data['nucleaire'],
-                    'Technologies': data['technologies']
-                })
-            
-            contributions_df = pd.DataFrame(contributions_data)
+            # Contributions des membres, en colonnes lues champ par champ dans les enregistrements
+            contributions_data = tableau(self.member_capabilities.values(), {
+                'Pays': 'pays',
+                'Budget (Md$)': 'budget',
+                'Personnel (K)': 'personnel',
+                'Nucléaire': 'nucleaire',
+                'Technologies': 'technologies'
+            })
             
-            fig = px.bar(contributions_df, x='Pays', y='Budget (Md$)',
-                        title="💰 CONTRIBUTIONS BUDGÉTAIRES DES MEMBRES",
-                        color='Budget (Md$)',
-                        color_continuous_scale='viridis')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("contributions", contributions_data, self.build_contributions_figure)
         
         with col2:
             # Cartographie des capacités spécialisées
@@ -745,18 +869,207 @@ class DefenseBricsDashboardAvance:
                 'Brésil': [5, 0, 4, 5, 5, 5],
                 'Afrique du Sud': [3, 0, 3, 3, 6, 7]
             }
-            advantages_df = pd.DataFrame(advantages_data)
-            
-            fig = go.Figure(data=[
-                go.Bar(name='Chine', x=advantages_df['Domaine'], y=advantages_df['Chine']),
-                go.Bar(name='Russie', x=advantages_df['Domaine'], y=advantages_df['Russie']),
-                go.Bar(name='Inde', x=advantages_df['Domaine'], y=advantages_df['Inde']),
-                go.Bar(name='Brésil', x=advantages_df['Domaine'], y=advantages_df['Brésil']),
-                go.Bar(name='Afrique du Sud', x=advantages_df['Domaine'], y=advantages_df['Afrique du Sud'])
-            ])
-            fig.update_layout(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
-                             barmode='group', height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("avantages", advantages_data, self.build_advantages_figure)
+    
+    def build_contributions_figure(self, contributions_data):
+        """Contributions budgétaires des membres"""
+        contributions_df = pd.DataFrame(contributions_data)
+        
+        fig = px.bar(contributions_df, x='Pays', y='Budget (Md$)',
+                    title="💰 CONTRIBUTIONS BUDGÉTAIRES DES MEMBRES",
+                    color='Budget (Md$)',
+                    color_continuous_scale='viridis')
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_advantages_figure(self, advantages_data):
+        """Avantages comparatifs stratégiques par domaine"""
+        advantages_df = pd.DataFrame(advantages_data)
+        
+        fig = go.Figure(data=[
+            go.Bar(name='Chine', x=advantages_df['Domaine'], y=advantages_df['Chine']),
+            go.Bar(name='Russie', x=advantages_df['Domaine'], y=advantages_df['Russie']),
+            go.Bar(name='Inde', x=advantages_df['Domaine'], y=advantages_df['Inde']),
+            go.Bar(name='Brésil', x=advantages_df['Domaine'], y=advantages_df['Brésil']),
+            go.Bar(name='Afrique du Sud', x=advantages_df['Domaine'], y=advantages_df['Afrique du Sud'])
+        ])
+        fig.update_layout(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
+                         barmode='group', height=400)
+        return fig
+    
+    def create_member_comparison(self, comparaison):
+        """Comparaison des membres : courbes superposées et petits multiples, lus dans le même cube"""
+        st.markdown('<h3 class="section-header">⚖️ COMPARAISON DES MEMBRES BRICS</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([2, 2, 1])
+        membres = col1.multiselect("Membres:", comparaison.membres, default=list(comparaison.membres),
+                                   key="comparaison_membres")
+        indicateur = col2.selectbox("Indicateur:", comparaison.indicateurs, key="comparaison_indicateur",
+                                    format_func=lambda nom: nom.replace('_', ' '))
+        base_100 = col3.checkbox("Base 100", key="comparaison_base_100",
+                                 help="Chaque série rapportée à sa première valeur non nulle de la période")
+        if not membres:
+            st.info("Sélectionnez au moins un membre")
+            return
+        
+        # Sous-cube des membres choisis ; la normalisation porte sur tout le cube en une opération
+        valeurs = comparaison.valeurs[[comparaison.membres.index(membre) for membre in membres]]
+        if base_100:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                valeurs, positions = normaliser_base_100(valeurs)
+            self.display_comparison_bases(comparaison, membres, positions, indicateur)
+        
+        # Figures partagées entre sessions, identifiées par les choix et la période du cube
+        choix = {'membres': membres, 'base_100': base_100, 'periode': f"{comparaison.index[0]}/{comparaison.index[-1]}"}
+        self.plot_cached_figure("comparaison_superposee", {**choix, 'indicateur': indicateur},
+                                lambda _: self.build_comparison_overlay_figure(comparaison, membres, valeurs, indicateur))
+        self.plot_cached_figure("comparaison_multiples", choix,
+                                lambda _: self.build_comparison_small_multiples(comparaison, membres, valeurs))
+    
+    def display_comparison_bases(self, comparaison, membres, positions, indicateur):
+        """Signale les séries de l'indicateur sans base ou dont la base n'est pas le début de période"""
+        colonne = comparaison.indicateurs.index(indicateur)
+        series = comparaison.valeurs[[comparaison.membres.index(membre) for membre in membres], :, colonne]
+        # Indicateur hors des programmes du membre : pas de courbe, rien à signaler
+        presents = ~np.isnan(series).all(axis=1)
+        sans_base = [m for m, p, present in zip(membres, positions[:, colonne], presents) if present and p < 0]
+        if sans_base:
+            st.info(f"Base 100 impossible pour {', '.join(sans_base)} : "
+                    f"{indicateur.replace('_', ' ')} reste nul sur toute la période")
+        decales = sorted({int(comparaison.annees[p]) for p, present in zip(positions[:, colonne], presents)
+                          if present and p > 0})
+        if decales:
+            st.caption(f"Base 100 : nul en début de période, {indicateur.replace('_', ' ')} est rapporté "
+                       f"à sa première valeur non nulle ({', '.join(map(str, decales))})")
+    
+    def build_comparison_overlay_figure(self, comparaison, membres, valeurs, indicateur):
+        """Un indicateur, une courbe par membre"""
+        fig = go.Figure()
+        colonne = comparaison.indicateurs.index(indicateur)
+        for i, membre in enumerate(membres):
+            serie = valeurs[i, :, colonne]
+            # Indicateur hors des programmes du membre : pas de courbe
+            if np.isnan(serie).all():
+                continue
+            fig.add_trace(trace_ligne(
+                comparaison.annees, serie, n_traces=len(membres),
+                mode='lines', name=membre, line=dict(color=COULEURS_MEMBRES.get(membre), width=3)
+            ))
+        fig.update_layout(
+            title=f"⚖️ {indicateur.replace('_', ' ').upper()} PAR MEMBRE",
+            xaxis_title="Année",
+            height=450,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    
+    def build_comparison_small_multiples(self, comparaison, membres, valeurs):
+        """Un panneau par indicateur clé, les membres superposés dans chaque panneau"""
+        indicateurs = [nom for nom in INDICATEURS_KPI if nom in comparaison.indicateurs]
+        n_colonnes = 4
+        n_lignes = -(-len(indicateurs) // n_colonnes)
+        fig = plotly_subplots.make_subplots(rows=n_lignes, cols=n_colonnes, vertical_spacing=0.08,
+                                            subplot_titles=[nom.replace('_', ' ') for nom in indicateurs])
+        for k, nom in enumerate(indicateurs):
+            colonne = comparaison.indicateurs.index(nom)
+            for i, membre in enumerate(membres):
+                serie = valeurs[i, :, colonne]
+                if np.isnan(serie).all():
+                    continue
+                fig.add_trace(trace_ligne(
+                    comparaison.annees, serie, n_traces=len(membres),
+                    mode='lines', name=membre, legendgroup=membre, showlegend=(k == 0),
+                    line=dict(color=COULEURS_MEMBRES.get(membre), width=2)
+                ), row=k // n_colonnes + 1, col=k % n_colonnes + 1)
+        fig.update_layout(
+            title="🧩 INDICATEURS CLÉS PAR MEMBRE",
+            height=260 * n_lignes,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.04, xanchor="right", x=1)
+        )
+        fig.update_annotations(font_size=11)
+        return fig
+    
+    def create_sensitivity_analysis(self, df, controls):
+        """Sensibilité d'un indicateur aux coefficients du modèle : tornade et élasticités"""
+        selection = controls['selection']
+        st.markdown('<h3 class="section-header">🎚️ SENSIBILITÉ DU MODÈLE AUX COEFFICIENTS</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+        indicateur = col1.selectbox("Indicateur:", [nom for nom in INDICATEURS_SENSIBLES if nom in df.columns],
+                                    key="sensibilite_indicateur", format_func=lambda nom: nom.replace('_', ' '))
+        plan = col2.selectbox("Plan d'expériences:", list(PLANS), key="sensibilite_plan", format_func=PLANS.get)
+        n_evaluations = col3.select_slider("Évaluations:", options=[1_000, 10_000, 100_000], value=100_000,
+                                           key="sensibilite_evaluations")
+        amplitude = col4.slider("Variation (± %):", 5, 50, 20, step=5, key="sensibilite_amplitude")
+        
+        sensibilite = self.get_sensitivity_analysis(selection, indicateur, plan, n_evaluations, amplitude)
+        annees = [int(annee) for annee in sensibilite.annees]
+        annee = st.select_slider("Année lue:", options=annees, value=annees[-1], key="sensibilite_annee")
+        position = annees.index(annee)
+        
+        st.caption(f"{sensibilite.n_evaluations:,} jeux de paramètres évalués en un seul calcul "
+                   f"({sensibilite.secondes * 1000:.0f} ms)".replace(",", " "))
+        p5, p50, p95 = sensibilite.percentiles[:, position]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Valeur nominale", f"{sensibilite.reference[position]:,.1f}")
+        col2.metric("P5", f"{p5:,.1f}")
+        col3.metric("Médiane", f"{p50:,.1f}")
+        col4.metric("P95", f"{p95:,.1f}")
+        
+        choix = {'selection': selection, 'indicateur': indicateur, 'plan': plan,
+                 'evaluations': n_evaluations, 'amplitude': amplitude, 'annee': annee}
+        col1, col2 = st.columns(2)
+        with col1:
+            self.plot_cached_figure("sensibilite_tornade", choix,
+                                    lambda _: self.build_tornado_figure(sensibilite, position, amplitude))
+        with col2:
+            self.plot_cached_figure("sensibilite_elasticites", choix,
+                                    lambda _: self.build_elasticity_figure(sensibilite, annee))
+    
+    def build_tornado_figure(self, sensibilite, position, amplitude):
+        """Écart à la valeur nominale quand chaque paramètre est seul à sa borne basse ou haute"""
+        reference = sensibilite.reference[position]
+        bas = sensibilite.bas[:, position] - reference
+        haut = sensibilite.haut[:, position] - reference
+        # Le paramètre le plus influent en haut du diagramme
+        ordre = np.argsort(np.abs(haut - bas))
+        libelles = [LIBELLES_PARAMETRES[sensibilite.parametres[i]] for i in ordre]
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(y=libelles, x=bas[ordre], orientation='h', name=f"Paramètre -{amplitude} %",
+                             marker_color='#0055A4'))
+        fig.add_trace(go.Bar(y=libelles, x=haut[ordre], orientation='h', name=f"Paramètre +{amplitude} %",
+                             marker_color='#FF9933'))
+        fig.update_layout(
+            title=f"🌪️ TORNADE - {sensibilite.indicateur.replace('_', ' ').upper()} "
+                  f"({sensibilite.annees[position]:.0f})",
+            xaxis_title=f"Écart à la valeur nominale ({reference:,.1f})",
+            barmode='overlay',
+            height=400,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    
+    def build_elasticity_figure(self, sensibilite, annee):
+        """Élasticité de l'indicateur à chaque paramètre au fil des années"""
+        fig = go.Figure()
+        for nom, elasticites in zip(sensibilite.parametres, sensibilite.elasticites):
+            fig.add_trace(go.Scatter(x=sensibilite.annees, y=elasticites, mode='lines',
+                                     name=LIBELLES_PARAMETRES[nom], line=dict(width=3)))
+        fig.add_vline(x=annee, line_dash="dot", line_color="gray")
+        fig.update_layout(
+            title="📐 ÉLASTICITÉS (% DE L'INDICATEUR POUR 1 % DU PARAMÈTRE)",
+            xaxis_title="Année",
+            height=400,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
     
     def create_technical_analysis(self, df, config):
         """Analyse technique détaillée"""
@@ -775,15 +1088,7 @@ class DefenseBricsDashboardAvance:
                 'Pays': ['Chine', 'Russie', 'Inde', 'Chine', 'Russie', 'Chine', 'Inde', 'Inde'],
                 'Statut': ['Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel']
             }
-            systems_df = pd.DataFrame(systems_data)
-            
-            fig = px.scatter(systems_df, x='Portée/Puissance', y='Pays', 
-                           size='Portée/Puissance', color='Pays',
-                           hover_name='Système', log_x=True,
-                           title="🚀 SYSTÈMES D'ARMES DES BRICS",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("systemes", systems_data, self.build_systems_figure)
         
         with col2:
             # Analyse de la modernisation
@@ -793,17 +1098,7 @@ class DefenseBricsDashboardAvance:
                 'Niveau 2000': [60, 45, 40, 35, 30],
                 'Niveau 2027': [85, 75, 78, 72, 80]
             }
-            modern_df = pd.DataFrame(modernization_data)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='2000', x=modern_df['Domaine'], y=modern_df['Niveau 2000'],
-                                marker_color='#FF9933'))
-            fig.add_trace(go.Bar(name='2027', x=modern_df['Domaine'], y=modern_df['Niveau 2027'],
-                                marker_color='#0055A4'))
-            
-            fig.update_layout(title="📈 MODERNISATION DES CAPACITÉS MILITAIRES BRICS",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("modernisation", modernization_data, self.build_modernization_figure)
             
             # Innovations technologiques
             st.markdown("""
@@ -817,6 +1112,32 @@ class DefenseBricsDashboardAvance:
             </div>
             """, unsafe_allow_html=True)
     
+    def build_systems_figure(self, systems_data):
+        """Systèmes d'armes par pays et portée"""
+        systems_df = pd.DataFrame(systems_data)
+        
+        fig = px.scatter(systems_df, x='Portée/Puissance', y='Pays', 
+                       size='Portée/Puissance', color='Pays',
+                       hover_name='Système', log_x=True,
+                       title="🚀 SYSTÈMES D'ARMES DES BRICS",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_modernization_figure(self, modernization_data):
+        """Modernisation des capacités 2000 vs 2027"""
+        modern_df = pd.DataFrame(modernization_data)
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name='2000', x=modern_df['Domaine'], y=modern_df['Niveau 2000'],
+                            marker_color='#FF9933'))
+        fig.add_trace(go.Bar(name='2027', x=modern_df['Domaine'], y=modern_df['Niveau 2027'],
+                            marker_color='#0055A4'))
+        
+        fig.update_layout(title="📈 MODERNISATION DES CAPACITÉS MILITAIRES BRICS",
+                         barmode='group', height=500)
+        return fig
+    
     def create_cooperation_analysis(self, config):
         """Analyse des coopérations BRICS"""
         st.markdown('<h3 class="section-header">🤝 ANALYSE DES COOPÉRATIONS BRICS</h3>', 
@@ -826,22 +1147,14 @@ class DefenseBricsDashboardAvance:
         
         with col1:
             # Projets de coopération
-            cooperation_data = []
-            for projet, details in self.cooperation_projects.items():
-                cooperation_data.append({
-                    'Projet': projet,
-                    'Pays': details['pays'],
-                    'Type': details['type'],
-                    'Statut': details['statut']
-                })
-            
-            cooperation_df = pd.DataFrame(cooperation_data)
+            cooperation_data = tableau(self.cooperation_projects.values(), {
+                'Projet': 'nom',
+                'Pays': 'pays',
+                'Type': 'type',
+                'Statut': 'statut'
+            })
             
-            fig = px.treemap(cooperation_df, path=['Type', 'Projet'],
-                            title="🌳 CARTE DES PROJETS DE COOPÉRATION BRICS",
-                            color='Type')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("carte_projets", cooperation_data, self.build_cooperation_treemap)
         
         with col2:
             # Avantages de la coopération
@@ -861,14 +1174,28 @@ class DefenseBricsDashboardAvance:
                            'Renseignement', 'Recherche Technologique', 'Exercices Conjoints'],
                 'Potentiel': [8, 9, 7, 8, 9, 8]  # sur 10
             }
-            future_coop_df = pd.DataFrame(future_coop_data)
-            
-            fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
-                        title="🔮 POTENTIEL DE COOPÉRATION FUTURE",
-                        color='Potentiel',
-                        color_continuous_scale='reds')
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("cooperation_future", future_coop_data, self.build_future_cooperation_figure)
+    
+    def build_cooperation_treemap(self, cooperation_data):
+        """Carte des projets de coopération par type"""
+        cooperation_df = pd.DataFrame(cooperation_data)
+        
+        fig = px.treemap(cooperation_df, path=['Type', 'Projet'],
+                        title="🌳 CARTE DES PROJETS DE COOPÉRATION BRICS",
+                        color='Type')
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_future_cooperation_figure(self, future_coop_data):
+        """Potentiel de coopération future par domaine"""
+        future_coop_df = pd.DataFrame(future_coop_data)
+        
+        fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
+                    title="🔮 POTENTIEL DE COOPÉRATION FUTURE",
+                    color='Potentiel',
+                    color_continuous_scale='reds')
+        fig.update_layout(height=300)
+        return fig
     
     def create_threat_assessment(self, df, config):
         """Évaluation avancée des menaces"""
@@ -887,14 +1214,7 @@ class DefenseBricsDashboardAvance:
                 'Impact': [0.7, 0.8, 0.6, 0.5, 0.7, 0.8],
                 'Niveau Préparation': [0.7, 0.6, 0.8, 0.5, 0.6, 0.5]
             }
-            threats_df = pd.DataFrame(threats_data)
-            
-            fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
-                           size='Niveau Préparation', color='Type de Menace',
-                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("menaces", threats_data, self.build_threats_figure)
         
         with col2:
             # Capacités de réponse
@@ -906,17 +1226,7 @@ class DefenseBricsDashboardAvance:
                 'Inde': [0.7, 0.6, 0.7, 0.5, 0.6],
                 'Coopération': [0.9, 0.8, 0.8, 0.7, 0.7]
             }
-            response_df = pd.DataFrame(response_data)
-            
-            fig = go.Figure(data=[
-                go.Bar(name='Chine', x=response_df['Scénario'], y=response_df['Chine']),
-                go.Bar(name='Russie', x=response_df['Scénario'], y=response_df['Russie']),
-                go.Bar(name='Inde', x=response_df['Scénario'], y=response_df['Inde']),
-                go.Bar(name='Coopération', x=response_df['Scénario'], y=response_df['Coopération'])
-            ])
-            fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR ACTEUR",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.plot_cached_figure("reponses", response_data, self.build_response_figure)
         
         # Recommandations stratégiques
         st.markdown("""
@@ -933,96 +1243,227 @@ class DefenseBricsDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
     
-    def create_cooperation_database(self):
-        """Base de données des coopérations BRICS"""
+    def build_threats_figure(self, threats_data):
+        """Matrice des menaces probabilité vs impact"""
+        threats_df = pd.DataFrame(threats_data)
+        
+        fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
+                       size='Niveau Préparation', color='Type de Menace',
+                       title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_response_figure(self, response_data):
+        """Capacités de réponse par acteur"""
+        response_df = pd.DataFrame(response_data)
+        
+        fig = go.Figure(data=[
+            go.Bar(name='Chine', x=response_df['Scénario'], y=response_df['Chine']),
+            go.Bar(name='Russie', x=response_df['Scénario'], y=response_df['Russie']),
+            go.Bar(name='Inde', x=response_df['Scénario'], y=response_df['Inde']),
+            go.Bar(name='Coopération', x=response_df['Scénario'], y=response_df['Coopération'])
+        ])
+        fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR ACTEUR",
+                         barmode='group', height=500)
+        return fig
+    
+    def create_cooperation_database(self, filtres=None):
+        """Base de données des coopérations BRICS, filtrée par facettes via l'index inversé"""
         st.markdown('<h3 class="section-header">🤝 BASE DE DONNÉES DES COOPÉRATIONS BRICS</h3>', 
                    unsafe_allow_html=True)
         
-        cooperation_data = []
-        for nom, specs in self.cooperation_projects.items():
-            cooperation_data.append({
-                'Projet': nom,
-                'Pays Participants': specs['pays'],
-                'Type': specs['type'],
-                'Statut': specs['statut'],
-                'Détails': specs.get('objectif', specs.get('localisation', specs.get('domaines', 'N/A')))
-            })
-        
-        cooperation_df = pd.DataFrame(cooperation_data)
+        filtres = filtres or {}
+        index = index_projets(self.cooperation_projects)
+        selection = index.selection(filtres, filtres.get('recherche', ""))
+        st.caption(f"{len(selection)} projets sur {len(index)}")
         
         # Affichage interactif
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig = px.treemap(cooperation_df, path=['Type', 'Projet'],
-                            title="🤝 CARTE DES COOPÉRATIONS BRICS",
-                            color='Type')
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            # Treemap construit sur les comptes par (type, statut), pas sur les projets un à un
+            agregats = index.agregats(selection)
+            if agregats:
+                self.plot_cached_figure("carte_cooperations", agregats, self.build_cooperation_database_treemap)
+            else:
+                st.info("Aucun projet ne correspond aux filtres")
         
         with col2:
-            st.markdown("""
-            <div class="china-card">
-                <h4>📋 PROJETS DE COOPÉRATION</h4>
-            """, unsafe_allow_html=True)
-            
-            for projet in cooperation_data:
-                st.markdown(f"""
+            self.create_project_list(index, selection)
+    
+    def create_project_list(self, index, selection):
+        """Liste paginée des projets : tri côté serveur, une page rendue en un seul élément"""
+        libelles_tris = {"nom": "Nom", "type": "Type", "statut": "Statut", "pays": "Nombre de pays"}
+        tri_col, ordre_col = st.columns([2, 1])
+        cle = tri_col.selectbox("Trier par:", TRIS, format_func=libelles_tris.get, key="tri_projets")
+        decroissant = ordre_col.toggle("Décroissant", key="tri_projets_decroissant")
+        
+        pages = max(-(-len(selection) // PROJETS_PAR_PAGE), 1)
+        # Les filtres peuvent réduire le nombre de pages sous la page mémorisée
+        if st.session_state.get("page_projets", 1) > pages:
+            st.session_state["page_projets"] = pages
+        page = st.number_input(f"Page (sur {pages}):", min_value=1, max_value=pages, step=1, key="page_projets")
+        
+        # Tri sur des rangs précalculés par l'index ; seule la page affichée est mise en forme
+        debut = (page - 1) * PROJETS_PAR_PAGE
+        indices = index.trier(selection, cle, decroissant)[debut:debut + PROJETS_PAR_PAGE]
+        st.markdown(self.build_project_page_html(index, indices), unsafe_allow_html=True)
+    
+    def build_project_page_html(self, index, indices):
+        """Cartes HTML d'une page de projets (valeurs échappées)"""
+        cartes = []
+        for i in indices.tolist():
+            nom, specs = index.noms[i], index.details[i]
+            details = specs.get('objectif', specs.get('localisation', specs.get('domaines', 'N/A')))
+            cartes.append(f"""
                 <div style="background: rgba(255,255,255,0.1); padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
-                    <strong>{projet['Projet']}</strong><br>
-                    🌍 {projet['Pays Participants']} • 🎯 {projet['Type']}<br>
-                    📊 {projet['Statut']} • 📝 {projet['Détails']}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+                    <strong>{html.escape(nom)}</strong><br>
+                    🌍 {html.escape(specs['pays'])} • 🎯 {html.escape(specs['type'])}<br>
+                    📊 {html.escape(specs['statut'])} • 📝 {html.escape(str(details))}
+                </div>""")
+        cartes = "".join(cartes)
+        return f"""
+            <div class="china-card">
+                <h4>📋 PROJETS DE COOPÉRATION</h4>{cartes}
+            </div>
+            """
+    
+    def build_cooperation_database_treemap(self, agregats):
+        """Carte des coopérations : nombre de projets par type puis par statut"""
+        types = {}
+        for ligne in agregats:
+            types[ligne['Type']] = types.get(ligne['Type'], 0) + ligne['Projets']
+        
+        fig = go.Figure(go.Treemap(
+            ids=list(types) + [f"{ligne['Type']}/{ligne['Statut']}" for ligne in agregats],
+            labels=list(types) + [ligne['Statut'] for ligne in agregats],
+            parents=[""] * len(types) + [ligne['Type'] for ligne in agregats],
+            values=list(types.values()) + [ligne['Projets'] for ligne in agregats],
+            branchvalues="total"
+        ))
+        fig.update_layout(title="🤝 CARTE DES COOPÉRATIONS BRICS", height=500)
+        return fig
     
-    def run_advanced_dashboard(self):
-        """Exécute le dashboard avancé complet"""
+    def run_advanced_dashboard(self, depart=None):
+        """Exécute le dashboard avancé complet ; `depart` : début du script, pour le premier rendu"""
+        depart = depart or time.perf_counter()
+        chronometrage.debut_rerun()
+        self.temps_figures_economise = 0.0
+        
         # Sidebar avancé
         controls = self.create_advanced_sidebar()
         
+        # Les nœuds dont aucun contrôle n'a changé reprennent la valeur du rerun précédent de la session ;
+        # une nouvelle session démarre avec les valeurs de l'instantané de la vue par défaut
+        premier_rendu = "graphe_recalcul" not in st.session_state
+        if premier_rendu:
+            st.session_state["graphe_recalcul"] = self.get_snapshot_memory()
+        self.execution = self.recompute_graph.executer(controls, st.session_state["graphe_recalcul"])
+        
         # Header avancé
         self.display_advanced_header()
         
         # Génération des données avancées
-        df, config = self.generate_advanced_data(controls['selection'])
+        df, config = self.execution.valeur("donnees")
         
-        # Navigation par onglets avancés
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📊 Tableau de Bord", 
-            "🔬 Analyse Technique", 
-            "🌍 Contexte Géopolitique", 
-            "🇧🇷🇷🇺🇮🇳🇨🇳🇿🇦 Membres BRICS",
-            "⚠️ Évaluation Menaces",
-            "🤝 Coopérations BRICS",
-            "💎 Synthèse Stratégique"
-        ])
+        # Navigation par onglets avancés : en rendu à la demande, Streamlit relance le script
+        # au changement d'onglet et seul l'onglet ouvert est construit
+        if controls['rendu_a_la_demande']:
+            onglets = st.tabs(self.sections_options, key="onglet_actif", on_change="rerun")
+        else:
+            onglets = st.tabs(self.sections_options)
+        
+        for section, onglet in zip(self.sections_options, onglets):
+            # open vaut None sans suivi d'état : tous les onglets sont alors construits
+            if onglet.open is False:
+                continue
+            with onglet:
+                self.render_section(section, df, config, controls)
+        
+        # Temps de construction évité sur ce rendu grâce au cache de figures
+        if self.temps_figures_economise:
+            st.sidebar.caption(f"⚡ Cache de figures : {self.temps_figures_economise * 1000:.0f} ms économisées sur ce rendu")
+        
+        compteurs = self.execution.compteurs()
+        st.sidebar.caption(f"♻️ Graphe de recalcul : {compteurs['reutilises']} nœuds réutilisés, "
+                           f"{compteurs['recalcules']} recalculés")
+        
+        rerun = chronometrage.fin_rerun()
+        rerun['noeuds'] = compteurs
+        if premier_rendu:
+            rerun['premier_rendu'] = chronometrage.enregistrer_premier_rendu(time.perf_counter() - depart)
+        # Mesures du dernier rerun de la session (lues par le test de charge)
+        st.session_state["dernier_rerun"] = rerun
+        if controls['diagnostics']:
+            self.render_diagnostics_panel(rerun)
+    
+    def render_diagnostics_panel(self, rerun):
+        """Panneau de diagnostic : durées du rerun, percentiles glissants et exports"""
+        st.sidebar.markdown("### 🩺 DIAGNOSTICS DE RENDU")
+        st.sidebar.caption(f"Rerun complet : {rerun['total'] * 1000:.0f} ms, {rerun['cpu'] * 1000:.0f} ms CPU "
+                           f"(durées inclusives par section)")
+        
+        stats = chronometrage.statistiques()
+        if "premier_rendu" in stats:
+            st.sidebar.caption(f"Premier rendu des sessions : p50 {stats['premier_rendu']['p50_s'] * 1000:.0f} ms, "
+                               f"à froid {chronometrage.premier_rendu_froid * 1000:.0f} ms")
+        lignes = [{
+            'Section': nom,
+            'Rerun (ms)': rerun['sections'].get(nom, 0.0) * 1000,
+            'p50 (ms)': valeurs['p50_s'] * 1000,
+            'p95 (ms)': valeurs['p95_s'] * 1000,
+            'p99 (ms)': valeurs['p99_s'] * 1000,
+            'Appels': valeurs['appels']
+        } for nom, valeurs in stats.items() if nom not in MESURES_RENDU]
+        tableau = pd.DataFrame(lignes).sort_values('Rerun (ms)', ascending=False)
+        st.sidebar.dataframe(tableau.round(1), hide_index=True)
+        
+        col1, col2 = st.sidebar.columns(2)
+        col1.download_button("JSON", chronometrage.exporter_json(rerun), file_name="diagnostics.json",
+                             mime="application/json")
+        col2.download_button("Prometheus", chronometrage.exporter_prometheus(), file_name="metrics.prom",
+                             mime="text/plain")
+    
+    def render_section(self, section, df, config, controls):
+        """Construit le contenu d'un onglet"""
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = self.sections_options
         
-        with tab1:
+        if section == tab1:
             self.display_strategic_metrics(df, config)
-            self.create_comprehensive_analysis(df, config)
+            bandes = self.get_node_value("bandes", self.get_scenario_bands, controls['selection'],
+                                         controls['scenario'], controls['n_trajectoires'])
+            self.create_comprehensive_analysis(df, config, controls['scenario'], bandes)
         
-        with tab2:
+        elif section == tab2:
             self.create_technical_analysis(df, config)
         
-        with tab3:
+        elif section == tab3:
             if controls['show_geopolitical']:
                 self.create_geopolitical_analysis(df, config)
         
-        with tab4:
+        elif section == tab4:
             self.create_member_analysis(df, config)
         
-        with tab5:
+        elif section == tab5:
+            self.create_member_comparison(self.get_node_value("comparaison", self.get_comparison_cube))
+        
+        elif section == tab6:
             if controls['threat_assessment']:
                 self.create_threat_assessment(df, config)
         
-        with tab6:
+        elif section == tab7:
             if controls['show_cooperation']:
-                self.create_cooperation_database()
+                self.create_cooperation_database(controls['filtres_projets'])
+        
+        elif section == tab8:
+            self.create_sensitivity_analysis(df, controls)
         
-        with tab7:
+        elif section == tab9:
             self.create_strategic_synthesis(df, config, controls)
+            # Perspectives futures : projection des indicateurs à l'horizon choisi, puis orientations
+            previsions = self.get_node_value("previsions", self.get_forecast_models, controls['selection'])
+            self.display_strategic_outlook(self.create_forecast_outlook(previsions))
     
     def create_strategic_synthesis(self, df, config, controls):
         """Synthèse stratégique finale"""
@@ -1080,11 +1521,13 @@ class DefenseBricsDashboardAvance:
                 </div>
             </div>
             """, unsafe_allow_html=True)
-        
-        # Perspectives futures
-        st.markdown("""
+    
+    def display_strategic_outlook(self, periode):
+        """Perspectives et recommandations finales pour la période projetée (dernière année, horizon)"""
+        derniere, horizon = periode
+        st.markdown(f"""
         <div class="metric-card">
-            <h4>🔮 PERSPECTIVES STRATÉGIQUES 2027-2035</h4>
+            <h4>🔮 PERSPECTIVES STRATÉGIQUES {derniere}-{horizon}</h4>
             <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem;">
                 <div>
                     <h5>🌍 EXPANSION GÉOPOLITIQUE</h5>
@@ -1125,7 +1568,80 @@ class DefenseBricsDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
 
+    def create_forecast_outlook(self, previsions):
+        """Projection des indicateurs au-delà des données ; renvoie (dernière année observée, horizon)"""
+        derniere = int(previsions.annees[-1])
+        col1, col2, col3, col4 = st.columns([2, 2, 1, 2])
+        horizon = col1.slider("Horizon de projection:", derniere + 1, derniere + 23, derniere + 8,
+                              key="prevision_horizon")
+        modele = col2.selectbox("Modèle:", list(MODELES), key="prevision_modele", format_func=MODELES.get)
+        niveau = col3.select_slider("Confiance (%):", options=list(NIVEAUX_CONFIANCE), value=90,
+                                    key="prevision_niveau")
+        indicateur = col4.selectbox("Indicateur projeté:", previsions.indicateurs, key="prevision_indicateur",
+                                    format_func=lambda nom: nom.replace('_', ' '))
+        
+        # Projection seule : les modèles ajustés sont repris du graphe de recalcul
+        t_futur, centre, bas, haut = prevoir(previsions, modele, horizon, niveau)
+        cles = [nom for nom in INDICATEURS_KPI if nom in previsions.indicateurs][:4]
+        for colonne, nom in zip(st.columns(len(cles)), cles):
+            k = previsions.indicateurs.index(nom)
+            actuel = previsions.observations[-1, k]
+            colonne.metric(
+                f"{nom.replace('_', ' ')} {horizon}",
+                f"{centre[k, -1]:,.1f}",
+                f"{(centre[k, -1] / actuel - 1) * 100:+.1f}% vs {derniere}" if actuel else None,
+                help=f"Intervalle à {niveau} % : {bas[k, -1]:,.1f} - {haut[k, -1]:,.1f}"
+            )
+        
+        k = previsions.indicateurs.index(indicateur)
+        choix = {'indicateur': indicateur, 'modele': modele, 'niveau': niveau, 'horizon': horizon,
+                 'periode': f"{previsions.annees[0]}/{previsions.annees[-1]}", 'observations': previsions.observations[:, k].tolist()}
+        self.plot_cached_figure("prevision", choix, lambda _: self.build_forecast_figure(
+            previsions, indicateur, t_futur, centre[k], bas[k], haut[k], MODELES[modele], niveau))
+        return derniere, horizon
+    
+    def build_forecast_figure(self, previsions, indicateur, t_futur, centre, bas, haut, modele, niveau):
+        """Série observée prolongée par la prévision et son intervalle de confiance"""
+        observations = previsions.observations[:, previsions.indicateurs.index(indicateur)]
+        # Points communs aux bornes et à la prévision pour que la bande reste fermée
+        communs = indices_lttb(t_futur, centre, budget_par_trace(4))
+        fig = go.Figure()
+        fig.add_trace(trace_ligne(t_futur, haut, indices=communs, mode='lines', line=dict(width=0),
+                                  name='Borne haute', showlegend=False))
+        fig.add_trace(trace_ligne(t_futur, bas, indices=communs, mode='lines', line=dict(width=0),
+                                  fill='tonexty', fillcolor='rgba(255, 153, 51, 0.25)',
+                                  name=f"Intervalle {niveau} %"))
+        fig.add_trace(trace_ligne(previsions.annees, observations, n_traces=4, mode='lines', name='Observé',
+                                  line=dict(color='#0055A4', width=3)))
+        fig.add_trace(trace_ligne(t_futur, centre, indices=communs, mode='lines', name=f"Prévision ({modele})",
+                                  line=dict(color='#FF9933', width=3, dash='dash')))
+        fig.update_layout(
+            title=f"🔮 PROJECTION - {indicateur.replace('_', ' ').upper()}",
+            xaxis_title="Année",
+            height=400,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+
+_dashboard = None
+_verrou_dashboard = threading.Lock()
+
+
+def dashboard_partage():
+    """Dashboard partagé par toutes les sessions du processus, construit au premier rerun"""
+    global _dashboard
+    with _verrou_dashboard:
+        if _dashboard is None:
+            _dashboard = DefenseBricsDashboardAvance()
+        return _dashboard
+
+
 # Lancement du dashboard avancé
 if __name__ == "__main__":
-    dashboard = DefenseBricsDashboardAvance()
-    dashboard.run_advanced_dashboard()
\ No newline at end of file
+    configure_page()
+    charger_artefact()
+    # Streamlit ré-exécute ce script à chaque rerun : le modèle partagé vit dans le module importé,
+    # chargé une seule fois par processus ; seul l'état de vue reste propre à la session
+    import Dashboard
+    Dashboard.dashboard_partage().run_advanced_dashboard(depart=DEPART_SCRIPT)
\ No newline at end of file
@@ -0,0 +1,84 @@
+# bench_downsampling.py
+"""Taille JSON et temps de sérialisation des figures de séries longues, avec et sans LTTB.
+
+Mesure les figures de create_comprehensive_analysis (capacités, coopérations,
+éventails Monte Carlo) et de create_geopolitical_analysis pour des périodes de
+plus en plus longues, ainsi que l'écart de forme introduit par la réduction
+(écart de l'interpolation linéaire, en % de l'amplitude de la série : moyen et
+maximal, ce dernier atteint sur les marches, tracées en rampe sur un seau).
+Le temps de rendu navigateur n'est pas mesuré ici : il suit le nombre de
+points envoyés, donné dans la dernière colonne.
+
+Usage : python benchmarks/bench_downsampling.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+import Dashboard  # noqa: E402
+import downsampling  # noqa: E402
+
+PERIODES = [
+    ("2000-2027 annuelle", 2000, 2027, "annuelle"),
+    ("2000-2027 mensuelle", 2000, 2027, "mensuelle"),
+    ("1900-2099 mensuelle", 1900, 2099, "mensuelle"),
+    ("1000-2099 mensuelle", 1000, 2099, "mensuelle")
+]
+
+SELECTION = "BRICS - Vue d'Ensemble"
+SCENARIO = "Coopération Renforcée"
+
+
+def figures(dashboard, df, bandes):
+    return ([dashboard.build_capabilities_figure(df), dashboard.build_strategic_cooperation_figure(df),
+             dashboard.build_structured_cooperation_figure(df)]
+            + dashboard.build_scenario_fan_figures(df, SCENARIO, bandes))
+
+
+def mesurer(dashboard, df, bandes, budget):
+    """(octets JSON, secondes construction + sérialisation, points envoyés, figures)"""
+    downsampling.BUDGET_POINTS = budget
+    depart = time.perf_counter()
+    figs = figures(dashboard, df, bandes)
+    octets = sum(len(pio.to_json(fig, validate=False)) for fig in figs)
+    duree = time.perf_counter() - depart
+    points = sum(len(trace.x) for fig in figs for trace in fig.data)
+    return octets, duree, points, figs
+
+
+def ecart_forme(complete, reduite):
+    """Écarts moyen et maximal (% de l'amplitude) entre chaque série et son interpolation réduite"""
+    ecarts = []
+    for fig_complete, fig_reduite in zip(complete, reduite):
+        for trace, trace_reduite in zip(fig_complete.data, fig_reduite.data):
+            x, y = np.asarray(trace.x, dtype=float), np.asarray(trace.y, dtype=float)
+            amplitude = np.ptp(y) or 1.0
+            interpolee = np.interp(x, np.asarray(trace_reduite.x, dtype=float), np.asarray(trace_reduite.y, dtype=float))
+            ecarts.append(np.abs(interpolee - y) / amplitude * 100)
+    ecarts = np.concatenate(ecarts)
+    return ecarts.mean(), ecarts.max()
+
+
+def main():
+    dashboard = Dashboard.DefenseBricsDashboardAvance()
+    budget = downsampling.BUDGET_POINTS
+    print(f"{'période':<22}{'JSON complet':>14}{'JSON réduit':>13}{'gain':>7}"
+          f"{'temps complet':>15}{'temps réduit':>14}{'écart moyen':>13}{'écart max':>11}{'points':>17}")
+    for libelle, debut, fin, resolution in PERIODES:
+        df, _ = dashboard.generate_advanced_data(SELECTION, debut, fin, resolution)
+        bandes = dashboard.get_scenario_bands(SELECTION, SCENARIO, 10_000, debut, fin, resolution)
+        octets_complet, duree_complet, points_complet, complete = mesurer(dashboard, df, bandes, None)
+        octets_reduit, duree_reduit, points_reduit, reduite = mesurer(dashboard, df, bandes, budget)
+        ecart_moyen, ecart_max = ecart_forme(complete, reduite)
+        print(f"{libelle:<22}{octets_complet / 1024:>11.0f} Ko{octets_reduit / 1024:>10.0f} Ko"
+              f"{octets_complet / octets_reduit:>6.1f}x{duree_complet * 1e3:>12.0f} ms{duree_reduit * 1e3:>11.0f} ms"
+              f"{ecart_moyen:>12.3f}%{ecart_max:>10.2f}%{points_complet:>9} → {points_reduit:<6}")
+
+
+if __name__ == "__main__":
+    main()
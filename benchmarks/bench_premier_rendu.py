@@ -0,0 +1,64 @@
+# bench_premier_rendu.py
+"""Premier rendu à froid d'une nouvelle réplique, avec et sans instantané de la vue par défaut.
+
+Chaque mesure lance un processus Python neuf qui exécute le dashboard une
+fois avec le testeur de Streamlit (AppTest) et relève le premier rendu à
+froid enregistré par le dashboard : du début du script, imports compris, à
+la fin du premier rerun.
+
+Usage : python benchmarks/bench_premier_rendu.py [--repetitions 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESURE = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+import diagnostics
+noeuds = [c.value for c in at.sidebar.caption if "Graphe de recalcul" in c.value]
+print(json.dumps({"premier_rendu": diagnostics.chronometrage.premier_rendu_froid, "noeuds": noeuds[0]}))
+"""
+
+
+def premier_rendu(chemin_instantane):
+    """Premier rendu à froid (s) et compteurs du graphe, dans un processus neuf"""
+    environnement = {**os.environ, "BRICS_INSTANTANE": chemin_instantane}
+    sortie = subprocess.run([sys.executable, "-c", MESURE, os.path.join(RACINE, "Dashboard.py")],
+                            cwd=RACINE, env=environnement, capture_output=True, text=True, check=True).stdout
+    return json.loads(sortie.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, RACINE)
+    from Dashboard import DefenseBricsDashboardAvance
+    from instantane import ecrire_instantane
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "instantane.arrow")
+        taille = ecrire_instantane(DefenseBricsDashboardAvance(), chemin)
+        print(f"Instantané : {taille / 1024:.0f} Ko")
+        print(f"{'mode':<18}{'médiane (ms)':>14}{'min (ms)':>10}{'max (ms)':>10}  graphe")
+        for libelle, chemin_mode in [("sans instantané", ""), ("avec instantané", chemin)]:
+            mesures = [premier_rendu(chemin_mode) for _ in range(args.repetitions)]
+            durees = [mesure["premier_rendu"] * 1e3 for mesure in mesures]
+            print(f"{libelle:<18}{statistics.median(durees):>14.0f}{min(durees):>10.0f}{max(durees):>10.0f}"
+                  f"  {mesures[-1]['noeuds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_previsions.py
+"""Prévisions : ajustement des trois modèles à tous les indicateurs, puis projection seule.
+
+Un changement d'horizon, de modèle ou de niveau de confiance ne refait que
+la projection ; l'ajustement n'a lieu qu'une fois par jeu de données.
+
+Usage : python benchmarks/bench_previsions.py [--repetitions 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PERIODES = [
+    ("2000-2027 annuelle", 2000, 2027, "annuelle"),
+    ("2000-2027 mensuelle", 2000, 2027, "mensuelle"),
+    ("1900-2099 mensuelle", 1900, 2099, "mensuelle")
+]
+
+
+def mediane(fonction, repetitions):
+    fonction()
+    durees = []
+    for _ in range(repetitions):
+        depart = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - depart)
+    return statistics.median(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, RACINE)
+    from data_layer import generer_donnees
+    from forecast_engine import MODELES, ajuster_modeles, prevoir
+
+    print(f"{'période':<22}{'indicateurs':>12}{'points':>8}{'ajustement (ms)':>17}"
+          + "".join(f"{'projection ' + modele + ' (ms)':>27}" for modele in MODELES))
+    for libelle, debut, fin, resolution in PERIODES:
+        df, _ = generer_donnees("BRICS - Vue d'Ensemble", debut, fin, resolution)
+        indicateurs = [nom for nom in df.columns if nom != 'Annee']
+        t, y = df['Annee'].to_numpy(), df[indicateurs].to_numpy()
+        ajustement = mediane(lambda: ajuster_modeles(t, y, indicateurs), args.repetitions)
+        previsions = ajuster_modeles(t, y, indicateurs)
+        # Horizon maximal du curseur : 23 ans au-delà des données
+        projections = [mediane(lambda: prevoir(previsions, modele, fin + 23, 95), args.repetitions)
+                       for modele in MODELES]
+        print(f"{libelle:<22}{len(indicateurs):>12}{len(t):>8}{ajustement * 1e3:>17.2f}"
+              + "".join(f"{duree * 1e3:>27.3f}" for duree in projections))
+
+
+if __name__ == "__main__":
+    main()
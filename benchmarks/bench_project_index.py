@@ -0,0 +1,107 @@
+# bench_project_index.py
+"""Filtrage par facettes de la base des coopérations : index inversé vs DataFrame reconstruit.
+
+Génère des projets synthétiques (pays combinés par « / », types, statuts et
+détails tirés des projets de référence), puis mesure pour chaque filtre le
+chemin interactif complet : sélection, comptes par facette et agrégats du
+treemap. La référence reconstruit un DataFrame à chaque filtre, comme le
+faisait create_cooperation_database. Objectif : moins de 50 ms à 100 000 projets.
+
+Usage : python benchmarks/bench_project_index.py [--projets 1000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from data_layer import PAYS_MEMBRES, PROJETS_COOPERATION  # noqa: E402
+from project_index import IndexProjets, normaliser  # noqa: E402
+
+TYPES = sorted({details['type'] for details in PROJETS_COOPERATION.values()}) + ["Logistique", "Formation"]
+STATUTS = sorted({details['statut'] for details in PROJETS_COOPERATION.values()}) + ["Suspendu", "Proposé"]
+MOTS = ["hypersonique", "croisière", "reconnaissance", "naval", "aérien", "satellite", "cyber",
+        "sécurisé", "Moscou", "Pékin", "New Delhi", "Brasília", "Pretoria", "radar", "drone"]
+
+FILTRES = [
+    ("aucun", {}, ""),
+    ("pays", {'pays': ["Inde"]}, ""),
+    ("pays + type", {'pays': ["Brésil", "Afrique du Sud"], 'type': ["Espace", "Technologie"]}, ""),
+    ("trois facettes", {'pays': ["Chine"], 'type': ["Cybersécurité"], 'statut': ["Actif", "Opérationnel"]}, ""),
+    ("mot-clé", {}, "hyperson"),
+    ("facettes + mots", {'pays': ["Russie"], 'statut': ["Actif"]}, "naval drone")
+]
+
+
+def projets_synthetiques(n, graine=0):
+    hasard = random.Random(graine)
+    projets = {}
+    for i in range(n):
+        pays = "Tous" if hasard.random() < 0.1 else "/".join(hasard.sample(PAYS_MEMBRES, hasard.randint(1, 3)))
+        projets[f"Projet {i:06d}"] = {
+            'pays': pays,
+            'type': hasard.choice(TYPES),
+            'statut': hasard.choice(STATUTS),
+            'objectif': " ".join(hasard.sample(MOTS, 3))
+        }
+    return projets
+
+
+def filtre_dataframe(projets, filtres, recherche):
+    """Référence : DataFrame reconstruit, recherche de sous-chaînes et groupby"""
+    df = pd.DataFrame([{'Projet': nom, **details} for nom, details in projets.items()])
+    masque = pd.Series(True, index=df.index)
+    for facette in ("type", "statut"):
+        if filtres.get(facette):
+            masque &= df[facette].isin(filtres[facette])
+    if filtres.get('pays'):
+        tous = df['pays'] == "Tous"
+        masque &= tous | df['pays'].str.contains("|".join(filtres['pays']), regex=True)
+    texte = (df['Projet'] + " " + df['objectif']).map(normaliser)
+    for mot in recherche.split():
+        masque &= texte.str.contains(normaliser(mot), regex=False)
+    return df[masque].groupby(['type', 'statut']).size()
+
+
+def chronometrer(fonction, repetitions=5):
+    fonction()
+    durees = []
+    for _ in range(repetitions):
+        depart = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - depart)
+    return min(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projets", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.projets:
+        projets = projets_synthetiques(n)
+        depart = time.perf_counter()
+        index = IndexProjets(projets)
+        construction = time.perf_counter() - depart
+        print(f"\n{n} projets — construction de l'index : {construction * 1e3:.0f} ms "
+              f"({len(index.vocabulaire)} mots-clés)")
+        print(f"{'filtre':<18}{'projets':>9}{'index':>11}{'DataFrame':>13}")
+
+        for libelle, filtres, recherche in FILTRES:
+            def interactif():
+                selection = index.selection(filtres, recherche)
+                index.comptes_facettes(filtres, recherche)
+                return selection, index.agregats(selection)
+
+            selection, _ = interactif()
+            duree_index = chronometrer(interactif)
+            duree_df = chronometrer(lambda: filtre_dataframe(projets, filtres, recherche), repetitions=2)
+            print(f"{libelle:<18}{len(selection):>9}{duree_index * 1e3:>8.2f} ms{duree_df * 1e3:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_rapport.py
+"""Génération du rapport HTML hors ligne : durée selon le nombre de processus et taille du fichier.
+
+Compare aussi la taille obtenue (plotly.js intégré une seule fois) à celle
+d'un export figure par figure, où chaque figure embarque sa copie de
+plotly.js. Chaque mesure est faite dans un nouveau processus Python, comme
+un lancement de rapport_html.py : les imports font partie du coût.
+
+Usage : python benchmarks/bench_rapport.py [--processus 1 2 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESURE = """
+import json, sys, time
+depart = time.perf_counter()
+from rapport_html import generer_rapport
+stats = generer_rapport(sys.argv[1], processus=int(sys.argv[2]), plotlyjs=sys.argv[3])
+stats["total"] = time.perf_counter() - depart
+print(json.dumps(stats))
+"""
+
+
+def generer(chemin, processus, plotlyjs="inline"):
+    """Statistiques de generer_rapport, durée d'import comprise (clé 'total')"""
+    sortie = subprocess.run([sys.executable, "-c", MESURE, chemin, str(processus), plotlyjs],
+                            cwd=RACINE, capture_output=True, text=True, check=True).stdout
+    return json.loads(sortie.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processus", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    sys.path.insert(0, RACINE)
+    from plotly.offline import get_plotlyjs
+
+    print(f"{os.cpu_count()} cœurs disponibles")
+    print(f"{'processus':>10}{'rapport (s)':>13}{'avec imports (s)':>18}{'onglet le plus long (ms)':>26}")
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "rapport.html")
+        for processus in dict.fromkeys(args.processus):
+            stats = generer(chemin, processus)
+            print(f"{processus:>10}{stats['secondes']:>13.2f}{stats['total']:>18.2f}"
+                  f"{max(stats['sections'].values()) * 1e3:>26.0f}")
+
+        cdn = generer(chemin, 1, "cdn")
+        taille_plotlyjs = len(get_plotlyjs().encode("utf-8"))
+        par_figure = cdn["octets"] + stats["figures"] * taille_plotlyjs
+        print(f"\n{stats['figures']} figures : plotly.js intégré une fois {stats['octets'] / 1e6:.1f} Mo, "
+              f"une copie par figure {par_figure / 1e6:.1f} Mo, plotly.js via CDN {cdn['octets'] / 1e6:.2f} Mo")
+
+
+if __name__ == "__main__":
+    main()
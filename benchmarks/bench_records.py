@@ -0,0 +1,130 @@
+# bench_records.py
+"""Enregistrements à __slots__ et champs internés vs dictionnaires imbriqués.
+
+Mesure :
+- la mémoire retenue par la table des projets lue depuis SQLite (une
+  chaîne neuve par valeur et par ligne pour les dictionnaires, valeurs
+  catégorielles internées pour les enregistrements) ;
+- les allocations par rerun de get_advanced_config (copie profonde d'un
+  dictionnaire vs enregistrement immuable partagé) ;
+- la construction des DataFrames dérivés (liste de dictionnaires vs
+  colonnes lues champ par champ).
+
+Usage : python benchmarks/bench_records.py [--projets 5 10000 100000]
+"""
+import argparse
+import copy
+import functools
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from bench_project_index import projets_synthetiques  # noqa: E402
+from data_layer import ADVANCED_CONFIGS, BRANCHES_OPTIONS, CONFIG_PAR_DEFAUT, get_advanced_config  # noqa: E402
+from data_sources import CHAMPS_PROJETS, SourceSQLite  # noqa: E402
+from records import tableau  # noqa: E402
+
+COLONNES_PROJETS = {'Projet': 'nom', 'Pays': 'pays', 'Type': 'type', 'Statut': 'statut'}
+
+
+def memoire_retenue(construction):
+    """(valeur, octets encore alloués après construction)"""
+    gc.collect()
+    tracemalloc.start()
+    avant = tracemalloc.get_traced_memory()[0]
+    valeur = construction()
+    gc.collect()
+    apres = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return valeur, apres - avant
+
+
+def chronometrer(fonction, repetitions=5):
+    fonction()
+    durees = []
+    for _ in range(repetitions):
+        depart = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - depart)
+    return min(durees)
+
+
+def lire_dictionnaires(chemin):
+    """Lecture d'origine : {nom: {champ: valeur}} sans les NULL"""
+    connexion = sqlite3.connect(chemin)
+    lignes = connexion.execute(f"SELECT nom, {', '.join(CHAMPS_PROJETS)} FROM projets_cooperation").fetchall()
+    connexion.close()
+    return {cle: {champ: donnee for champ, donnee in zip(CHAMPS_PROJETS, reste) if donnee is not None}
+            for cle, *reste in lignes}
+
+
+def base_projets(repertoire, n):
+    """Base SQLite de n projets synthétiques, et la source qui la lit"""
+    chemin = os.path.join(repertoire, f"projets-{n}.sqlite")
+    source = SourceSQLite(chemin)
+    with source.pool.connexion() as connexion, connexion:
+        connexion.execute("DELETE FROM projets_cooperation")
+        connexion.executemany(
+            f"INSERT INTO projets_cooperation VALUES (?, {', '.join('?' * len(CHAMPS_PROJETS))})",
+            [(nom, *(details.get(champ) for champ in CHAMPS_PROJETS))
+             for nom, details in projets_synthetiques(n).items()]
+        )
+    source.intervalle_verification = 0
+    return chemin, source
+
+
+def frame_dictionnaires(dictionnaires):
+    """Frame dérivé d'origine : une liste de dictionnaires par ligne"""
+    lignes = [{'Projet': nom, 'Pays': details['pays'], 'Type': details['type'],
+               'Statut': details['statut']} for nom, details in dictionnaires.items()]
+    return pd.DataFrame(lignes)
+
+
+def frame_enregistrements(enregistrements):
+    """Frame dérivé lu champ par champ dans les enregistrements"""
+    return pd.DataFrame(tableau(enregistrements.values(), COLONNES_PROJETS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projets", type=int, nargs="+", default=[5, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'projets':>9}{'dict (Ko)':>12}{'slots (Ko)':>12}{'gain':>7}"
+          f"{'frame dict':>13}{'frame slots':>13}")
+    with tempfile.TemporaryDirectory() as repertoire:
+        for n in args.projets:
+            chemin, source = base_projets(repertoire, n)
+            dictionnaires, octets_dict = memoire_retenue(lambda: lire_dictionnaires(chemin))
+            enregistrements, octets_slots = memoire_retenue(source.projets_cooperation)
+
+            duree_dict = chronometrer(functools.partial(frame_dictionnaires, dictionnaires))
+            duree_slots = chronometrer(functools.partial(frame_enregistrements, enregistrements))
+            print(f"{n:>9}{octets_dict / 1024:>12,.0f}{octets_slots / 1024:>12,.0f}"
+                  f"{octets_dict / octets_slots:>6.1f}x{duree_dict * 1e3:>10.2f} ms{duree_slots * 1e3:>10.2f} ms")
+            del dictionnaires, enregistrements, source
+
+    # Configurations lues à chaque rerun : une par sélection du sidebar
+    def configs_copiees():
+        return [copy.deepcopy(ADVANCED_CONFIGS.get(selection, CONFIG_PAR_DEFAUT)) for selection in BRANCHES_OPTIONS]
+
+    def configs_partagees():
+        return [get_advanced_config(selection) for selection in BRANCHES_OPTIONS]
+
+    _, octets_copie = memoire_retenue(configs_copiees)
+    _, octets_partage = memoire_retenue(configs_partagees)
+    print(f"\n{len(BRANCHES_OPTIONS)} configurations par rerun : copies {octets_copie / 1024:.1f} Ko, "
+          f"{chronometrer(configs_copiees) * 1e6:.0f} µs ; partagées {octets_partage / 1024:.1f} Ko, "
+          f"{chronometrer(configs_partagees) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
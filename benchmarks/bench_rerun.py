@@ -0,0 +1,91 @@
+# bench_rerun.py
+"""Allocations et latence d'un rerun : dashboard reconstruit à chaque rerun vs modèle partagé.
+
+Chaque rerun ré-exécute le corps du script (comme Streamlit), puis obtient le
+dashboard — nouvelle instance, ou instance partagée du module importé — et
+l'exécute avec Streamlit remplacé par le bouchon de run_benchmarks (tous les
+onglets construits, caches chauds). La phase « modèle » isole ce que le
+changement touche : corps du script et obtention du dashboard.
+
+Usage : python benchmarks/bench_rerun.py [--reruns 50]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Dashboard  # noqa: E402
+from run_benchmarks import StreamlitFactice  # noqa: E402
+
+SCRIPT = compile(open(Dashboard.__file__, encoding="utf-8").read(), Dashboard.__file__, "exec")
+
+
+def modele_par_rerun():
+    exec(SCRIPT, {"__name__": "__rerun__"})
+    return Dashboard.DefenseBricsDashboardAvance()
+
+
+def modele_partage():
+    exec(SCRIPT, {"__name__": "__rerun__"})
+    return Dashboard.dashboard_partage()
+
+
+def rerun(obtenir, session):
+    """(secondes, octets) : phase modèle puis rerun complet"""
+    depart = time.perf_counter()
+    dashboard = obtenir()
+    milieu = time.perf_counter()
+    octets_modele = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+    Dashboard.st.session_state = session
+    dashboard.run_advanced_dashboard()
+    fin = time.perf_counter()
+    octets_rerun = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+    return (milieu - depart, fin - depart), (octets_modele, octets_rerun)
+
+
+def mesurer(modes, reruns):
+    """{libellé: médianes (modèle : s, octets alloués ; rerun complet : s, pic d'octets alloués)}
+
+    Les modes alternent rerun par rerun pour subir le même état du processus ;
+    les durées sont mesurées sans tracemalloc, qui ralentit chaque allocation.
+    """
+    sessions = {libelle: {} for libelle in modes}
+    durees = {libelle: [] for libelle in modes}
+    octets = {libelle: [] for libelle in modes}
+    for _ in range(reruns):
+        for libelle, obtenir in modes.items():
+            durees[libelle].append(rerun(obtenir, sessions[libelle])[0])
+    for _ in range(reruns):
+        for libelle, obtenir in modes.items():
+            gc.collect()
+            tracemalloc.start()
+            octets[libelle].append(rerun(obtenir, sessions[libelle])[1])
+            tracemalloc.stop()
+    return {libelle: [statistics.median(valeurs) for mesures in (durees[libelle], octets[libelle])
+                      for valeurs in zip(*mesures)]
+            for libelle in modes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+
+    Dashboard.st = StreamlitFactice()
+    modes = {"instance par rerun": modele_par_rerun, "modèle partagé": modele_partage}
+    # Échauffement : caches du processus
+    for obtenir in modes.values():
+        obtenir().run_advanced_dashboard()
+    print(f"{'mode':<22}{'modèle':>11}{'alloué':>11}{'rerun':>11}{'pic alloué':>13}")
+    for libelle, (duree_modele, duree_rerun, octets_modele, octets_rerun) in mesurer(modes, args.reruns).items():
+        print(f"{libelle:<22}{duree_modele * 1e3:>8.3f} ms{octets_modele / 1024:>8.1f} Ko"
+              f"{duree_rerun * 1e3:>8.1f} ms{octets_rerun / 1024:>10.0f} Ko")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_sensibilite.py
+"""Analyse de sensibilité : durée selon le nombre d'évaluations et le plan, lot NumPy contre boucle.
+
+Chaque analyse évalue l'indicateur sur toute la période pour chaque jeu de
+paramètres (valeur nominale, variations un à un et échantillon du plan), puis
+calcule percentiles et élasticités. La boucle évalue les mêmes jeux un par un
+avec le même moteur ; sa durée est extrapolée depuis un sous-échantillon.
+
+Usage : python benchmarks/bench_sensibilite.py [--evaluations 1000 10000 100000] [--repetitions 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INDICATEURS = ("Budget_Defense_Mds", "Exercices_Militaires", "Capacite_Navale", "Stock_Ogives_Nucleaires")
+
+# Jeux de paramètres évalués un par un pour extrapoler la boucle
+TAILLE_BOUCLE = 2_000
+
+
+def mediane(fonction, repetitions):
+    fonction()
+    durees = []
+    for _ in range(repetitions):
+        depart = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - depart)
+    return statistics.median(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, RACINE)
+    from data_layer import get_advanced_config
+    from sensitivity_engine import PLANS, analyser_sensibilite, evaluer, parametres_indicateur, plan_hypercube
+    from simulation_engine import axe_temporel
+
+    config = get_advanced_config("BRICS - Vue d'Ensemble")
+    t = axe_temporel(2000, 2027)
+    print(f"{'indicateur':<26}{'plan':<11}{'évaluations':>12}{'lot (ms)':>10}{'boucle (ms)':>13}{'gain':>8}")
+    for indicateur in INDICATEURS:
+        nominaux = parametres_indicateur(indicateur, config)
+        x0 = np.array(list(nominaux.values()))
+        # Coût d'une évaluation isolée, mesuré sur un sous-échantillon
+        x = x0 * (1 + 0.2 * (2 * plan_hypercube(TAILLE_BOUCLE, len(x0)) - 1))
+        depart = time.perf_counter()
+        for ligne in x:
+            evaluer(t, indicateur, config, {nom: ligne[i:i + 1] for i, nom in enumerate(nominaux)})
+        par_evaluation = (time.perf_counter() - depart) / TAILLE_BOUCLE
+
+        for plan in PLANS:
+            for n in args.evaluations:
+                resultat = analyser_sensibilite(indicateur, config, t, plan, n)
+                duree = mediane(lambda: analyser_sensibilite(indicateur, config, t, plan, n), args.repetitions)
+                boucle = par_evaluation * resultat.n_evaluations
+                print(f"{indicateur:<26}{plan:<11}{resultat.n_evaluations:>12}{duree * 1e3:>10.1f}"
+                      f"{boucle * 1e3:>13.0f}{boucle / duree:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
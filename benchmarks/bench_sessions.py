@@ -0,0 +1,213 @@
+# bench_sessions.py
+"""Test de charge : N sessions simultanées du dashboard dans un seul processus, comme une réplique.
+
+Chaque session est pilotée sans navigateur par le testeur de Streamlit
+(AppTest), dans son propre thread : premier rendu, puis une suite d'actions
+tirées au hasard (mode d'analyse, sélection, scénario, cases à cocher du
+sidebar), une par rerun, avec une pause optionnelle entre deux actions.
+Les sessions partagent les caches et le modèle du processus, comme sur le
+serveur.
+
+Rapport par palier de sessions :
+- latence des reruns côté script (p50/p95/p99, mesurée par le dashboard)
+  et vue du client AppTest (p95) ;
+- temps CPU par session et par rerun (CPU du thread de chaque rerun),
+  cœurs occupés par le processus ;
+- RSS du processus et sa croissance par session active.
+
+Usage : python benchmarks/bench_sessions.py [--sessions 1 2 4 8] [--actions 20] [--pause 0.5]
+                                            [--objectif-p95 500] [--json resultats.json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(RACINE, "Dashboard.py")
+
+# Sélecteurs du sidebar selon le mode d'analyse
+LIBELLES_SELECTION = ("Niveau d'analyse:", "Pays membre:", "Programme de coopération:")
+
+CASES = ("Contexte géopolitique", "Analyse des coopérations", "Détails techniques", "Évaluation des menaces")
+
+ACTIONS = ("mode", "selection", "selection", "scenario", "case")
+
+
+def rss_octets():
+    """RSS courant du processus (Linux), sinon pic de RSS"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pic if sys.platform == "darwin" else pic * 1024
+
+
+def cpu_processus():
+    temps = os.times()
+    return temps.user + temps.system
+
+
+def widget(liste, libelle):
+    return next((element for element in liste if element.label == libelle), None)
+
+
+def partager_bytecode():
+    """Script compilé une seule fois pour toutes les sessions, comme sur le serveur
+
+    AppTest recompile le script à chaque rerun avec son propre cache ; en plus
+    du coût, ast.parse n'est pas sûr entre threads sous Python 3.11.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    compilation = ScriptCache.get_bytecode
+    verrou, compiles = threading.Lock(), {}
+
+    def get_bytecode(self, script_path):
+        with verrou:
+            if script_path not in compiles:
+                compiles[script_path] = compilation(self, script_path)
+            return compiles[script_path]
+    ScriptCache.get_bytecode = get_bytecode
+
+
+class SessionSimulee:
+    """Une session AppTest : actions aléatoires reproductibles, mesures de chaque rerun"""
+
+    def __init__(self, graine, tous_onglets=False):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(SCRIPT, default_timeout=300)
+        self.aleatoire = random.Random(graine)
+        self.tous_onglets = tous_onglets
+        self.mesures = []  # (latence script s, latence client s, cpu s)
+        self.erreurs = []
+
+    def _executer(self, element=None):
+        depart = time.perf_counter()
+        (element or self.at).run()
+        client = time.perf_counter() - depart
+        if self.at.exception:
+            self.erreurs.extend(exception.value for exception in self.at.exception)
+            return
+        rerun = self.at.session_state["dernier_rerun"]
+        self.mesures.append((rerun["total"], client, rerun["cpu"]))
+
+    def demarrer(self):
+        self._executer()
+        if self.tous_onglets:
+            self._executer(widget(self.at.sidebar.checkbox, "Rendu à la demande des onglets").uncheck())
+
+    def agir(self):
+        """Un rerun déclenché par un contrôle du sidebar tiré au hasard"""
+        sidebar = self.at.sidebar
+        action = self.aleatoire.choice(ACTIONS)
+        selecteur = next((s for s in (widget(sidebar.selectbox, l) for l in LIBELLES_SELECTION) if s), None)
+        if action == "selection" and selecteur is not None:
+            element = selecteur.set_value(self.aleatoire.choice(selecteur.options))
+        elif action == "scenario":
+            element = widget(sidebar.selectbox, "Scénario:")
+            element = element and element.set_value(self.aleatoire.choice(element.options))
+        elif action == "case":
+            element = widget(sidebar.checkbox, self.aleatoire.choice(CASES))
+            element = element and element.set_value(not element.value)
+        else:
+            element = widget(sidebar.radio, "Mode d'analyse:")
+            element = element and element.set_value(self.aleatoire.choice(element.options))
+        if element is None:
+            # Rendu précédent incomplet : le contrôle n'existe pas
+            self.erreurs.append(f"contrôle absent pour l'action {action!r}")
+            element = self.at
+        self._executer(element)
+
+
+def piloter(session, actions, pause, depart):
+    depart.wait()
+    session.demarrer()
+    for _ in range(actions):
+        if pause:
+            time.sleep(pause)
+        session.agir()
+
+
+def palier(n_sessions, actions, pause, graine, tous_onglets):
+    """Mesures de n sessions simultanées"""
+    sessions = [SessionSimulee(graine + i, tous_onglets) for i in range(n_sessions)]
+    gc.collect()
+    rss_depart = rss_octets()
+    depart = threading.Barrier(n_sessions + 1)
+    threads = [threading.Thread(target=piloter, args=(session, actions, pause, depart)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    depart.wait()
+    debut, cpu_debut = time.perf_counter(), cpu_processus()
+    for thread in threads:
+        thread.join()
+    duree, cpu = time.perf_counter() - debut, cpu_processus() - cpu_debut
+    # Sessions encore en vie : leur état (arbres d'éléments, mémoire du graphe) est compté
+    rss = rss_octets()
+
+    mesures = np.array([mesure for session in sessions for mesure in session.mesures]).reshape(-1, 3)
+    script, client, cpu_reruns = mesures.T
+    cpu_sessions = [sum(mesure[2] for mesure in session.mesures) for session in sessions]
+    return {
+        "sessions": n_sessions,
+        "reruns": len(mesures),
+        "erreurs": sum(len(session.erreurs) for session in sessions),
+        **{f"p{q}_ms": float(np.percentile(script, q)) * 1e3 for q in (50, 95, 99)},
+        "p95_client_ms": float(np.percentile(client, 95)) * 1e3,
+        "cpu_session_s": float(np.mean(cpu_sessions)),
+        "cpu_rerun_ms": float(np.mean(cpu_reruns)) * 1e3,
+        "coeurs": cpu / duree,
+        "debit_reruns_s": len(mesures) / duree,
+        "rss_mo": rss / 1e6,
+        "rss_session_mo": (rss - rss_depart) / n_sessions / 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="Paliers de sessions simultanées")
+    parser.add_argument("--actions", type=int, default=20, help="Reruns par session après le premier rendu")
+    parser.add_argument("--pause", type=float, default=0.0, help="Pause entre deux actions d'une session (s)")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--tous-onglets", action="store_true",
+                        help="Décocher le rendu à la demande : chaque rerun construit tous les onglets")
+    parser.add_argument("--objectif-p95", type=float, default=500.0, help="Latence p95 visée (ms)")
+    parser.add_argument("--json", metavar="FICHIER", help="Écrire les résultats en JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, RACINE)
+    partager_bytecode()
+    # Échauffement : imports et caches du processus, hors mesures
+    echauffement = SessionSimulee(-1, args.tous_onglets)
+    piloter(echauffement, args.actions, 0.0, threading.Barrier(1))
+    del echauffement
+
+    print(f"{'sessions':>8}{'reruns':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'p95 client':>12}"
+          f"{'CPU/session':>13}{'CPU/rerun':>11}{'cœurs':>7}{'reruns/s':>10}{'RSS':>9}{'RSS/session':>13}")
+    resultats = []
+    for n_sessions in args.sessions:
+        r = palier(n_sessions, args.actions, args.pause, args.graine, args.tous_onglets)
+        resultats.append(r)
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['p50_ms']:>6.0f}ms{r['p95_ms']:>6.0f}ms{r['p99_ms']:>6.0f}ms"
+              f"{r['p95_client_ms']:>10.0f}ms{r['cpu_session_s']:>12.2f}s{r['cpu_rerun_ms']:>9.0f}ms"
+              f"{r['coeurs']:>7.2f}{r['debit_reruns_s']:>10.1f}{r['rss_mo']:>7.0f}Mo{r['rss_session_mo']:>11.1f}Mo"
+              + (f"  ({r['erreurs']} erreurs)" if r['erreurs'] else ""))
+
+    tenus = [r["sessions"] for r in resultats if r["p95_ms"] <= args.objectif_p95 and not r["erreurs"]]
+    print(f"\n{os.cpu_count()} cœurs ; sessions simultanées sous l'objectif p95 de {args.objectif_p95:.0f} ms : "
+          f"{max(tenus) if tenus else 'aucun palier'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fichier:
+            json.dump({"objectif_p95_ms": args.objectif_p95, "paliers": resultats}, fichier, indent=2)
+
+
+if __name__ == "__main__":
+    main()
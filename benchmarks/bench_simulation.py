@@ -0,0 +1,133 @@
+# bench_simulation.py
+"""Compare le moteur vectorisé aux boucles par année des méthodes simulate_*.
+
+Mesure aussi le cube de comparaison des membres (un seul appel diffusé)
+face à un calcul par membre, et vérifie qu'ils donnent les mêmes valeurs.
+
+Usage : python benchmarks/bench_simulation.py [--repetitions N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Dashboard import DefenseBricsDashboardAvance  # noqa: E402
+from data_layer import PAYS_MEMBRES, get_advanced_config  # noqa: E402
+from simulation_engine import axe_temporel, simuler_cube, simuler_indicateurs  # noqa: E402
+
+# Séries dont la version par boucles décale les zéros en fin de liste
+SERIES_DECALEES = {"Cooperation_Structured", "Projets_Cooperation", "Echanges_Technologiques", "Exercices_BRICS"}
+
+CAS = [
+    ("2000-2027 annuelle", 2000, 2027, "annuelle"),
+    ("2000-2027 mensuelle", 2000, 2027, "mensuelle"),
+    ("1900-2099 mensuelle", 1900, 2099, "mensuelle"),
+    ("1000-2099 trimestrielle", 1000, 2099, "trimestrielle"),
+    ("1200-2099 mensuelle", 1200, 2099, "mensuelle")
+]
+
+
+def generation_par_boucles(dashboard, annees, config):
+    """Assemblage d'origine : une méthode simulate_* par indicateur, une valeur par année"""
+    data = {
+        'Budget_Defense_Mds': dashboard.simulate_advanced_budget(annees, config),
+        'Personnel_Milliers': dashboard.simulate_advanced_personnel(annees, config),
+        'PIB_Militaire_Pourcent': dashboard.simulate_military_gdp_percentage(annees),
+        'Exercices_Militaires': dashboard.simulate_advanced_exercises(annees, config),
+        'Readiness_Operative': dashboard.simulate_advanced_readiness(annees),
+        'Capacite_Dissuasion': dashboard.simulate_advanced_deterrence(annees),
+        'Temps_Mobilisation_Jours': dashboard.simulate_advanced_mobilization(annees),
+        'Exercices_Conjoints': dashboard.simulate_joint_exercises(annees),
+        'Developpement_Technologique': dashboard.simulate_tech_development(annees),
+        'Capacite_Navale': dashboard.simulate_naval_capacity(annees),
+        'Couverture_AD': dashboard.simulate_air_defense_coverage(annees),
+        'Cooperation_Structured': dashboard.simulate_structured_cooperation(annees),
+        'Cyber_Capabilities': dashboard.simulate_cyber_capabilities(annees),
+        'Production_Armements': dashboard.simulate_weapon_production(annees),
+        'Projets_Cooperation': dashboard.simulate_cooperation_projects(annees),
+        'Echanges_Technologiques': dashboard.simulate_tech_exchanges(annees),
+        'Exercices_BRICS': dashboard.simulate_brics_exercises(annees),
+        'Stock_Ogives_Nucleaires': dashboard.simulate_nuclear_arsenal(annees),
+        'Portee_Missiles_Km': dashboard.simulate_missile_range(annees),
+        'Triade_Nucleaire': dashboard.simulate_nuclear_triad(annees),
+        'Porte_Avions': dashboard.simulate_aircraft_carriers(annees),
+        'Sous_Marins': dashboard.simulate_submarines(annees),
+        'Projection_Maritime': dashboard.simulate_maritime_projection(annees),
+        'Recherche_Defense': dashboard.simulate_defense_research(annees),
+        'Technologies_Emergentes': dashboard.simulate_emerging_tech(annees),
+        'Exportations_Armes': dashboard.simulate_weapon_exports(annees)
+    }
+    return data
+
+
+def meilleur_temps(fonction, repetitions):
+    """Meilleur temps d'exécution (s) sur plusieurs répétitions"""
+    temps = []
+    for _ in range(repetitions):
+        depart = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - depart)
+    return min(temps)
+
+
+def verifier_equivalence(dashboard, config):
+    """Vérifie que le moteur reproduit les boucles sur la période de référence"""
+    annees = list(range(2000, 2028))
+    reference = generation_par_boucles(dashboard, annees, config)
+    noms, matrice = simuler_indicateurs(axe_temporel(), config)
+    for nom, ligne in zip(noms, matrice):
+        if nom in SERIES_DECALEES:
+            continue
+        if not np.allclose(ligne, reference[nom]):
+            raise AssertionError(f"Écart entre moteur et boucles pour {nom}")
+
+
+def verifier_cube(t, configs):
+    """Chaque tranche du cube égale le calcul isolé du membre (NaN hors de ses indicateurs)"""
+    noms_cube, cube = simuler_cube(t, configs)
+    for tranche, config in zip(cube, configs):
+        noms, matrice = simuler_indicateurs(t, config)
+        colonnes = [noms_cube.index(nom) for nom in noms]
+        if not np.array_equal(tranche[:, colonnes], matrice.T):
+            raise AssertionError(f"Écart entre cube et calcul isolé pour {config.get('type')}")
+        if not np.isnan(np.delete(tranche, colonnes, axis=1)).all():
+            raise AssertionError("Indicateur hors programme non masqué dans le cube")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    dashboard = DefenseBricsDashboardAvance()
+    config = dashboard.get_advanced_config("BRICS - Vue d'Ensemble")
+    verifier_equivalence(dashboard, config)
+
+    print(f"{'Cas':<26}{'Points':>12}{'Boucles (ms)':>16}{'Vectorisé (ms)':>16}{'Gain':>10}")
+    for libelle, debut, fin, resolution in CAS:
+        t = axe_temporel(debut, fin, resolution)
+        # Les boucles n'acceptent que des années entières : même nombre de points
+        annees = list(range(debut, debut + t.size))
+        noms, matrice = simuler_indicateurs(t, config)
+        boucles = meilleur_temps(lambda: generation_par_boucles(dashboard, annees, config), args.repetitions)
+        vectorise = meilleur_temps(lambda: simuler_indicateurs(t, config), args.repetitions)
+        print(f"{libelle:<26}{matrice.size:>12,}{boucles * 1e3:>16.2f}{vectorise * 1e3:>16.2f}{boucles / vectorise:>9.0f}x")
+
+    configs = [get_advanced_config(membre) for membre in PAYS_MEMBRES]
+    verifier_cube(axe_temporel(), configs)
+    print(f"\nComparaison des {len(configs)} membres")
+    print(f"{'Cas':<26}{'Un membre (ms)':>16}{'Par membre (ms)':>17}{'Cube (ms)':>12}")
+    for libelle, debut, fin, resolution in CAS:
+        t = axe_temporel(debut, fin, resolution)
+        un = meilleur_temps(lambda: simuler_indicateurs(t, configs[0]), args.repetitions)
+        separes = meilleur_temps(lambda: [simuler_indicateurs(t, c) for c in configs], args.repetitions)
+        cube = meilleur_temps(lambda: simuler_cube(t, configs), args.repetitions)
+        print(f"{libelle:<26}{un * 1e3:>16.2f}{separes * 1e3:>17.2f}{cube * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_startup.py
+"""Mesure le temps d'import de Dashboard.py et échoue au-delà du budget.
+
+Chaque mesure est faite dans un interpréteur neuf. Le script sort en erreur
+si le temps médian dépasse le budget ou si une bibliothèque lourde est
+importée avant qu'une section n'en ait besoin.
+
+Usage : python benchmarks/bench_startup.py [--budget-ms 1000] [--repetitions 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules qui ne doivent pas être chargés par le simple import du dashboard
+MODULES_DIFFERES = ["pandas", "plotly.express", "plotly.subplots", "matplotlib", "seaborn"]
+
+SONDE = """
+import json, sys, time
+depart = time.perf_counter()
+import Dashboard
+duree = time.perf_counter() - depart
+print(json.dumps({"duree": duree, "charges": [m for m in %r if m in sys.modules]}))
+""" % (MODULES_DIFFERES,)
+
+
+def mesurer_import():
+    """Temps d'import (s) et modules différés chargés, dans un interpréteur neuf"""
+    sortie = subprocess.run(
+        [sys.executable, "-c", SONDE], cwd=RACINE, capture_output=True, text=True, check=True
+    )
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def principaux_imports(nombre=10):
+    """Modules les plus coûteux d'après -X importtime (temps cumulé, µs)"""
+    sortie = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import Dashboard"],
+        cwd=RACINE, capture_output=True, text=True, check=True
+    )
+    couts = []
+    for ligne in sortie.stderr.splitlines():
+        if not ligne.startswith("import time:") or "cumulative" in ligne:
+            continue
+        _, cumule, module = [champ.strip() for champ in ligne[len("import time:"):].split("|")]
+        couts.append((int(cumule), module.strip()))
+    return sorted(couts, reverse=True)[:nombre]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("BRICS_IMPORT_BUDGET_MS", 1000)))
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    mesures = [mesurer_import() for _ in range(args.repetitions)]
+    mediane = statistics.median(m["duree"] for m in mesures) * 1000
+    charges = sorted({module for m in mesures for module in m["charges"]})
+
+    print(f"Import de Dashboard.py : médiane {mediane:.0f} ms sur {args.repetitions} essais (budget {args.budget_ms:.0f} ms)")
+    print("Imports les plus coûteux (cumulé) :")
+    for cumule, module in principaux_imports():
+        print(f"  {cumule / 1000:>8.1f} ms  {module}")
+
+    echecs = []
+    if mediane > args.budget_ms:
+        echecs.append(f"budget dépassé ({mediane:.0f} ms > {args.budget_ms:.0f} ms)")
+    if charges:
+        echecs.append(f"modules lourds importés au démarrage : {', '.join(charges)}")
+    if echecs:
+        print("ÉCHEC : " + " ; ".join(echecs))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# bench_store.py
+"""Mémoire résidente selon le nombre de sessions : magasin projeté vs simulation en mémoire.
+
+Chaque « session » garde son propre DataFrame de la sélection (sans passer par
+le cache partagé), pour des séries de plus en plus longues.
+
+Usage : python benchmarks/bench_store.py [--sessions 1 10 100]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+import data_layer  # noqa: E402
+from indicator_store import MagasinIndicateurs  # noqa: E402
+
+PERIODES = [
+    ("2000-2027 annuelle", 2000, 2027, "annuelle"),
+    ("2000-2027 mensuelle", 2000, 2027, "mensuelle"),
+    ("1900-2099 mensuelle", 1900, 2099, "mensuelle")
+]
+
+SELECTION = "BRICS - Vue d'Ensemble"
+
+
+def rss_mo():
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+def mesurer(magasin, n_sessions, debut, fin, resolution):
+    """Hausse de RSS (Mo) pour n sessions détenant chacune leur DataFrame"""
+    data_layer.magasin_indicateurs = magasin
+    data_layer.generer_donnees(SELECTION, debut, fin, resolution)  # construction et projection initiales
+    gc.collect()
+    avant = rss_mo()
+    sessions = [data_layer.generer_donnees(SELECTION, debut, fin, resolution)[0] for _ in range(n_sessions)]
+    for df in sessions:
+        df.sum()  # lecture de toutes les pages
+    apres = rss_mo()
+    del sessions
+    gc.collect()
+    return apres - avant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as racine:
+        variantes = {"magasin": MagasinIndicateurs(racine), "en mémoire": MagasinIndicateurs(racine="")}
+        print(f"{'période':<22}{'sessions':>9}" + "".join(f"{nom:>14}" for nom in variantes))
+        for libelle, debut, fin, resolution in PERIODES:
+            for n_sessions in args.sessions:
+                hausses = [mesurer(magasin, n_sessions, debut, fin, resolution) for magasin in variantes.values()]
+                print(f"{libelle:<22}{n_sessions:>9}" + "".join(f"{h:>11.1f} Mo" for h in hausses))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# run_benchmarks.py
+"""Suite de benchmarks : simulation, assemblage des données et construction des sections.
+
+Mesure, pour plusieurs tailles de période :
+- chaque méthode simulate_* de DefenseBricsDashboardAvance ;
+- generate_advanced_data pour chaque entrée de branches_options ;
+- chaque section create_* / display_*, Streamlit étant remplacé par un bouchon
+  (la sérialisation Plotly de st.plotly_chart est conservée).
+
+Usage :
+    python benchmarks/run_benchmarks.py --enregistrer benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --comparer benchmarks/baseline.json [--seuil 0.25]
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Dashboard  # noqa: E402
+from caching import (cache_comparaisons, cache_donnees, cache_figures, cache_previsions, cache_scenarios,  # noqa: E402
+                     cache_sensibilites)
+from data_layer import normaliser_base_100  # noqa: E402
+from project_index import index_projets  # noqa: E402
+
+# Tailles de période (années entières) pour les méthodes simulate_*
+TAILLES_SIMULATION = [28, 280, 2800]
+
+# Périodes pour l'assemblage des données et les sections
+PERIODES = [
+    ("2000-2027 annuelle", 2000, 2027, "annuelle"),
+    ("2000-2027 mensuelle", 2000, 2027, "mensuelle"),
+    ("1900-2099 mensuelle", 1900, 2099, "mensuelle")
+]
+
+# En dessous de cet écart absolu (s), une hausse relève du bruit de mesure
+PLANCHER_BRUIT = 2e-4
+
+
+class StreamlitFactice:
+    """Bouchon de streamlit : tout appel est accepté et ne produit aucun élément"""
+
+    def __init__(self):
+        import plotly.io
+        self._plotly_io = plotly.io
+        self.sidebar = self
+        self.session_state = {}
+
+    def __getattr__(self, nom):
+        return self._ignorer
+
+    def _ignorer(self, *args, **kwargs):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def columns(self, spec, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def expander(self, *args, **kwargs):
+        return self
+
+    # Widgets : valeur par défaut, comme au premier rendu
+    def selectbox(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def select_slider(self, label, options=(), value=None, **kwargs):
+        return list(options)[0] if value is None else value
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return min_value if value is None else value
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return list(default or [])
+
+    def number_input(self, label, min_value=None, max_value=None, value="min", **kwargs):
+        return min_value if value == "min" else value
+
+    def text_input(self, label, value="", **kwargs):
+        return value
+
+    def tabs(self, libelles, **kwargs):
+        return [self] * len(libelles)
+
+    def plotly_chart(self, figure, **kwargs):
+        # Même sérialisation que st.plotly_chart
+        self._plotly_io.to_json(figure, validate=False)
+
+
+def mesurer(fonction, repetitions, preparation=None):
+    """Temps médian (s) d'une fonction sur plusieurs répétitions, après un appel d'échauffement"""
+    if preparation:
+        preparation()
+    fonction()
+    temps = []
+    for _ in range(repetitions):
+        if preparation:
+            preparation()
+        depart = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - depart)
+    return statistics.median(temps)
+
+
+def vider_caches():
+    for cache in (cache_donnees, cache_figures, cache_scenarios, cache_comparaisons, cache_sensibilites,
+                  cache_previsions):
+        cache.clear()
+
+
+def methodes(dashboard, prefixes):
+    return [(nom, getattr(dashboard, nom)) for nom in sorted(dir(dashboard))
+            if nom.startswith(prefixes) and callable(getattr(dashboard, nom))]
+
+
+def appeler(methode, arguments):
+    """Appelle une méthode en lui passant les arguments attendus par nom"""
+    parametres = inspect.signature(methode).parameters
+    return methode(**{nom: arguments[nom] for nom in parametres if nom in arguments})
+
+
+def executer(repetitions, caches_chauds=False):
+    """Exécute la suite et renvoie {nom de mesure: secondes}"""
+    Dashboard.st = StreamlitFactice()
+    dashboard = Dashboard.DefenseBricsDashboardAvance()
+    config_reference = dashboard.get_advanced_config("BRICS - Vue d'Ensemble")
+    preparation = None if caches_chauds else vider_caches
+    resultats = {}
+
+    for taille in TAILLES_SIMULATION:
+        annees = list(range(2000, 2000 + taille))
+        for nom, methode in methodes(dashboard, ("simulate_",)):
+            arguments = {"annees": annees, "config": config_reference}
+            resultats[f"simulate/{nom}/n={taille}"] = mesurer(lambda: appeler(methode, arguments), repetitions)
+
+    for libelle, debut, fin, resolution in PERIODES:
+        for selection in dashboard.branches_options:
+            resultats[f"generate/{selection}/{libelle}"] = mesurer(
+                lambda: dashboard.generate_advanced_data(selection, debut, fin, resolution), repetitions
+            )
+
+        df, config = dashboard.generate_advanced_data("BRICS - Vue d'Ensemble", debut, fin, resolution)
+        scenario = "Coopération Renforcée"
+        controls = {
+            'selection': "BRICS - Vue d'Ensemble", 'type_analyse': "Vue d'Ensemble BRICS",
+            'show_geopolitical': True, 'show_cooperation': True, 'show_technical': True,
+            'threat_assessment': True, 'rendu_a_la_demande': True, 'scenario': scenario,
+            'n_trajectoires': 10_000
+        }
+        bandes = dashboard.get_scenario_bands(controls['selection'], scenario, 10_000, debut, fin, resolution)
+        index = index_projets(dashboard.cooperation_projects)
+        comparaison = dashboard.get_comparison_cube(debut=debut, fin=fin, resolution=resolution)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _, positions = normaliser_base_100(comparaison.valeurs)
+        arguments = {"df": df, "config": config, "controls": controls, "scenario": scenario, "bandes": bandes,
+                     "index": index, "selection": index.selection(), "comparaison": comparaison,
+                     "membres": list(comparaison.membres), "positions": positions,
+                     "indicateur": "Cooperation_Structured",
+                     "previsions": dashboard.get_forecast_models(controls['selection'], debut, fin, resolution),
+                     "periode": (fin, fin + 8)}
+        for nom, methode in methodes(dashboard, ("create_", "display_")):
+            resultats[f"section/{nom}/{libelle}"] = mesurer(
+                lambda: appeler(methode, arguments), repetitions, preparation
+            )
+    return resultats
+
+
+def comparer(resultats, reference, seuil):
+    """Mesures plus lentes que la référence au-delà du seuil relatif"""
+    regressions = []
+    for nom, temps in sorted(resultats.items()):
+        avant = reference.get(nom)
+        if avant is None:
+            continue
+        if temps > avant * (1 + seuil) and temps - avant > PLANCHER_BRUIT:
+            regressions.append((nom, avant, temps))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--caches-chauds", action="store_true",
+                        help="Ne pas vider les caches entre deux mesures de section")
+    parser.add_argument("--enregistrer", metavar="JSON", help="Écrire les résultats comme référence")
+    parser.add_argument("--comparer", metavar="JSON", help="Comparer à une référence enregistrée")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Hausse relative tolérée (0.25 = +25 %%)")
+    args = parser.parse_args()
+
+    resultats = executer(args.repetitions, args.caches_chauds)
+    for nom, temps in sorted(resultats.items()):
+        print(f"{temps * 1e3:>10.3f} ms  {nom}")
+
+    if args.enregistrer:
+        with open(args.enregistrer, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                         "date": time.strftime("%Y-%m-%d"), "repetitions": args.repetitions},
+                "mesures": resultats
+            }, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"Référence écrite dans {args.enregistrer}")
+
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as f:
+            reference = json.load(f)["mesures"]
+        regressions = comparer(resultats, reference, args.seuil)
+        for nom, avant, apres in regressions:
+            print(f"RÉGRESSION {nom} : {avant * 1e3:.3f} ms -> {apres * 1e3:.3f} ms ({apres / avant - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"Aucune régression au-delà de {args.seuil:.0%} sur {len(resultats)} mesures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# caching.py
+"""Cache de résultats partagé par toutes les sessions du processus.
+
+Le script Streamlit est ré-exécuté à chaque interaction : les caches vivent
+donc dans ce module importé, qui persiste entre les reruns et les sessions.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Sentinelle distinguant une entrée absente d'une valeur None en cache
+_ABSENT = object()
+
+
+class CacheLRU:
+    """Cache borné (nombre d'entrées, octets) avec éviction LRU et expiration TTL"""
+
+    def __init__(self, taille_max=128, ttl=None, octets_max=None, mesure=None):
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self.octets_max = octets_max
+        self.mesure = mesure or (lambda valeur: 0)
+        self._entrees = OrderedDict()  # cle -> (valeur, expiration, octets)
+        self._octets = 0
+        self._verrou = threading.RLock()
+        self._en_cours = {}  # cle -> verrou de calcul (évite les calculs en double)
+        self.hits = 0
+        self.misses = 0
+        self.evictions_lru = 0
+        self.evictions_ttl = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __contains__(self, cle):
+        with self._verrou:
+            return self._lire(cle) is not _ABSENT
+
+    def _lire(self, cle):
+        """Lit une entrée valide (sous verrou), ou _ABSENT"""
+        entree = self._entrees.get(cle)
+        if entree is None:
+            return _ABSENT
+        valeur, expiration, _ = entree
+        if expiration is not None and expiration <= time.monotonic():
+            self._retirer(cle)
+            self.evictions_ttl += 1
+            return _ABSENT
+        self._entrees.move_to_end(cle)
+        return valeur
+
+    def _retirer(self, cle):
+        _, _, octets = self._entrees.pop(cle)
+        self._octets -= octets
+
+    def get(self, cle, defaut=None):
+        """Valeur en cache (compte un hit ou un miss)"""
+        with self._verrou:
+            valeur = self._lire(cle)
+            if valeur is _ABSENT:
+                self.misses += 1
+                return defaut
+            self.hits += 1
+            return valeur
+
+    def set(self, cle, valeur):
+        """Insère une valeur puis évince les entrées les moins récentes au-delà des bornes"""
+        octets = self.mesure(valeur)
+        expiration = time.monotonic() + self.ttl if self.ttl else None
+        with self._verrou:
+            if cle in self._entrees:
+                self._retirer(cle)
+            self._entrees[cle] = (valeur, expiration, octets)
+            self._octets += octets
+            while len(self._entrees) > 1 and (
+                    len(self._entrees) > self.taille_max
+                    or (self.octets_max is not None and self._octets > self.octets_max)):
+                self._retirer(next(iter(self._entrees)))
+                self.evictions_lru += 1
+
+    def get_or_compute(self, cle, calcul):
+        """Renvoie la valeur en cache ou la calcule une seule fois, même sous concurrence"""
+        with self._verrou:
+            valeur = self._lire(cle)
+            if valeur is not _ABSENT:
+                self.hits += 1
+                return valeur
+            verrou_calcul = self._en_cours.setdefault(cle, threading.Lock())
+
+        with verrou_calcul:
+            with self._verrou:
+                # Une autre session a pu terminer le calcul pendant l'attente
+                valeur = self._lire(cle)
+                if valeur is not _ABSENT:
+                    self.hits += 1
+                    return valeur
+                self.misses += 1
+            try:
+                valeur = calcul()
+                self.set(cle, valeur)
+            finally:
+                with self._verrou:
+                    self._en_cours.pop(cle, None)
+        return valeur
+
+    def invalider(self, predicat):
+        """Retire les entrées dont la clé satisfait le prédicat ; renvoie leur nombre"""
+        with self._verrou:
+            cles = [cle for cle in self._entrees if predicat(cle)]
+            for cle in cles:
+                self._retirer(cle)
+            self.invalidations += len(cles)
+            return len(cles)
+
+    def clear(self):
+        with self._verrou:
+            self._entrees.clear()
+            self._octets = 0
+
+    def statistiques(self):
+        """Compteurs de hits, misses et évictions"""
+        with self._verrou:
+            requetes = self.hits + self.misses
+            return {
+                "entrees": len(self._entrees),
+                "octets": self._octets,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions_lru": self.evictions_lru,
+                "evictions_ttl": self.evictions_ttl,
+                "invalidations": self.invalidations,
+                "taux_hit": self.hits / requetes if requetes else 0.0
+            }
+
+
+# Propriétés des traces portant les séries de données
+PROPRIETES_SERIES = ("x", "y", "z", "r", "theta", "values", "labels", "parents", "customdata", "text")
+
+
+def taille_figure(entree):
+    """Empreinte approchée d'une figure : octets des séries de ses traces (8 par valeur hors NumPy)"""
+    octets = 0
+    for trace in entree[0].data:
+        for propriete in PROPRIETES_SERIES:
+            serie = getattr(trace, propriete, None)
+            if serie is not None and not isinstance(serie, str):
+                octets += getattr(serie, "nbytes", None) or 8 * len(serie)
+    return octets
+
+
+class CacheFigures(CacheLRU):
+    """Figures Plotly construites une seule fois par contenu de données"""
+
+    def __init__(self, taille_max=256, ttl=None):
+        super().__init__(taille_max=taille_max, ttl=ttl, mesure=taille_figure)
+        self.temps_economise = 0.0
+
+    def figure(self, nom, donnees, construction):
+        """Renvoie (figure, secondes économisées) ; la figure est partagée, à ne pas modifier"""
+        cle = (nom, empreinte(donnees))
+        entree = self.get(cle)
+        if entree is not None:
+            fig, duree = entree
+            with self._verrou:
+                self.temps_economise += duree
+            return fig, duree
+
+        depart = time.perf_counter()
+        fig = construction(donnees)
+        duree = time.perf_counter() - depart
+        self.set(cle, (fig, duree))
+        return fig, 0.0
+
+    def statistiques(self):
+        stats = super().statistiques()
+        stats["temps_economise_s"] = self.temps_economise
+        return stats
+
+
+def empreinte(donnees):
+    """Empreinte SHA-256 du contenu d'une structure sérialisable en JSON"""
+    contenu = json.dumps(donnees, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def empreinte_sources(modules):
+    """Empreinte SHA-256 du code source de modules du projet (fichiers à côté de ce module)"""
+    racine = os.path.dirname(os.path.abspath(__file__))
+    sources = {}
+    for nom in modules:
+        with open(os.path.join(racine, nom), "rb") as fichier:
+            sources[nom] = hashlib.sha256(fichier.read()).hexdigest()
+    return empreinte(sources)
+
+
+def etat_fichier(chemin):
+    """(date de modification, taille, inode) d'un fichier, ou None s'il est absent
+
+    Change dès que le fichier est réécrit ou remplacé : un artefact reconstruit est relu.
+    """
+    try:
+        etat = os.stat(chemin)
+    except (OSError, ValueError):
+        return None
+    return etat.st_mtime_ns, etat.st_size, etat.st_ino
+
+
+def taille_dataframe(resultat):
+    """Empreinte mémoire d'un couple (DataFrame, config)"""
+    df = resultat[0]
+    return int(df.memory_usage(deep=True).sum())
+
+
+# Jeux de données générés, partagés par toutes les sessions
+cache_donnees = CacheLRU(taille_max=256, ttl=3600, octets_max=256 * 1024 ** 2, mesure=taille_dataframe)
+
+# Bandes de percentiles des scénarios Monte Carlo
+cache_scenarios = CacheLRU(taille_max=128, ttl=3600)
+
+# Cubes de comparaison des membres (membre × période × indicateur)
+cache_comparaisons = CacheLRU(taille_max=32, ttl=3600, octets_max=256 * 1024 ** 2,
+                              mesure=lambda comparaison: comparaison.valeurs.nbytes)
+
+# Analyses de sensibilité (tornade, élasticités et percentiles par paramètre)
+cache_sensibilites = CacheLRU(taille_max=64, ttl=3600)
+
+# Modèles de prévision ajustés par jeu de données (tous les indicateurs, tous les modèles)
+cache_previsions = CacheLRU(taille_max=128, ttl=3600)
+
+# Figures construites à partir de données constantes, partagées par toutes les sessions
+cache_figures = CacheFigures()
@@ -0,0 +1,251 @@
+# data_layer.py
+"""Couche de données du dashboard BRICS, utilisable sans Streamlit.
+
+Options de sélection, configurations avancées et génération des jeux de
+données à partir du moteur de simulation vectorisé, servis par tranches du
+magasin colonnaire projeté en mémoire lorsque la période s'y prête.
+"""
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from indicator_store import magasin_indicateurs
+from lazy_imports import importer_differe
+from records import ConfigAvancee
+from simulation_engine import RESOLUTIONS, axe_temporel, simuler_cube, simuler_indicateurs
+
+pd = importer_differe("pandas")
+
+BRANCHES_OPTIONS = [
+    "BRICS - Vue d'Ensemble", "Chine", "Russie", "Inde",
+    "Brésil", "Afrique du Sud", "Coopérations BRICS",
+    "Nouveaux Membres (2024)"
+]
+
+PROGRAMMES_OPTIONS = [
+    "Coopération Militaire BRICS", "Exercices Conjoints",
+    "Transferts de Technologie", "Défense Anti-Missile",
+    "Marine BRICS", "Cybersécurité Collective",
+    "Industrie de Défense Intégrée"
+]
+
+PAYS_MEMBRES = ["Chine", "Russie", "Inde", "Brésil", "Afrique du Sud"]
+
+SELECTION_SCENARIOS = "Scénarios Géopolitiques"
+
+# Valeurs initiales des données de référence (voir data_sources pour la base qui les sert)
+CAPACITES_MEMBRES = {
+    "Chine": {
+        "budget": 230.0,
+        "personnel": 2035,
+        "nucleaire": "Oui",
+        "porte_avions": 3,
+        "icbm": "DF-41, DF-31AG",
+        "technologies": "Hypersonique, IA, Cyber"
+    },
+    "Russie": {
+        "budget": 65.0,
+        "personnel": 1014,
+        "nucleaire": "Oui",
+        "porte_avions": 1,
+        "icbm": "RS-28 Sarmat, RS-24 Yars",
+        "technologies": "Hypersonique, Guerre électronique"
+    },
+    "Inde": {
+        "budget": 73.0,
+        "personnel": 1455,
+        "nucleaire": "Oui",
+        "porte_avions": 2,
+        "icbm": "Agni-V, Agni-VI",
+        "technologies": "Missiles, Spatial, Cyber"
+    },
+    "Brésil": {
+        "budget": 22.0,
+        "personnel": 334,
+        "nucleaire": "Non",
+        "porte_avions": 0,
+        "forces": "Amazonie, Surveillance maritime",
+        "technologies": "Sous-marins, Systèmes de surveillance"
+    },
+    "Afrique du Sud": {
+        "budget": 3.0,
+        "personnel": 72,
+        "nucleaire": "Non",
+        "forces": "Forces spéciales, Paix ONU",
+        "technologies": "Cybersécurité, Renseignement"
+    }
+}
+
+PROJETS_COOPERATION = {
+    "Exercice Naval BRICS": {"pays": "Tous", "type": "Exercice conjoint", "statut": "Actif", "frequence": "Annuel"},
+    "Système de Communication Sécurisé": {"pays": "Chine/Russie/Inde", "type": "Communication", "statut": "Développement", "objectif": "2026"},
+    "Centre Cyber BRICS": {"pays": "Chine/Russie", "type": "Cybersécurité", "statut": "Opérationnel", "localisation": "Moscou/Pékin"},
+    "Développement Missilistique": {"pays": "Chine/Russie/Inde", "type": "Technologie", "statut": "Coopération", "domaines": "Hypersonique, Croisière"},
+    "Surveillance Spatiale": {"pays": "Chine/Russie", "type": "Espace", "statut": "Partage données", "satellites": "Reconnaissance"}
+}
+
+ADVANCED_CONFIGS = {
+    "BRICS - Vue d'Ensemble": {
+        "type": "alliance_multipolaire",
+        "budget_base": 400.0,
+        "personnel_base": 4900,
+        "exercices_base": 180,
+        "priorites": ["cooperation", "nucleaire", "marine", "innovation", "cyber"],
+        "doctrines": ["Multipolarité", "Souveraineté stratégique", "Défense collective"],
+        "objectifs": "Contrepoids à l'hégémonie occidentale"
+    },
+    "Chine": {
+        "type": "puissance_mondiale",
+        "budget_base": 230.0,
+        "personnel_base": 2035,
+        "priorites": ["marine", "missiles", "cyber", "espace"],
+        "capacites": ["Force de frappe nucléaire", "Marine bleue", "Guerre électronique"],
+        "doctrine": "Défense active périphérique"
+    },
+    "Russie": {
+        "type": "puissance_nucleaire",
+        "budget_base": 65.0,
+        "personnel_base": 1014,
+        "priorites": ["nucleaire", "missiles", "cyber", "asymetrique"],
+        "capacites": ["Triade nucléaire", "Systèmes hypersoniques", "Guerre hybride"],
+        "doctrine": "Dissuasion stratégique élargie"
+    },
+    "Coopérations BRICS": {
+        "type": "cooperation_strategique",
+        "budget_base": 15.0,
+        "priorites": ["exercices_conjoints", "transfert_technologie", "intelligence_collective"],
+        "projets": ["Exercices navals", "Centre cyber", "Systèmes C4ISR"],
+        "objectifs": "Autonomie stratégique collective"
+    }
+}
+
+# Fréquence pandas de l'index de périodes selon la résolution
+FREQUENCES = {
+    "annuelle": "Y",
+    "trimestrielle": "Q",
+    "mensuelle": "M"
+}
+
+# Indicateurs des cartes du tableau de bord stratégique
+INDICATEURS_KPI = [
+    "Budget_Defense_Mds", "PIB_Militaire_Pourcent", "Personnel_Milliers", "Capacite_Dissuasion",
+    "Stock_Ogives_Nucleaires", "Cooperation_Structured", "Projets_Cooperation",
+    "Temps_Mobilisation_Jours", "Capacite_Navale", "Portee_Missiles_Km", "Readiness_Operative"
+]
+
+# Cube de comparaison : valeurs[membre, période, indicateur], NaN hors des groupes actifs du membre
+Comparaison = namedtuple("Comparaison", ["membres", "indicateurs", "annees", "index", "valeurs"])
+
+CONFIG_PAR_DEFAUT = {
+    "type": "membre_brics",
+    "personnel_base": 300,
+    "exercices_base": 25,
+    "priorites": ["defense_generique"]
+}
+
+# Membres sans configuration détaillée : configuration générique, budget et effectifs
+# tirés de leurs capacités de référence
+ADVANCED_CONFIGS.update({
+    pays: {**CONFIG_PAR_DEFAUT, "budget_base": capacites["budget"], "personnel_base": capacites["personnel"]}
+    for pays, capacites in CAPACITES_MEMBRES.items() if pays not in ADVANCED_CONFIGS
+})
+
+# Configurations immuables, partagées sans copie par toutes les sessions
+CONFIGS = {selection: ConfigAvancee(**config) for selection, config in ADVANCED_CONFIGS.items()}
+CONFIG_DEFAUT = ConfigAvancee(**CONFIG_PAR_DEFAUT)
+
+
+def toutes_les_selections():
+    """Toutes les sélections possibles du sidebar, sans doublon"""
+    selections = BRANCHES_OPTIONS + PAYS_MEMBRES + PROGRAMMES_OPTIONS + [SELECTION_SCENARIOS]
+    return list(dict.fromkeys(selections))
+
+
+def get_advanced_config(selection):
+    """Configuration avancée d'une sélection (enregistrement immuable partagé)"""
+    return CONFIGS.get(selection, CONFIG_DEFAUT)
+
+
+@functools.lru_cache(maxsize=64)
+def index_temporel(debut=2000, fin=2027, resolution="annuelle"):
+    """Index de périodes (années, trimestres ou mois), partagé par les jeux de données d'une même période"""
+    n_periodes = (fin - debut + 1) * RESOLUTIONS[resolution]
+    return pd.period_range(start=str(debut), periods=n_periodes, freq=FREQUENCES[resolution], name="Periode")
+
+
+def position_periode(df, periode):
+    """Position de la ligne d'une période (ou du début d'une année), par calcul direct sur l'index"""
+    index = df.index
+    periode = pd.Period(str(periode), freq=index.freq)
+    position = periode.ordinal - index[0].ordinal
+    if not 0 <= position < len(index) or index[position] != periode:
+        raise KeyError(periode)
+    return position
+
+
+def instantane_kpi(df, annee=None, annee_reference=2000):
+    """Valeurs des cartes KPI et leurs variations depuis l'année de référence, en une passe"""
+    colonnes = [nom for nom in INDICATEURS_KPI if nom in df.columns]
+    actuelle = len(df) - 1 if annee is None else position_periode(df, annee)
+    # Référence antérieure à la période couverte : première ligne
+    premiere = df.index[0].year
+    reference = position_periode(df, max(annee_reference, premiere))
+
+    valeurs = np.full((2, len(INDICATEURS_KPI)), np.nan)
+    positions = [INDICATEURS_KPI.index(nom) for nom in colonnes]
+    valeurs[:, positions] = np.array([df[nom].to_numpy()[[reference, actuelle]] for nom in colonnes]).T
+    avant, apres = valeurs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        croissance = (apres - avant) / avant * 100
+
+    return {
+        "periode": df.index[actuelle],
+        "reference": df.index[reference],
+        "actuel": dict(zip(INDICATEURS_KPI, apres)),
+        "initial": dict(zip(INDICATEURS_KPI, avant)),
+        "variation": dict(zip(INDICATEURS_KPI, apres - avant)),
+        "croissance_pct": dict(zip(INDICATEURS_KPI, croissance))
+    }
+
+
+def generer_donnees(selection, debut=2000, fin=2027, resolution="annuelle"):
+    """Jeu de données (DataFrame indicateurs × temps, indexé par période) et configuration d'une sélection"""
+    config = get_advanced_config(selection)
+
+    # Colonnes du magasin : le DataFrame référence les projections sans les copier
+    try:
+        data = magasin_indicateurs.colonnes(selection, config, debut, fin, resolution)
+    except OSError:
+        data = None  # Magasin non inscriptible : simulation en mémoire
+    if data is None:
+        # Tous les indicateurs (socle + programmes prioritaires) en une seule matrice
+        annees = axe_temporel(debut, fin, resolution)
+        noms, matrice = simuler_indicateurs(annees, config)
+        data = {'Annee': annees}
+        data.update(zip(noms, matrice))
+    return pd.DataFrame(data, index=index_temporel(debut, fin, resolution), copy=False), config
+
+
+def generer_comparaison(membres=PAYS_MEMBRES, debut=2000, fin=2027, resolution="annuelle"):
+    """Indicateurs de plusieurs membres en un seul calcul vectorisé (cube membre × période × indicateur)"""
+    membres = tuple(membres)
+    configs = [get_advanced_config(membre) for membre in membres]
+    annees = axe_temporel(debut, fin, resolution)
+    noms, cube = simuler_cube(annees, configs)
+    return Comparaison(membres, noms, annees, index_temporel(debut, fin, resolution), cube)
+
+
+def normaliser_base_100(valeurs):
+    """Séries d'un cube (membre × période × indicateur) rapportées à leur première valeur non nulle
+
+    Renvoie le cube normalisé et la position de la période de base (membre ×
+    indicateur), -1 pour une série sans valeur non nulle, laissée à NaN. Une
+    série nulle en début de période (rampe avant son origine) vaut 0 jusqu'à
+    sa base.
+    """
+    non_nulles = np.isfinite(valeurs) & (valeurs != 0)
+    positions = np.where(non_nulles.any(axis=1), non_nulles.argmax(axis=1), -1)
+    bases = np.take_along_axis(valeurs, np.maximum(positions, 0)[:, None, :], axis=1)
+    bases[positions[:, None, :] < 0] = np.nan
+    return valeurs / bases * 100, positions
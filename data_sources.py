@@ -0,0 +1,232 @@
+# data_sources.py
+"""Sources des données de référence : capacités des membres et projets de coopération.
+
+La source par défaut est une base SQLite locale, initialisée avec les valeurs
+de data_layer. Des déclencheurs incrémentent un numéro de version par table à
+chaque modification : une table n'est relue que si sa version a changé, et
+seules les figures construites à partir de cette table sont invalidées.
+
+Source choisie par BRICS_SOURCE : chemin de la base (défaut
+artifacts/brics.sqlite) ou « statique » pour les valeurs intégrées.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from caching import cache_figures
+from data_layer import CAPACITES_MEMBRES, PROJETS_COOPERATION
+from records import CapaciteMembre, ProjetCooperation, enregistrements, interner
+
+CHEMIN_BASE = os.environ.get(
+    "BRICS_SOURCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "brics.sqlite")
+)
+
+# Colonnes optionnelles : une valeur NULL est absente du dictionnaire renvoyé
+CHAMPS_CAPACITES = ["budget", "personnel", "nucleaire", "porte_avions", "icbm", "forces", "technologies"]
+CHAMPS_PROJETS = ["pays", "type", "statut", "frequence", "objectif", "localisation", "domaines", "satellites"]
+
+# Figures du cache construites à partir de chaque table
+FIGURES_PAR_TABLE = {
+    "capacites_membres": ("contributions",),
+    "projets_cooperation": ("carte_projets", "carte_cooperations")
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS capacites_membres (
+    pays TEXT PRIMARY KEY,
+    budget REAL NOT NULL,
+    personnel INTEGER NOT NULL,
+    nucleaire TEXT NOT NULL,
+    porte_avions INTEGER,
+    icbm TEXT,
+    forces TEXT,
+    technologies TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projets_cooperation (
+    nom TEXT PRIMARY KEY,
+    pays TEXT NOT NULL,
+    type TEXT NOT NULL,
+    statut TEXT NOT NULL,
+    frequence TEXT,
+    objectif TEXT,
+    localisation TEXT,
+    domaines TEXT,
+    satellites TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projets_type ON projets_cooperation (type);
+CREATE INDEX IF NOT EXISTS idx_projets_statut ON projets_cooperation (statut);
+CREATE INDEX IF NOT EXISTS idx_projets_pays ON projets_cooperation (pays);
+
+CREATE TABLE IF NOT EXISTS versions (
+    nom_table TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO versions VALUES ('capacites_membres', 0), ('projets_cooperation', 0);
+"""
+
+DECLENCHEUR = """
+CREATE TRIGGER IF NOT EXISTS version_{table}_{operation} AFTER {operation} ON {table}
+BEGIN
+    UPDATE versions SET version = version + 1 WHERE nom_table = '{table}';
+END;
+"""
+
+
+class SourceDonnees(ABC):
+    """Interface d'une source de données de référence : {clé: enregistrement} partagés et immuables"""
+
+    @abstractmethod
+    def capacites_membres(self):
+        """{pays: CapaciteMembre}"""
+
+    @abstractmethod
+    def projets_cooperation(self):
+        """{nom: ProjetCooperation}"""
+
+
+class SourceStatique(SourceDonnees):
+    """Valeurs intégrées au dashboard, sans base"""
+
+    def __init__(self):
+        self._capacites = enregistrements(CapaciteMembre, CAPACITES_MEMBRES, "pays")
+        self._projets = enregistrements(ProjetCooperation, PROJETS_COOPERATION, "nom")
+
+    def capacites_membres(self):
+        return self._capacites
+
+    def projets_cooperation(self):
+        return self._projets
+
+
+class PoolConnexions:
+    """Connexions SQLite ouvertes une seule fois et prêtées aux threads des sessions"""
+
+    def __init__(self, chemin, taille=4):
+        self._libres = queue.LifoQueue()
+        for _ in range(taille):
+            connexion = sqlite3.connect(chemin, timeout=5, check_same_thread=False)
+            # WAL : les lectures ne sont pas bloquées par une mise à jour en cours
+            connexion.execute("PRAGMA journal_mode=WAL")
+            self._libres.put(connexion)
+
+    @contextmanager
+    def connexion(self):
+        connexion = self._libres.get()
+        try:
+            yield connexion
+        finally:
+            self._libres.put(connexion)
+
+
+class SourceSQLite(SourceDonnees):
+    """Base SQLite locale ; chaque table est relue seulement quand son numéro de version change"""
+
+    def __init__(self, chemin=CHEMIN_BASE, taille_pool=4, intervalle_verification=1.0):
+        os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+        self.chemin = chemin
+        self.pool = PoolConnexions(chemin, taille_pool)
+        # Les versions sont relues au plus une fois par intervalle (secondes)
+        self.intervalle_verification = intervalle_verification
+        self.requetes = 0  # lectures de table effectuées
+        self._tables = {}  # table -> (version, valeur)
+        self._versions = {}
+        self._verification = None
+        self._verrou = threading.Lock()
+        self._initialiser()
+
+    def _initialiser(self):
+        """Crée le schéma et les déclencheurs, puis insère les valeurs initiales d'une base vide"""
+        with self.pool.connexion() as connexion:
+            connexion.executescript(SCHEMA + "".join(
+                DECLENCHEUR.format(table=table, operation=operation)
+                for table in FIGURES_PAR_TABLE for operation in ("INSERT", "UPDATE", "DELETE")
+            ))
+            with connexion:
+                if connexion.execute("SELECT COUNT(*) FROM capacites_membres").fetchone()[0] == 0:
+                    connexion.executemany(
+                        f"INSERT INTO capacites_membres VALUES (?, {', '.join('?' * len(CHAMPS_CAPACITES))})",
+                        [(pays, *(data.get(champ) for champ in CHAMPS_CAPACITES))
+                         for pays, data in CAPACITES_MEMBRES.items()]
+                    )
+                if connexion.execute("SELECT COUNT(*) FROM projets_cooperation").fetchone()[0] == 0:
+                    connexion.executemany(
+                        f"INSERT INTO projets_cooperation VALUES (?, {', '.join('?' * len(CHAMPS_PROJETS))})",
+                        [(nom, *(details.get(champ) for champ in CHAMPS_PROJETS))
+                         for nom, details in PROJETS_COOPERATION.items()]
+                    )
+
+    def versions(self):
+        """Numéros de version des tables ; invalide les données et figures des tables modifiées"""
+        with self._verrou:
+            maintenant = time.monotonic()
+            if self._verification is None or maintenant - self._verification >= self.intervalle_verification:
+                with self.pool.connexion() as connexion:
+                    versions = dict(connexion.execute("SELECT nom_table, version FROM versions"))
+                for table, version in versions.items():
+                    if table in self._versions and self._versions[table] != version:
+                        self._invalider(table)
+                self._versions = versions
+                self._verification = maintenant
+            return dict(self._versions)
+
+    def _invalider(self, table):
+        self._tables.pop(table, None)
+        noms = FIGURES_PAR_TABLE.get(table, ())
+        cache_figures.invalider(lambda cle: cle[0] in noms)
+
+    def _lire(self, table, requete, classe, champs):
+        version = self.versions()[table]
+        with self._verrou:
+            entree = self._tables.get(table)
+            if entree is not None and entree[0] == version:
+                return entree[1]
+
+        with self.pool.connexion() as connexion:
+            lignes = connexion.execute(requete).fetchall()
+        # Première colonne de la requête : clé du dictionnaire, conservée dans l'enregistrement
+        valeur = {interner(ligne[0]): classe(**dict(zip(champs, ligne))) for ligne in lignes}
+        with self._verrou:
+            self._tables[table] = (version, valeur)
+            self.requetes += 1
+        return valeur
+
+    def capacites_membres(self):
+        return self._lire("capacites_membres",
+                          f"SELECT pays, {', '.join(CHAMPS_CAPACITES)} FROM capacites_membres ORDER BY rowid",
+                          CapaciteMembre, ["pays"] + CHAMPS_CAPACITES)
+
+    def projets_cooperation(self):
+        return self._lire("projets_cooperation",
+                          f"SELECT nom, {', '.join(CHAMPS_PROJETS)} FROM projets_cooperation ORDER BY rowid",
+                          ProjetCooperation, ["nom"] + CHAMPS_PROJETS)
+
+
+_source = None
+_verrou_source = threading.Lock()
+
+
+def source_donnees():
+    """Source partagée par le processus : SQLite, ou valeurs intégrées si la base est indisponible"""
+    global _source
+    with _verrou_source:
+        if _source is None:
+            if CHEMIN_BASE == "statique":
+                _source = SourceStatique()
+            else:
+                try:
+                    _source = SourceSQLite(CHEMIN_BASE)
+                except (sqlite3.Error, OSError):
+                    _source = SourceStatique()
+        return _source
+
+
+def definir_source(source):
+    """Remplace la source du processus (autre base, source distante...)"""
+    global _source
+    with _verrou_source:
+        _source = source
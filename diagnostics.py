@@ -0,0 +1,203 @@
+# diagnostics.py
+"""Chronométrage des sections du dashboard et export des mesures.
+
+Chaque méthode instrumentée enregistre sa durée (inclusive : une section
+compte aussi les sous-sections qu'elle appelle) dans une fenêtre glissante
+partagée par le processus. Les durées d'un rerun sont en plus totalisées
+pour la session courante : Streamlit exécute chaque rerun dans son thread,
+dont le temps CPU est aussi relevé. Le premier rendu de chaque session (du
+début du script à la fin du rerun) est suivi à part ; celui de la première
+session du processus, qui compte les imports, est conservé comme premier
+rendu à froid.
+"""
+import functools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from caching import (cache_comparaisons, cache_donnees, cache_figures, cache_previsions, cache_scenarios,
+                     cache_sensibilites)
+
+# Durées conservées par section pour les percentiles glissants
+TAILLE_FENETRE = 500
+
+QUANTILES = (50, 95, 99)
+
+# Méthodes de DefenseBricsDashboardAvance chronométrées
+PREFIXES_SECTIONS = ("generate_", "get_cached_data", "get_scenario_bands", "get_comparison_cube",
+                     "get_snapshot_memory", "get_sensitivity_analysis", "get_forecast_models",
+                     "display_", "create_", "render_")
+
+# Mesures du rendu entier, hors du tableau des sections
+MESURES_RENDU = ("rerun", "rerun_cpu", "premier_rendu")
+
+CACHES = {"donnees": cache_donnees, "scenarios": cache_scenarios, "comparaisons": cache_comparaisons,
+          "sensibilites": cache_sensibilites, "previsions": cache_previsions, "figures": cache_figures}
+
+
+class Chronometrage:
+    """Registre des durées par section : fenêtre glissante, cumuls et totaux par rerun"""
+
+    def __init__(self, taille_fenetre=TAILLE_FENETRE):
+        self.taille_fenetre = taille_fenetre
+        self._fenetres = defaultdict(lambda: deque(maxlen=taille_fenetre))
+        self._cumuls = defaultdict(lambda: [0, 0.0])  # nom -> [appels, secondes] depuis le démarrage
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+        self.premier_rendu_froid = None
+
+    def debut_rerun(self):
+        """Ouvre la totalisation d'un rerun pour le thread courant"""
+        self._local.totaux = defaultdict(float)
+        self._local.depart = time.perf_counter()
+        self._local.depart_cpu = time.thread_time()
+
+    def fin_rerun(self):
+        """Ferme le rerun courant et renvoie {'total': s, 'cpu': s, 'sections': {nom: s}}"""
+        totaux = getattr(self._local, "totaux", None)
+        if totaux is None:
+            return {"total": 0.0, "cpu": 0.0, "sections": {}}
+        total = time.perf_counter() - self._local.depart
+        cpu = time.thread_time() - self._local.depart_cpu
+        self._local.totaux = None
+        self.enregistrer("rerun", total)
+        self.enregistrer("rerun_cpu", cpu)
+        return {"total": total, "cpu": cpu, "sections": dict(totaux)}
+
+    def enregistrer(self, nom, duree):
+        with self._verrou:
+            self._fenetres[nom].append(duree)
+            cumul = self._cumuls[nom]
+            cumul[0] += 1
+            cumul[1] += duree
+        totaux = getattr(self._local, "totaux", None)
+        if totaux is not None and nom not in MESURES_RENDU:
+            totaux[nom] += duree
+    
+    def enregistrer_premier_rendu(self, duree):
+        """Premier rendu d'une session ; le premier du processus est aussi retenu comme rendu à froid"""
+        with self._verrou:
+            if self.premier_rendu_froid is None:
+                self.premier_rendu_froid = duree
+        self.enregistrer("premier_rendu", duree)
+        return duree
+
+    @contextmanager
+    def mesure(self, nom):
+        depart = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.enregistrer(nom, time.perf_counter() - depart)
+
+    def statistiques(self):
+        """{nom: appels, total, dernière durée et percentiles glissants (s)}"""
+        with self._verrou:
+            fenetres = {nom: np.array(fenetre) for nom, fenetre in self._fenetres.items()}
+            cumuls = {nom: tuple(cumul) for nom, cumul in self._cumuls.items()}
+        stats = {}
+        for nom, durees in fenetres.items():
+            percentiles = np.percentile(durees, QUANTILES)
+            stats[nom] = {
+                "appels": cumuls[nom][0],
+                "total_s": cumuls[nom][1],
+                "dernier_s": float(durees[-1]),
+                **{f"p{q}_s": float(valeur) for q, valeur in zip(QUANTILES, percentiles)}
+            }
+        return stats
+
+    def reinitialiser(self):
+        with self._verrou:
+            self._fenetres.clear()
+            self._cumuls.clear()
+
+    def exporter_json(self, dernier_rerun=None):
+        """Mesures, dernier rerun et statistiques des caches au format JSON"""
+        return json.dumps({
+            "horodatage": time.time(),
+            "fenetre": self.taille_fenetre,
+            "sections": self.statistiques(),
+            "dernier_rerun": dernier_rerun,
+            "premier_rendu_froid_s": self.premier_rendu_froid,
+            "caches": {nom: cache.statistiques() for nom, cache in CACHES.items()}
+        }, indent=2, ensure_ascii=False)
+
+    def exporter_prometheus(self):
+        """Mesures au format texte d'exposition Prometheus"""
+        stats = self.statistiques()
+        sections = {nom: valeurs for nom, valeurs in sorted(stats.items()) if nom not in MESURES_RENDU}
+        lignes = _resume_prometheus("brics_section_duree_secondes", "Durée inclusive des sections du dashboard",
+                                    {f'section="{_echapper(nom)}"': valeurs for nom, valeurs in sections.items()})
+        if "rerun" in stats:
+            lignes += _resume_prometheus("brics_rerun_duree_secondes", "Durée totale d'un rerun du script",
+                                         {"": stats["rerun"]})
+        if "rerun_cpu" in stats:
+            lignes += _resume_prometheus("brics_rerun_cpu_secondes", "Temps CPU du thread d'un rerun du script",
+                                         {"": stats["rerun_cpu"]})
+        if "premier_rendu" in stats:
+            lignes += _resume_prometheus("brics_premier_rendu_secondes",
+                                         "Délai du premier rendu d'une session, du début du script à la fin du rerun",
+                                         {"": stats["premier_rendu"]})
+        if self.premier_rendu_froid is not None:
+            lignes += ["# HELP brics_premier_rendu_froid_secondes Premier rendu de la première session du processus",
+                       "# TYPE brics_premier_rendu_froid_secondes gauge",
+                       f"brics_premier_rendu_froid_secondes {self.premier_rendu_froid:.6f}"]
+
+        statistiques_caches = {nom: cache.statistiques() for nom, cache in CACHES.items()}
+        for compteur in ("hits", "misses", "evictions_lru", "evictions_ttl", "invalidations"):
+            lignes.append(f"# TYPE brics_cache_{compteur}_total counter")
+            lignes += [f'brics_cache_{compteur}_total{{cache="{nom}"}} {valeurs[compteur]}'
+                       for nom, valeurs in statistiques_caches.items()]
+        for jauge in ("entrees", "octets"):
+            lignes.append(f"# TYPE brics_cache_{jauge} gauge")
+            lignes += [f'brics_cache_{jauge}{{cache="{nom}"}} {valeurs[jauge]}'
+                       for nom, valeurs in statistiques_caches.items()]
+        return "\n".join(lignes) + "\n"
+
+
+def _resume_prometheus(metrique, aide, series):
+    """Lignes d'un résumé Prometheus : quantiles glissants, somme et nombre cumulés"""
+    lignes = [f"# HELP {metrique} {aide}", f"# TYPE {metrique} summary"]
+    for etiquettes, valeurs in series.items():
+        prefixe = etiquettes + "," if etiquettes else ""
+        for q in QUANTILES:
+            lignes.append(f'{metrique}{{{prefixe}quantile="{q / 100}"}} {valeurs[f"p{q}_s"]:.6f}')
+        suffixe = f"{{{etiquettes}}}" if etiquettes else ""
+        lignes.append(f"{metrique}_sum{suffixe} {valeurs['total_s']:.6f}")
+        lignes.append(f"{metrique}_count{suffixe} {valeurs['appels']}")
+    return lignes
+
+
+def _echapper(valeur):
+    return valeur.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registre partagé par toutes les sessions du processus
+chronometrage = Chronometrage()
+
+
+def chronometrer(nom=None, registre=chronometrage):
+    """Décorateur : enregistre la durée de chaque appel sous `nom` (nom de la fonction par défaut)"""
+    def decorateur(fonction):
+        libelle = nom or fonction.__name__
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            with registre.mesure(libelle):
+                return fonction(*args, **kwargs)
+        return enveloppe
+    return decorateur
+
+
+def instrumenter_sections(prefixes=PREFIXES_SECTIONS, registre=chronometrage):
+    """Décorateur de classe : chronomètre toutes les méthodes dont le nom commence par un préfixe"""
+    def decorateur(classe):
+        for nom, attribut in list(vars(classe).items()):
+            if callable(attribut) and nom.startswith(prefixes):
+                setattr(classe, nom, chronometrer(nom, registre)(attribut))
+        return classe
+    return decorateur
@@ -0,0 +1,86 @@
+# downsampling.py
+"""Sous-échantillonnage des séries longues avant envoi au navigateur.
+
+Largest-Triangle-Three-Buckets (LTTB) conserve la forme de la courbe (pics,
+creux, ruptures) avec un budget de points par graphique ; les séries denses
+passent en traces WebGL (Scattergl) plutôt qu'en SVG.
+"""
+import numpy as np
+
+from lazy_imports import importer_differe
+
+go = importer_differe("plotly.graph_objects")
+
+# Points envoyés par graphique, répartis entre ses traces (None : pas de réduction)
+BUDGET_POINTS = 2000
+
+# Au-delà de ce nombre de points bruts, la trace est rendue en WebGL
+SEUIL_WEBGL = 1000
+
+# Taille moyenne de seau jusqu'à laquelle LTTB parcourt les points en Python pur
+TAILLE_SEAU_SCALAIRE = 32
+
+
+def budget_par_trace(n_traces=1):
+    """Part du budget du graphique revenant à chacune de ses traces"""
+    return None if not BUDGET_POINTS else max(BUDGET_POINTS // n_traces, 3)
+
+
+def indices_lttb(x, y, n_points):
+    """Indices des points retenus par LTTB (premier et dernier points toujours conservés)"""
+    n = len(x)
+    if n_points is None or n_points >= n or n_points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # n_points - 2 seaux entre le premier et le dernier point, puis le dernier point seul ;
+    # le sommet de chaque triangle est la moyenne du seau suivant
+    limites = np.append(np.linspace(1, n - 1, n_points - 1).astype(np.int64), n)
+    tailles = np.diff(limites)
+    x_moyens = np.add.reduceat(x, limites[:-1]) / tailles
+    y_moyens = np.add.reduceat(y, limites[:-1]) / tailles
+
+    # Petits seaux : boucle scalaire (moins coûteuse que des opérations NumPy sur quelques points)
+    selection = _selection_scalaire if tailles.mean() <= TAILLE_SEAU_SCALAIRE else _selection_vectorisee
+    indices = selection(x, y, limites, x_moyens, y_moyens)
+    return np.array([0] + indices + [n - 1])
+
+
+def _selection_scalaire(x, y, limites, x_moyens, y_moyens):
+    xs, ys, limites = x.tolist(), y.tolist(), limites.tolist()
+    x_moyens, y_moyens = x_moyens.tolist(), y_moyens.tolist()
+    indices = []
+    xa, ya = xs[0], ys[0]
+    for i in range(len(limites) - 2):
+        dx, dy = xa - x_moyens[i + 1], y_moyens[i + 1] - ya
+        retenu, aire_max = limites[i], -1.0
+        for j in range(limites[i], limites[i + 1]):
+            aire = abs(dx * (ys[j] - ya) - (xa - xs[j]) * dy)
+            if aire > aire_max:
+                retenu, aire_max = j, aire
+        indices.append(retenu)
+        xa, ya = xs[retenu], ys[retenu]
+    return indices
+
+
+def _selection_vectorisee(x, y, limites, x_moyens, y_moyens):
+    indices = []
+    precedent = 0
+    for i in range(len(limites) - 2):
+        debut, fin = limites[i], limites[i + 1]
+        aires = np.abs((x[precedent] - x_moyens[i + 1]) * (y[debut:fin] - y[precedent])
+                       - (x[precedent] - x[debut:fin]) * (y_moyens[i + 1] - y[precedent]))
+        precedent = int(debut + np.argmax(aires))
+        indices.append(precedent)
+    return indices
+
+
+def trace_ligne(x, y, n_traces=1, indices=None, **proprietes):
+    """Trace go.Scatter, ou go.Scattergl si la série est dense, réduite par LTTB au budget"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if indices is None:
+        indices = indices_lttb(x, y, budget_par_trace(n_traces))
+    classe = go.Scattergl if len(x) > SEUIL_WEBGL else go.Scatter
+    return classe(x=x[indices], y=y[indices], **proprietes)
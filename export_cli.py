@@ -0,0 +1,140 @@
+# export_cli.py
+"""Export en flux des indicateurs simulés, sans Streamlit ni navigateur.
+
+Les indicateurs sont calculés et écrits lot par lot : la mémoire reste bornée
+par la taille de lot, même pour des périodes très longues en résolution
+mensuelle. Plusieurs sélections partagent un même fichier (colonne
+`selection`, indicateurs absents laissés vides).
+
+Exemples :
+    python export_cli.py "BRICS - Vue d'Ensemble" Chine --format parquet --sortie brics.parquet
+    python export_cli.py --toutes --debut 1900 --fin 2099 --resolution mensuelle --format csv --sortie -
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from data_layer import get_advanced_config, toutes_les_selections
+from lazy_imports import importer_differe
+from simulation_engine import RESOLUTIONS, axe_temporel_par_lots, noms_indicateurs, simuler_indicateurs
+
+pa = importer_differe("pyarrow")
+
+FORMATS = ("csv", "parquet", "arrow")
+
+
+def schema_export(selections, resolution):
+    """Schéma commun : selection, Annee puis l'union ordonnée des indicateurs"""
+    noms = list(dict.fromkeys(
+        nom for selection in selections for nom in noms_indicateurs(get_advanced_config(selection))
+    ))
+    type_annee = pa.int64() if RESOLUTIONS[resolution] == 1 else pa.float64()
+    champs = [pa.field("selection", pa.string()), pa.field("Annee", type_annee)]
+    return pa.schema(champs + [pa.field(nom, pa.float64()) for nom in noms])
+
+
+def lots_indicateurs(selections, schema, debut, fin, resolution, taille_lot):
+    """Générateur de RecordBatch : une sélection et un lot de pas de temps à la fois"""
+    for selection in selections:
+        config = get_advanced_config(selection)
+        for t in axe_temporel_par_lots(debut, fin, resolution, taille_lot):
+            noms, matrice = simuler_indicateurs(t, config)
+            lignes = dict(zip(noms, matrice))
+            colonnes = [pa.array(np.full(t.size, selection, dtype=object), pa.string()),
+                        pa.array(t, schema.field("Annee").type)]
+            for champ in list(schema)[2:]:
+                valeurs = lignes.get(champ.name)
+                colonnes.append(pa.array(valeurs) if valeurs is not None else pa.nulls(t.size, pa.float64()))
+            yield pa.RecordBatch.from_arrays(colonnes, schema=schema)
+
+
+def ouvrir_ecrivain(format_sortie, sortie, schema):
+    """Écrivain en flux adapté au format ; '-' désigne la sortie standard"""
+    destination = sys.stdout.buffer if sortie == "-" else sortie
+    if format_sortie == "csv":
+        import pyarrow.csv as pcsv
+        return pcsv.CSVWriter(destination, schema)
+    if format_sortie == "parquet":
+        if sortie == "-":
+            raise ValueError("Le format parquet nécessite un fichier de sortie")
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(destination, schema)
+    import pyarrow.ipc as ipc
+    # Format flux sur la sortie standard, format fichier (projetable en mémoire) sinon
+    if sortie == "-":
+        return ipc.new_stream(destination, schema)
+    return ipc.new_file(destination, schema)
+
+
+def exporter(selections, sortie, format_sortie="csv", debut=2000, fin=2027, resolution="annuelle",
+             taille_lot=100_000):
+    """Écrit les indicateurs des sélections en flux ; renvoie le nombre de lignes écrites
+
+    Un fichier de sortie est écrit à côté puis mis en place par os.replace :
+    un export interrompu ne laisse pas de fichier partiel.
+    """
+    schema = schema_export(selections, resolution)
+    n_lignes = 0
+    temporaire = None if sortie == "-" else sortie + ".tmp"
+    ecrivain = ouvrir_ecrivain(format_sortie, temporaire or sortie, schema)
+    try:
+        try:
+            for lot in lots_indicateurs(selections, schema, debut, fin, resolution, taille_lot):
+                ecrivain.write_batch(lot)
+                n_lignes += lot.num_rows
+        finally:
+            ecrivain.close()
+    except BaseException:
+        if temporaire and os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+    if temporaire:
+        os.replace(temporaire, sortie)
+    return n_lignes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], epilog="\n".join(__doc__.splitlines()[7:]),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("selections", nargs="*", help="Sélections à exporter (ex. \"Chine\")")
+    parser.add_argument("--toutes", action="store_true", help="Exporter toutes les sélections du dashboard")
+    parser.add_argument("--debut", type=int, default=2000)
+    parser.add_argument("--fin", type=int, default=2027)
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="annuelle")
+    parser.add_argument("--format", dest="format_sortie", choices=FORMATS, default="csv")
+    parser.add_argument("--sortie", default="-", help="Fichier de sortie ('-' : sortie standard)")
+    parser.add_argument("--taille-lot", type=int, default=100_000, help="Pas de temps calculés par lot")
+    args = parser.parse_args(argv)
+
+    selections = toutes_les_selections() if args.toutes else args.selections
+    if not selections:
+        parser.error("indiquer au moins une sélection ou --toutes")
+    inconnues = [s for s in selections if s not in toutes_les_selections()]
+    if inconnues:
+        parser.error(f"sélections inconnues : {', '.join(inconnues)}")
+    if args.debut > args.fin:
+        parser.error(f"période vide : --debut {args.debut} postérieur à --fin {args.fin}")
+    if args.taille_lot < 1:
+        parser.error(f"--taille-lot doit être au moins 1 (reçu : {args.taille_lot})")
+    if args.format_sortie == "parquet" and args.sortie == "-":
+        parser.error("le format parquet nécessite un fichier de sortie (--sortie)")
+
+    depart = time.perf_counter()
+    try:
+        n_lignes = exporter(selections, args.sortie, args.format_sortie, args.debut, args.fin,
+                            args.resolution, args.taille_lot)
+    except BrokenPipeError:
+        # Lecteur en aval fermé (ex. `| head`) : arrêt silencieux
+        sys.stderr.close()
+        sys.exit(1)
+    print(f"{n_lignes:,} lignes exportées ({args.format_sortie}) en {time.perf_counter() - depart:.2f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
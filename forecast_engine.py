@@ -0,0 +1,155 @@
+# forecast_engine.py
+"""Prévisions des indicateurs au-delà de la période simulée.
+
+Trois modèles sont ajustés à tous les indicateurs d'un coup, sur la matrice
+(temps × indicateur) : tendance linéaire (moindres carrés), saturation vers
+une asymptote (taux de convergence choisi sur une grille, moindres carrés
+pour chaque taux candidat) et lissage exponentiel double de Holt (récurrence
+sur le temps, vectorisée sur les indicateurs et une grille de constantes de
+lissage). Un ajustement garde tout ce qu'il faut pour projeter à n'importe
+quel horizon et niveau de confiance sans réajuster.
+"""
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+MODELES = {
+    "lissage": "Lissage exponentiel (Holt)",
+    "saturation": "Saturation",
+    "tendance": "Tendance linéaire"
+}
+
+NIVEAUX_CONFIANCE = (80, 90, 95)
+
+# Taux de convergence annuels candidats du modèle de saturation
+TAUX_SATURATION = np.geomspace(0.01, 2.0, 48)
+
+# Constantes de lissage candidates (niveau, tendance) du modèle de Holt
+ALPHAS = np.linspace(0.05, 1.0, 20)
+BETAS = np.linspace(0.0, 1.0, 21)
+
+# `parametres` : tableaux propres au modèle ; `sigma` : écart type des résidus par indicateur
+Ajustement = namedtuple("Ajustement", ["modele", "parametres", "sigma"])
+
+Previsions = namedtuple("Previsions", ["indicateurs", "annees", "observations", "pas", "ajustements"])
+
+
+def _moindres_carres(x, y):
+    """Coefficients (p × K) et inverse de X'X (p × p) pour des régresseurs x (T × p) communs aux indicateurs"""
+    inverse = np.linalg.inv(x.T @ x)
+    return inverse @ x.T @ y, inverse
+
+
+def ajuster_tendance(t, y):
+    """Droite de moindres carrés par indicateur, le temps compté depuis la dernière observation"""
+    x = np.column_stack([np.ones_like(t), t - t[-1]])
+    coefficients, inverse = _moindres_carres(x, y)
+    residus = y - x @ coefficients
+    sigma = np.sqrt((residus ** 2).sum(axis=0) / max(len(t) - 2, 1))
+    return Ajustement("tendance", {"coefficients": coefficients, "inverse": inverse, "t_fin": t[-1]}, sigma)
+
+
+def ajuster_saturation(t, y):
+    """y = asymptote + ecart * exp(-taux * (t - t0)), le meilleur taux de la grille par indicateur
+
+    À taux fixé le modèle est linéaire : tous les taux candidats et tous les
+    indicateurs sont ajustés ensemble (taux × paramètre × indicateur).
+    """
+    decroissances = np.exp(-TAUX_SATURATION[:, None] * (t - t[0]))
+    x = np.stack([np.ones_like(decroissances), decroissances], axis=2)
+    inverses = np.linalg.inv(np.einsum("cti,ctj->cij", x, x))
+    coefficients = np.einsum("cij,ctj,tk->cik", inverses, x, y)
+    erreurs = ((y - np.einsum("cti,cik->ctk", x, coefficients)) ** 2).sum(axis=1)
+
+    meilleurs = erreurs.argmin(axis=0)
+    indicateurs = np.arange(y.shape[1])
+    sigma = np.sqrt(erreurs[meilleurs, indicateurs] / max(len(t) - 3, 1))
+    return Ajustement("saturation", {
+        "taux": TAUX_SATURATION[meilleurs],
+        "coefficients": coefficients[meilleurs, :, indicateurs],
+        "inverses": inverses[meilleurs],
+        "t0": t[0]
+    }, sigma)
+
+
+def ajuster_lissage(t, y):
+    """Lissage de Holt (niveau + tendance), constantes choisies par indicateur sur la grille
+
+    Forme à correction d'erreur ; la somme des erreurs de prévision à un pas
+    est accumulée pour chaque couple (alpha, beta) et chaque indicateur.
+    """
+    alpha = np.repeat(ALPHAS, len(BETAS))[:, None]
+    beta = np.tile(BETAS, len(ALPHAS))[:, None] * alpha
+    niveau = np.broadcast_to(y[0], (len(alpha), y.shape[1])).copy()
+    tendance = np.broadcast_to(y[1] - y[0], niveau.shape).copy()
+    erreurs = np.zeros(niveau.shape)
+    for observation in y[1:]:
+        erreur = observation - niveau - tendance
+        erreurs += erreur ** 2
+        niveau += tendance + alpha * erreur
+        tendance += beta * erreur
+
+    meilleurs = erreurs.argmin(axis=0)
+    indicateurs = np.arange(y.shape[1])
+    sigma = np.sqrt(erreurs[meilleurs, indicateurs] / max(len(t) - 3, 1))
+    return Ajustement("lissage", {
+        "alpha": alpha[meilleurs, 0],
+        "beta": beta[meilleurs, 0],
+        "niveau": niveau[meilleurs, indicateurs],
+        "tendance": tendance[meilleurs, indicateurs],
+        "t_fin": t[-1]
+    }, sigma)
+
+
+AJUSTEMENTS = {"lissage": ajuster_lissage, "saturation": ajuster_saturation, "tendance": ajuster_tendance}
+
+
+def ajuster_modeles(t, y, indicateurs):
+    """Ajuste tous les modèles à la matrice (temps × indicateur) des observations"""
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(t) < 4:
+        raise ValueError(f"Au moins 4 observations nécessaires pour ajuster les modèles (reçu : {len(t)})")
+    pas = float(np.min(np.diff(t)))
+    return Previsions(tuple(indicateurs), t, y, pas,
+                      {modele: ajuster(t, y) for modele, ajuster in AJUSTEMENTS.items()})
+
+
+def projeter(ajustement, t_futur, pas=1.0):
+    """Prévision centrale et écart type de prévision (indicateur × horizon) aux dates t_futur"""
+    t_futur = np.asarray(t_futur, dtype=float)
+    p = ajustement.parametres
+    if ajustement.modele == "tendance":
+        x = np.column_stack([np.ones_like(t_futur), t_futur - p["t_fin"]])
+        centre = (x @ p["coefficients"]).T
+        facteur = 1 + np.einsum("hi,ij,hj->h", x, p["inverse"], x)[None, :]
+    elif ajustement.modele == "saturation":
+        x = np.stack([np.ones((len(p["taux"]), t_futur.size)),
+                      np.exp(-p["taux"][:, None] * (t_futur - p["t0"]))], axis=2)
+        centre = np.einsum("khi,ki->kh", x, p["coefficients"])
+        facteur = 1 + np.einsum("khi,kij,khj->kh", x, p["inverses"], x)
+    elif ajustement.modele == "lissage":
+        # Horizon en pas de la série ; variance de Holt : 1 + somme_{j<h} (alpha + beta * j)^2
+        h = np.rint((t_futur - p["t_fin"]) / pas)
+        centre = p["niveau"][:, None] + h * p["tendance"][:, None]
+        alpha, beta = p["alpha"][:, None], p["beta"][:, None]
+        facteur = 1 + (h - 1) * (alpha ** 2 + alpha * beta * h + beta ** 2 * h * (2 * h - 1) / 6)
+    else:
+        raise ValueError(f"Modèle inconnu : {ajustement.modele!r} (attendu : {', '.join(MODELES)})")
+    return centre, ajustement.sigma[:, None] * np.sqrt(facteur)
+
+
+def prevoir(previsions, modele, horizon, niveau=90):
+    """Dates au-delà de la dernière observation jusqu'à `horizon`, prévision centrale et intervalle
+
+    Renvoie (t_futur, centre, bas, haut), les trois matrices (indicateur × horizon) ;
+    les indicateurs étant des quantités positives, prévision et intervalle sont bornés à 0.
+    """
+    if niveau not in NIVEAUX_CONFIANCE:
+        raise ValueError(f"Niveau de confiance non proposé : {niveau} (attendu : {NIVEAUX_CONFIANCE})")
+    n_pas = int(round((horizon + 1 - previsions.pas - previsions.annees[-1]) / previsions.pas))
+    t_futur = previsions.annees[-1] + previsions.pas * np.arange(1, max(n_pas, 0) + 1)
+    centre, ecart = projeter(previsions.ajustements[modele], t_futur, previsions.pas)
+    z = NormalDist().inv_cdf(0.5 + niveau / 200)
+    return t_futur, np.maximum(centre, 0.0), np.maximum(centre - z * ecart, 0.0), np.maximum(centre + z * ecart, 0.0)
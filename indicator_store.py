@@ -0,0 +1,125 @@
+# indicator_store.py
+"""Magasin colonnaire des indicateurs simulés, projeté en mémoire.
+
+Chaque indicateur d'une sélection est un fichier .npy contigu couvrant toute
+la plage du magasin ; une fenêtre d'années n'est qu'une tranche de la
+projection, sans copie. Les pages sont partagées par le cache du système
+entre sessions et processus : la mémoire résidente ne croît ni avec le
+nombre de sessions ni avec la longueur des séries demandées.
+"""
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unicodedata
+
+import numpy as np
+
+from caching import empreinte, empreinte_sources
+from simulation_engine import (COEFFICIENTS, GROUPES, RAMPES, RESOLUTIONS, axe_temporel_par_lots,
+                               noms_indicateurs, simuler_indicateurs)
+
+RACINE_MAGASIN = os.environ.get(
+    "BRICS_MAGASIN",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "indicateurs")
+)
+
+VERSION_FORMAT = 1
+
+# Modules dont le code détermine les colonnes : les modifier change de répertoire
+MODULES_MODELE = ("simulation_engine.py",)
+
+# Plage couverte : toute fenêtre incluse est servie par simple tranche
+DEBUT_MAGASIN = 1900
+FIN_MAGASIN = 2099
+
+
+class MagasinIndicateurs:
+    """Une colonne .npy par indicateur, sélection et résolution, projetée une fois par processus"""
+
+    def __init__(self, racine=RACINE_MAGASIN, debut=DEBUT_MAGASIN, fin=FIN_MAGASIN):
+        self.racine = racine
+        self.debut = debut
+        self.fin = fin
+        # Un modèle modifié (paramètres ou code) écrit dans un autre répertoire : les colonnes
+        # périmées sont ignorées
+        self.signature = empreinte({
+            "format": VERSION_FORMAT, "plage": [debut, fin], "sources": empreinte_sources(MODULES_MODELE),
+            "rampes": RAMPES, "coefficients": COEFFICIENTS, "groupes": GROUPES
+        })
+        self._projections = {}  # repertoire -> {nom: tableau projeté en lecture seule}
+        self._verrou = threading.Lock()
+
+    def couvre(self, debut, fin, resolution):
+        return bool(self.racine) and resolution in RESOLUTIONS and self.debut <= debut <= fin <= self.fin
+
+    def repertoire(self, selection, config, resolution):
+        return os.path.join(self.racine, self.signature[:16], resolution,
+                            f"{_slug(selection)}-{empreinte(dict(config))[:12]}")
+
+    def colonnes(self, selection, config, debut, fin, resolution):
+        """{nom: vue en lecture seule} sur la fenêtre demandée, ou None hors de la plage du magasin"""
+        if not self.couvre(debut, fin, resolution):
+            return None
+        repertoire = self.repertoire(selection, config, resolution)
+        with self._verrou:
+            projections = self._projections.get(repertoire)
+            if projections is None:
+                if not os.path.isdir(repertoire):
+                    self._construire(repertoire, config, resolution)
+                projections = {
+                    nom: np.load(os.path.join(repertoire, f"{nom}.npy"), mmap_mode="r")
+                    for nom in ["Annee"] + noms_indicateurs(config)
+                }
+                self._projections[repertoire] = projections
+
+        pas = RESOLUTIONS[resolution]
+        fenetre = slice((debut - self.debut) * pas, (fin - self.debut + 1) * pas)
+        return {nom: colonne[fenetre].view(np.ndarray) for nom, colonne in projections.items()}
+
+    def _construire(self, repertoire, config, resolution, taille_lot=100_000):
+        """Écrit les colonnes lot par lot dans un répertoire temporaire, puis le publie atomiquement"""
+        parent = os.path.dirname(repertoire)
+        os.makedirs(parent, exist_ok=True)
+        temporaire = tempfile.mkdtemp(dir=parent, prefix=".construction-")
+        try:
+            n_points = (self.fin - self.debut + 1) * RESOLUTIONS[resolution]
+            type_annee = np.int64 if RESOLUTIONS[resolution] == 1 else np.float64
+            colonnes = {"Annee": _ouvrir(temporaire, "Annee", type_annee, n_points)}
+            premier = 0
+            for t in axe_temporel_par_lots(self.debut, self.fin, resolution, taille_lot):
+                noms, matrice = simuler_indicateurs(t, config)
+                tranche = slice(premier, premier + t.size)
+                colonnes["Annee"][tranche] = t
+                for nom, ligne in zip(noms, matrice):
+                    if nom not in colonnes:
+                        colonnes[nom] = _ouvrir(temporaire, nom, np.float64, n_points)
+                    colonnes[nom][tranche] = ligne
+                premier += t.size
+            for colonne in colonnes.values():
+                colonne.flush()
+            del colonnes
+            try:
+                os.rename(temporaire, repertoire)
+            except OSError:
+                # Publié entre-temps par un autre processus
+                if not os.path.isdir(repertoire):
+                    raise
+        finally:
+            shutil.rmtree(temporaire, ignore_errors=True)
+
+
+def _ouvrir(repertoire, nom, dtype, n_points):
+    return np.lib.format.open_memmap(os.path.join(repertoire, f"{nom}.npy"), mode="w+", dtype=dtype,
+                                     shape=(n_points,))
+
+
+def _slug(texte):
+    """Nom de répertoire ASCII stable pour une sélection"""
+    ascii_ = unicodedata.normalize("NFKD", texte).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "_", ascii_).strip("_") or "selection"
+
+
+# Magasin partagé par toutes les sessions du processus
+magasin_indicateurs = MagasinIndicateurs()
@@ -0,0 +1,220 @@
+# instantane.py
+"""Instantané de la vue par défaut, pour un premier rendu sans calcul.
+
+Écrit à la construction de l'image (`python instantane.py`), un fichier Arrow
+IPC non compressé contient la vue que voit toute nouvelle session : le
+DataFrame de « BRICS - Vue d'Ensemble » et ses bandes Monte Carlo en
+colonnes, les valeurs des cartes KPI et les figures du premier onglet
+(JSON Plotly, gabarit de mise en forme stocké une seule fois) en
+métadonnées. Une nouvelle réplique le projette en mémoire et amorce le graphe
+de recalcul de chaque nouvelle session avec ces valeurs : le premier onglet
+s'affiche sans simulation ni construction de figure.
+
+Usage : python instantane.py [--sortie artifacts/instantane.arrow]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from caching import empreinte, empreinte_sources, etat_fichier
+from data_layer import BRANCHES_OPTIONS, INDICATEURS_KPI, get_advanced_config, index_temporel
+from lazy_imports import importer_differe
+from precompute import N_TRAJECTOIRES, colonne_bande, signature_modele
+from scenario_engine import PERCENTILES, SCENARIOS
+
+pa = importer_differe("pyarrow")
+ipc = importer_differe("pyarrow.ipc")
+go = importer_differe("plotly.graph_objects")
+pio = importer_differe("plotly.io")
+
+CHEMIN_INSTANTANE = os.environ.get(
+    "BRICS_INSTANTANE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "instantane.arrow")
+)
+
+# Contrôles du sidebar au premier rendu d'une session
+CONTROLES_PAR_DEFAUT = {
+    "selection": BRANCHES_OPTIONS[0],
+    "scenario": next(iter(SCENARIOS)),
+    "n_trajectoires": N_TRAJECTOIRES
+}
+
+PERIODE = (2000, 2027, "annuelle")
+
+# Nœuds du graphe de recalcul affichés par le premier onglet
+NOEUDS_FIGURES = ("figure_capacites", "figure_cooperations", "figures_eventails")
+
+# Modules dont le code détermine les figures : les modifier invalide l'instantané
+MODULES_FIGURES = ("Dashboard.py", "downsampling.py", "simulation_engine.py")
+
+_instantanes = {}  # chemin -> (état du fichier, instantané ou None s'il est périmé)
+_verrou_instantane = threading.Lock()
+
+
+def signature_instantane():
+    """Empreinte du modèle, du code des figures et de la version de Plotly"""
+    import plotly
+    return empreinte({"modele": signature_modele(), "sources": empreinte_sources(MODULES_FIGURES),
+                      "plotly": plotly.__version__})
+
+
+def figure_en_dict(fig, gabarits):
+    """Figure -> dict JSON, son gabarit remplacé par sa position dans `gabarits` (dédoublonné)"""
+    donnees = json.loads(pio.to_json(fig, validate=False))
+    gabarit = donnees["layout"].pop("template", None)
+    if gabarit is not None:
+        if gabarit not in gabarits:
+            gabarits.append(gabarit)
+        donnees["layout"]["template"] = gabarits.index(gabarit)
+    return donnees
+
+
+def ecrire_instantane(dashboard, chemin=CHEMIN_INSTANTANE):
+    """Calcule la vue par défaut avec le graphe de recalcul du dashboard et écrit l'instantané"""
+    execution = dashboard.recompute_graph.executer(CONTROLES_PAR_DEFAUT, {})
+    df, _ = execution.valeur("donnees")
+    bandes = execution.valeur("bandes")
+    kpi = execution.valeur("kpi")
+
+    colonnes = {nom: df[nom].to_numpy() for nom in df.columns}
+    for indicateur, valeurs in bandes.items():
+        for percentile, serie in zip(PERCENTILES, valeurs):
+            colonnes[colonne_bande(indicateur, percentile)] = serie
+
+    gabarits, figures = [], {}
+    for nom in NOEUDS_FIGURES:
+        valeur = execution.valeur(nom)
+        liste = isinstance(valeur, list)
+        figures[nom] = {
+            "liste": liste,
+            "figures": [None if fig is None else figure_en_dict(fig, gabarits)
+                        for fig in (valeur if liste else [valeur])]
+        }
+
+    metadonnees = {
+        "signature": signature_instantane(),
+        "controles": json.dumps(CONTROLES_PAR_DEFAUT, ensure_ascii=False),
+        "periode": json.dumps(PERIODE),
+        "bandes": json.dumps(list(bandes)),
+        "kpi": json.dumps({
+            "periode": df.index.get_loc(kpi["periode"]),
+            "reference": df.index.get_loc(kpi["reference"]),
+            **{cle: [kpi[cle][nom] for nom in INDICATEURS_KPI]
+               for cle in ("actuel", "initial", "variation", "croissance_pct")}
+        }),
+        "figures": json.dumps({"gabarits": gabarits, "noeuds": figures}, ensure_ascii=False)
+    }
+    table = pa.table(colonnes).replace_schema_metadata(metadonnees)
+
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    temporaire = chemin + ".tmp"
+    # Sans compression : les colonnes restent directement lisibles depuis le mmap
+    with pa.OSFile(temporaire, "wb") as sortie, ipc.new_file(sortie, table.schema) as ecrivain:
+        ecrivain.write_table(table)
+    os.replace(temporaire, chemin)
+    return os.path.getsize(chemin)
+
+
+class Instantane:
+    """Instantané projeté en mémoire ; les valeurs des nœuds sont reconstruites une fois par processus"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.table = ipc.open_file(pa.memory_map(chemin, "r")).read_all()
+        self.metadonnees = {cle.decode(): valeur.decode() for cle, valeur in self.table.schema.metadata.items()}
+        self.signature = self.metadonnees["signature"]
+        self.controles = json.loads(self.metadonnees["controles"])
+        self._valeurs = None
+        self._verrou = threading.Lock()
+
+    def valeurs(self):
+        """{nœud: valeur} de la vue par défaut, partagées en lecture seule par les sessions"""
+        with self._verrou:
+            if self._valeurs is None:
+                self._valeurs = self._reconstruire()
+            return self._valeurs
+
+    def _reconstruire(self):
+        periode = json.loads(self.metadonnees["periode"])
+        bandes_noms = json.loads(self.metadonnees["bandes"])
+        colonnes_bandes = {colonne_bande(nom, p) for nom in bandes_noms for p in PERCENTILES}
+        df = self.table.select([nom for nom in self.table.column_names if nom not in colonnes_bandes]).to_pandas()
+        df.index = index_temporel(*periode)
+        bandes = {nom: np.vstack([self.table.column(colonne_bande(nom, p)).to_numpy() for p in PERCENTILES])
+                  for nom in bandes_noms}
+
+        kpi = json.loads(self.metadonnees["kpi"])
+        valeurs_kpi = {"periode": df.index[kpi["periode"]], "reference": df.index[kpi["reference"]]}
+        valeurs_kpi.update((cle, dict(zip(INDICATEURS_KPI, kpi[cle])))
+                           for cle in ("actuel", "initial", "variation", "croissance_pct"))
+
+        valeurs = {
+            "donnees": (df, get_advanced_config(self.controles["selection"])),
+            "bandes": bandes,
+            "kpi": valeurs_kpi
+        }
+        figures = json.loads(self.metadonnees["figures"])
+        for nom, valeur in figures["noeuds"].items():
+            liste = [None if donnees is None else self._figure(donnees, figures["gabarits"])
+                     for donnees in valeur["figures"]]
+            valeurs[nom] = liste if valeur["liste"] else liste[0]
+        return valeurs
+
+    @staticmethod
+    def _figure(donnees, gabarits):
+        # Figure validée à l'écriture de l'instantané : reconstruite sans revalidation
+        if "template" in donnees["layout"]:
+            donnees["layout"]["template"] = gabarits[donnees["layout"]["template"]]
+        return go.Figure(donnees, _validate=False)
+
+    def memoire_graphe(self, graphe):
+        """Mémoire de session du graphe de recalcul, amorcée avec les nœuds de l'instantané
+
+        Chaque nœud est enregistré sous la clé de contrôles qu'il aurait au premier
+        rendu : il n'est repris que si la session démarre sur la vue par défaut.
+        """
+        memoire = {}
+        for nom, valeur in self.valeurs().items():
+            dependances = graphe.dependances(nom)
+            if all(controle in self.controles for controle in dependances):
+                memoire[nom] = (tuple(self.controles[controle] for controle in dependances), valeur)
+        return memoire
+
+
+def charger_instantane(chemin=CHEMIN_INSTANTANE):
+    """Instantané partagé par le processus, ou None s'il est absent ou périmé
+
+    L'état du fichier est vérifié à chaque appel : un instantané reconstruit
+    est relu et sa signature contrôlée à nouveau.
+    """
+    etat = etat_fichier(chemin) if chemin else None
+    with _verrou_instantane:
+        if etat is None:
+            _instantanes.pop(chemin, None)
+            return None
+        connu = _instantanes.get(chemin)
+        if connu is None or connu[0] != etat:
+            instantane = Instantane(chemin)
+            valide = instantane.signature == signature_instantane()
+            connu = _instantanes[chemin] = (etat, instantane if valide else None)
+        return connu[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sortie", default=CHEMIN_INSTANTANE)
+    args = parser.parse_args()
+
+    from Dashboard import DefenseBricsDashboardAvance
+
+    depart = time.perf_counter()
+    taille = ecrire_instantane(DefenseBricsDashboardAvance(), args.sortie)
+    print(f"Vue par défaut écrite dans {args.sortie} ({taille / 1024:.0f} Ko) en {time.perf_counter() - depart:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
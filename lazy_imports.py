@@ -0,0 +1,43 @@
+# lazy_imports.py
+"""Imports différés des bibliothèques lourdes (pandas, plotly).
+
+Le module réel n'est importé qu'au premier accès à l'un de ses attributs,
+c'est-à-dire quand une section en a effectivement besoin.
+"""
+import importlib
+import sys
+import threading
+import types
+
+
+class ModuleDiffere(types.ModuleType):
+    """Mandataire qui importe le module réel au premier accès d'attribut"""
+
+    def __init__(self, nom):
+        super().__init__(nom)
+        self._module = None
+        self._verrou = threading.Lock()
+
+    def _charger(self):
+        if self._module is None:
+            with self._verrou:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attribut):
+        # Appelé uniquement pour les attributs absents du mandataire
+        return getattr(self._charger(), attribut)
+
+    def __dir__(self):
+        return dir(self._charger())
+
+    def __repr__(self):
+        etat = "chargé" if self._module is not None else "différé"
+        return f"<module {self.__name__!r} ({etat})>"
+
+
+def importer_differe(nom):
+    """Renvoie le module s'il est déjà chargé, sinon un mandataire différé"""
+    module = sys.modules.get(nom)
+    return module if module is not None else ModuleDiffere(nom)
@@ -0,0 +1,200 @@
+# precompute.py
+"""Précalcul de toutes les sélections et des bandes de chaque scénario dans un artefact Arrow IPC.
+
+Les indicateurs ne dépendent pas du scénario : chaque sélection occupe une
+seule tranche de lignes, les bandes Monte Carlo de chaque scénario y sont des
+colonnes. Le dashboard projette l'artefact en mémoire (mmap) au démarrage : la première
+requête sur n'importe quelle vue est servie depuis le disque, sans simulation.
+
+Usage : python precompute.py [--sortie artifacts/precalcul.arrow] [--processus N]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import scenario_engine
+import simulation_engine
+from caching import empreinte, empreinte_sources, etat_fichier
+from data_layer import ADVANCED_CONFIGS, CONFIG_PAR_DEFAUT, generer_donnees, index_temporel, toutes_les_selections
+from lazy_imports import importer_differe
+from scenario_engine import INDICATEURS_SCENARIO, PERCENTILES, SCENARIOS, simuler_scenario
+
+pa = importer_differe("pyarrow")
+ipc = importer_differe("pyarrow.ipc")
+
+CHEMIN_ARTEFACT = os.environ.get(
+    "BRICS_PRECALCUL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "precalcul.arrow")
+)
+
+VERSION_FORMAT = 2
+
+# Trajectoires Monte Carlo précalculées (valeur par défaut du sidebar)
+N_TRAJECTOIRES = 10_000
+
+# Modules dont le code détermine les données et les bandes : les modifier invalide l'artefact
+MODULES_MODELE = ("simulation_engine.py", "scenario_engine.py", "data_layer.py")
+
+_artefacts = {}  # chemin -> (état du fichier, artefact ou None s'il est d'une autre version)
+_verrou_artefact = threading.Lock()
+
+
+def signature_modele():
+    """Empreinte des paramètres et du code du modèle : un artefact d'une autre version est ignoré"""
+    return empreinte({
+        "format": VERSION_FORMAT,
+        "sources": empreinte_sources(MODULES_MODELE),
+        "rampes": simulation_engine.RAMPES,
+        "coefficients": simulation_engine.COEFFICIENTS,
+        "configs": [ADVANCED_CONFIGS, CONFIG_PAR_DEFAUT],
+        "scenarios": [SCENARIOS, scenario_engine.ANNEE_PIVOT, scenario_engine.VOLATILITE_HISTORIQUE]
+    })
+
+
+def colonne_bande(indicateur, percentile, scenario=None):
+    """Colonne d'une bande ; préfixée par le scénario dans l'artefact, qui les contient tous"""
+    nom = f"{indicateur}_P{percentile}"
+    return nom if scenario is None else f"{scenario}/{nom}"
+
+
+def calculer_selection(selection, debut, fin, resolution, n_trajectoires):
+    """Colonnes d'une sélection : indicateurs, puis bandes de chaque scénario"""
+    df, _ = generer_donnees(selection, debut, fin, resolution)
+    base = {nom: df[nom].to_numpy() for nom in INDICATEURS_SCENARIO}
+
+    colonnes = {nom: df[nom].to_numpy() for nom in df.columns}
+    for scenario in SCENARIOS:
+        bandes = simuler_scenario(df['Annee'].to_numpy(), base, scenario, n_trajectoires)
+        for indicateur, valeurs in bandes.items():
+            for percentile, serie in zip(PERCENTILES, valeurs):
+                colonnes[colonne_bande(indicateur, percentile, scenario)] = serie
+    return selection, colonnes
+
+
+def precalculer(chemin=CHEMIN_ARTEFACT, processus=None, n_trajectoires=N_TRAJECTOIRES,
+                debut=2000, fin=2027, resolution="annuelle"):
+    """Calcule toutes les sélections sur un pool de processus et écrit l'artefact"""
+    selections = toutes_les_selections()
+    contexte = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processus, mp_context=contexte) as pool:
+        resultats = list(pool.map(
+            calculer_selection,
+            *zip(*[(selection, debut, fin, resolution, n_trajectoires) for selection in selections])
+        ))
+
+    # Une table longue : les lignes de chaque sélection sont contiguës, les
+    # indicateurs absents d'une sélection sont nuls
+    noms = list(dict.fromkeys(nom for _, colonnes in resultats for nom in colonnes))
+    index, debut_ligne = {}, 0
+    for selection, colonnes in resultats:
+        longueur = len(colonnes['Annee'])
+        index[selection] = [debut_ligne, longueur]
+        debut_ligne += longueur
+
+    tableau = {"selection": pa.array([sel for sel, c in resultats for _ in c['Annee']]).dictionary_encode()}
+    for nom in noms:
+        morceaux = [c[nom] if nom in c else np.full(len(c['Annee']), np.nan) for _, c in resultats]
+        valeurs = np.concatenate(morceaux)
+        absents = np.concatenate([np.full(len(c['Annee']), nom not in c) for _, c in resultats])
+        tableau[nom] = pa.array(valeurs, mask=absents)
+
+    metadonnees = {
+        "signature": signature_modele(),
+        "periode": json.dumps([debut, fin, resolution]),
+        "n_trajectoires": str(n_trajectoires),
+        "index": json.dumps(index, ensure_ascii=False)
+    }
+    table = pa.table(tableau).replace_schema_metadata(metadonnees)
+
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    temporaire = chemin + ".tmp"
+    # Sans compression : les colonnes restent directement lisibles depuis le mmap
+    with pa.OSFile(temporaire, "wb") as sortie, ipc.new_file(sortie, table.schema) as ecrivain:
+        ecrivain.write_table(table)
+    os.replace(temporaire, chemin)
+    return len(selections), table.num_rows
+
+
+class ArtefactPrecalcule:
+    """Artefact Arrow IPC projeté en mémoire ; les lectures ne copient que la vue servie"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.table = ipc.open_file(pa.memory_map(chemin, "r")).read_all()
+        metadonnees = {cle.decode(): valeur.decode() for cle, valeur in self.table.schema.metadata.items()}
+        self.signature = metadonnees["signature"]
+        self.periode = tuple(json.loads(metadonnees["periode"]))
+        self.n_trajectoires = int(metadonnees["n_trajectoires"])
+        self.index = json.loads(metadonnees["index"])
+
+    def _tranche(self, selection, debut, fin, resolution):
+        if (debut, fin, resolution) != self.periode:
+            return None
+        position = self.index.get(selection)
+        return self.table.slice(*position) if position else None
+
+    def donnees(self, selection, debut=2000, fin=2027, resolution="annuelle"):
+        """DataFrame des indicateurs d'une sélection, ou None si elle n'est pas précalculée"""
+        tranche = self._tranche(selection, debut, fin, resolution)
+        if tranche is None:
+            return None
+        bandes = {colonne_bande(nom, p, scenario)
+                  for scenario in SCENARIOS for nom in INDICATEURS_SCENARIO for p in PERCENTILES}
+        colonnes = [nom for nom in tranche.column_names[1:]
+                    if nom not in bandes and tranche.column(nom).null_count == 0]
+        df = tranche.select(colonnes).to_pandas()
+        df.index = index_temporel(*self.periode)
+        return df
+
+    def bandes(self, selection, scenario, n_trajectoires, debut=2000, fin=2027, resolution="annuelle"):
+        """Bandes P5/P50/P95 d'une vue, ou None si elles ne sont pas précalculées"""
+        tranche = self._tranche(selection, debut, fin, resolution)
+        if tranche is None or n_trajectoires != self.n_trajectoires or scenario not in SCENARIOS:
+            return None
+        return {
+            nom: np.vstack([tranche.column(colonne_bande(nom, p, scenario)).to_numpy() for p in PERCENTILES])
+            for nom in INDICATEURS_SCENARIO
+        }
+
+
+def charger_artefact(chemin=CHEMIN_ARTEFACT):
+    """Artefact partagé par le processus, ou None s'il est absent ou d'une autre version
+
+    L'état du fichier est vérifié à chaque appel : un artefact reconstruit
+    est relu et sa signature contrôlée à nouveau.
+    """
+    etat = etat_fichier(chemin)
+    with _verrou_artefact:
+        if etat is None:
+            _artefacts.pop(chemin, None)
+            return None
+        connu = _artefacts.get(chemin)
+        if connu is None or connu[0] != etat:
+            artefact = ArtefactPrecalcule(chemin)
+            valide = artefact.signature == signature_modele()
+            connu = _artefacts[chemin] = (etat, artefact if valide else None)
+        return connu[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sortie", default=CHEMIN_ARTEFACT)
+    parser.add_argument("--processus", type=int, default=None, help="Taille du pool (défaut : nombre de CPU)")
+    parser.add_argument("--trajectoires", type=int, default=N_TRAJECTOIRES)
+    args = parser.parse_args()
+
+    depart = time.perf_counter()
+    n_selections, n_lignes = precalculer(args.sortie, args.processus, args.trajectoires)
+    taille = os.path.getsize(args.sortie)
+    print(f"{n_selections} sélections × {len(SCENARIOS)} scénarios, {n_lignes} lignes, {taille / 1024:.0f} Ko "
+          f"écrits dans {args.sortie} en {time.perf_counter() - depart:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# project_index.py
+"""Index inversé des projets de coopération et filtrage par facettes.
+
+Chaque valeur de facette (pays participant, type, statut) et chaque mot-clé
+des détails renvoie la liste triée des projets qui la portent. Un filtre est
+une combinaison de masques booléens ; les comptes par facette et les agrégats
+du treemap sont calculés par bincount sur des codes entiers, sans DataFrame.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+from data_layer import PAYS_MEMBRES
+
+FACETTES = ("pays", "type", "statut")
+
+# Champs des détails indexés en mots-clés, en plus du nom du projet
+CHAMPS_MOTS_CLES = ("frequence", "objectif", "localisation", "domaines", "satellites")
+
+# Facettes à valeur unique, agrégées par codes entiers
+FACETTES_CODEES = ("type", "statut")
+
+# Clés de tri de la liste des projets ; le nom départage les égalités
+TRIS = ("nom", "type", "statut", "pays")
+
+
+def normaliser(texte):
+    """Minuscules sans accents, pour comparer mots-clés et recherche"""
+    return unicodedata.normalize("NFKD", str(texte).lower()).encode("ascii", "ignore").decode("ascii")
+
+
+def mots_cles(texte):
+    """Mots de trois lettres ou plus, normalisés"""
+    return re.findall(r"[a-z0-9]{3,}", normaliser(texte))
+
+
+def pays_participants(pays):
+    """« Chine/Russie/Inde » -> liste des pays ; « Tous » désigne tous les membres"""
+    if pays.strip() == "Tous":
+        return list(PAYS_MEMBRES)
+    return [nom.strip() for nom in re.split(r"[/,]", pays) if nom.strip()]
+
+
+class IndexProjets:
+    """Listes de projets par valeur de facette et par mot-clé"""
+
+    def __init__(self, projets):
+        self.noms = list(projets)
+        self.details = list(projets.values())
+        listes = defaultdict(list)
+        for i, (nom, details) in enumerate(projets.items()):
+            for pays in pays_participants(details.get('pays', '')):
+                listes[("pays", pays)].append(i)
+            listes[("type", details.get('type', 'N/A'))].append(i)
+            listes[("statut", details.get('statut', 'N/A'))].append(i)
+            textes = [nom] + [details[champ] for champ in CHAMPS_MOTS_CLES if champ in details]
+            for mot in set(mots_cles(" ".join(map(str, textes)))):
+                listes[("mot", mot)].append(i)
+
+        self._listes = {cle: np.array(indices, dtype=np.int32) for cle, indices in listes.items()}
+        self.valeurs = {
+            facette: sorted(valeur for f, valeur in self._listes if f == facette) for facette in FACETTES
+        }
+        self.vocabulaire = sorted(valeur for f, valeur in self._listes if f == "mot")
+        self.nombre_pays = np.array([len(pays_participants(details.get('pays', ''))) for details in self.details],
+                                    dtype=np.int64)
+        self.codes = {}
+        for facette in FACETTES_CODEES:
+            codes = np.empty(len(self.noms), dtype=np.int32)
+            for code, valeur in enumerate(self.valeurs[facette]):
+                codes[self._listes[(facette, valeur)]] = code
+            self.codes[facette] = codes
+
+        # Rang alphabétique de chaque projet, base de toutes les clés de tri
+        self.rang_noms = np.empty(len(self.noms), dtype=np.int64)
+        self.rang_noms[sorted(range(len(self.noms)), key=lambda i: normaliser(self.noms[i]))] = np.arange(len(self.noms))
+
+    def __len__(self):
+        return len(self.noms)
+
+    def _masque(self, cles):
+        """Projets portant au moins une des clés (union des listes)"""
+        masque = np.zeros(len(self.noms), dtype=bool)
+        for cle in cles:
+            liste = self._listes.get(cle)
+            if liste is not None:
+                masque[liste] = True
+        return masque
+
+    def _masques(self, filtres, recherche):
+        """Un masque par facette filtrée, et un par mot recherché (préfixe)"""
+        masques = {}
+        for facette in FACETTES:
+            valeurs = (filtres or {}).get(facette)
+            if valeurs:
+                masques[facette] = self._masque((facette, valeur) for valeur in valeurs)
+        for mot in mots_cles(recherche):
+            debut = bisect.bisect_left(self.vocabulaire, mot)
+            fin = bisect.bisect_left(self.vocabulaire, mot + "\x7f")
+            masques[f"mot:{mot}"] = self._masque(("mot", m) for m in self.vocabulaire[debut:fin])
+        return masques
+
+    def _combiner(self, masques, sauf=None):
+        masque = np.ones(len(self.noms), dtype=bool)
+        for nom, m in masques.items():
+            if nom != sauf:
+                masque &= m
+        return masque
+
+    def selection(self, filtres=None, recherche=""):
+        """Indices des projets satisfaisant toutes les facettes (OU au sein d'une facette) et la recherche"""
+        return np.flatnonzero(self._combiner(self._masques(filtres, recherche)))
+
+    def comptes_facettes(self, filtres=None, recherche=""):
+        """{facette: {valeur: nombre}} : chaque facette est comptée sous les filtres des autres"""
+        masques = self._masques(filtres, recherche)
+        comptes = {}
+        for facette in FACETTES:
+            masque = self._combiner(masques, sauf=facette)
+            if facette in self.codes:
+                nombres = np.bincount(self.codes[facette][masque], minlength=len(self.valeurs[facette]))
+                comptes[facette] = dict(zip(self.valeurs[facette], nombres.tolist()))
+            else:
+                comptes[facette] = {valeur: int(np.count_nonzero(masque[self._listes[(facette, valeur)]]))
+                                    for valeur in self.valeurs[facette]}
+        return comptes
+
+    def trier(self, indices, cle="nom", decroissant=False):
+        """Indices réordonnés selon la clé de tri (voir TRIS), sans toucher aux détails des projets"""
+        n = len(self.noms)
+        if cle == "nom":
+            rangs = self.rang_noms[indices]
+        elif cle == "pays":
+            rangs = self.nombre_pays[indices] * n + self.rang_noms[indices]
+        else:
+            rangs = self.codes[cle][indices].astype(np.int64) * n + self.rang_noms[indices]
+        ordre = np.argsort(rangs)
+        return indices[ordre[::-1] if decroissant else ordre]
+
+    def agregats(self, indices):
+        """Nombre de projets par (type, statut), pour le treemap"""
+        types, statuts = self.valeurs["type"], self.valeurs["statut"]
+        combines = self.codes["type"][indices].astype(np.int64) * len(statuts) + self.codes["statut"][indices]
+        nombres = np.bincount(combines, minlength=len(types) * len(statuts))
+        return [
+            {'Type': types[code // len(statuts)], 'Statut': statuts[code % len(statuts)], 'Projets': int(nombre)}
+            for code, nombre in enumerate(nombres.tolist()) if nombre
+        ]
+
+
+_index = None
+_verrou_index = threading.Lock()
+
+
+def index_projets(projets):
+    """Index partagé par le processus, reconstruit seulement quand la source renvoie d'autres données"""
+    global _index
+    with _verrou_index:
+        if _index is None or _index[0] is not projets:
+            _index = (projets, IndexProjets(projets))
+        return _index[1]
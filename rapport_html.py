@@ -0,0 +1,334 @@
+# rapport_html.py
+"""Rapport HTML autonome de tous les onglets du dashboard, lisible sans serveur.
+
+Chaque onglet est construit par les méthodes du dashboard elles-mêmes, avec
+Streamlit remplacé par un enregistreur qui conserve cartes, métriques,
+colonnes et figures. Les onglets sont répartis sur un pool de processus :
+chacun construit ses figures et les sérialise en JSON. Le fichier produit
+embarque plotly.js une seule fois ; les figures sont tracées à l'ouverture,
+au fur et à mesure qu'elles arrivent à l'écran.
+
+Exemples :
+    python rapport_html.py --sortie rapport.html
+    python rapport_html.py --selection Chine --scenario "Expansion BRICS+" --processus 4 --sortie chine.html
+"""
+import argparse
+import html
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import Dashboard
+from data_layer import BRANCHES_OPTIONS, toutes_les_selections
+from lazy_imports import importer_differe
+from precompute import N_TRAJECTOIRES
+from scenario_engine import SCENARIOS
+
+pio = importer_differe("plotly.io")
+plotly_offline = importer_differe("plotly.offline")
+
+CDN_PLOTLY = "https://cdn.plot.ly/plotly-{version}.min.js"
+
+CSS_RAPPORT = """
+<style>
+    body { font-family: "Source Sans Pro", sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; color: #31333F; }
+    nav { display: flex; flex-wrap: wrap; gap: 0.5rem 1.5rem; margin-bottom: 1rem; }
+    nav a { color: #0055A4; text-decoration: none; font-weight: bold; }
+    .meta { text-align: center; color: #666; }
+    .rapport-section { border-top: 1px solid #ddd; padding-top: 1rem; }
+    .rapport-colonnes { display: flex; gap: 1rem; }
+    .rapport-colonnes > div { min-width: 0; }
+    .rapport-metrique .valeur { font-size: 1.8rem; }
+    .rapport-metrique .delta { color: #09AB3B; }
+    .rapport-metrique .delta.negatif { color: #FF2B2B; }
+    .rapport-info { background: #E8F1FB; padding: 0.8rem 1rem; border-radius: 8px; }
+    .rapport-legende { color: #808495; font-size: 0.9rem; }
+</style>
+"""
+
+# Les figures sont tracées quand elles approchent de la zone visible
+SCRIPT_FIGURES = """
+<script>
+(function () {
+    function tracer(div) {
+        var figure = JSON.parse(document.getElementById(div.id + "-json").textContent);
+        Plotly.newPlot(div, figure.data, figure.layout, {responsive: true, displaylogo: false});
+    }
+    var figures = document.querySelectorAll(".rapport-figure");
+    if (!("IntersectionObserver" in window)) {
+        figures.forEach(tracer);
+        return;
+    }
+    var observateur = new IntersectionObserver(function (entrees) {
+        entrees.forEach(function (entree) {
+            if (entree.isIntersecting) {
+                observateur.unobserve(entree.target);
+                tracer(entree.target);
+            }
+        });
+    }, {rootMargin: "600px"});
+    figures.forEach(function (div) { observateur.observe(div); });
+})();
+</script>
+"""
+
+
+class Conteneur:
+    """Zone de page enregistrée (page, colonne, barre latérale) : mêmes appels que Streamlit"""
+
+    def __init__(self, rendu):
+        self._rendu = rendu
+        self.blocs = []
+
+    def __enter__(self):
+        self._rendu.pile.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        self._rendu.pile.pop()
+        return False
+
+    def markdown(self, texte, unsafe_allow_html=False, **kwargs):
+        self.blocs.append(("html" if unsafe_allow_html else "markdown", texte))
+
+    def caption(self, texte, **kwargs):
+        self.blocs.append(("legende", texte))
+
+    def info(self, texte, **kwargs):
+        self.blocs.append(("info", texte))
+
+    def metric(self, libelle, valeur, delta=None, **kwargs):
+        self.blocs.append(("metrique", libelle, valeur, delta))
+
+    def plotly_chart(self, figure, **kwargs):
+        self.blocs.append(("figure", figure))
+
+    def columns(self, spec, **kwargs):
+        largeurs = [1] * spec if isinstance(spec, int) else list(spec)
+        colonnes = [Conteneur(self._rendu) for _ in largeurs]
+        self.blocs.append(("colonnes", largeurs, colonnes))
+        return colonnes
+
+    def expander(self, *args, **kwargs):
+        return self
+
+    # Widgets : valeur par défaut, comme au premier rendu d'une session
+    def selectbox(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def select_slider(self, label, options=(), value=None, **kwargs):
+        return list(options)[0] if value is None else value
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return min_value if value is None else value
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def toggle(self, label, value=False, **kwargs):
+        return value
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return list(default or [])
+
+    def number_input(self, label, min_value=None, max_value=None, value="min", **kwargs):
+        return min_value if value == "min" else value
+
+    def text_input(self, label, value="", **kwargs):
+        return value
+
+    def dataframe(self, *args, **kwargs):
+        pass
+
+    def download_button(self, *args, **kwargs):
+        return False
+
+
+class RenduRapport:
+    """Remplace le module streamlit du dashboard : les appels vont au conteneur ouvert"""
+
+    def __init__(self):
+        self.page = Conteneur(self)
+        self.sidebar = Conteneur(self)
+        self.session_state = {}
+        self.pile = [self.page]
+
+    def __getattr__(self, nom):
+        return getattr(self.pile[-1], nom)
+
+
+def construire_section(indice, section, selection, scenario, n_trajectoires):
+    """(indice, section, fragment HTML, nombre de figures, secondes) d'un onglet, figures sérialisées"""
+    depart = time.perf_counter()
+    rendu = RenduRapport()
+    streamlit = Dashboard.st
+    Dashboard.st = rendu
+    try:
+        dashboard = Dashboard.DefenseBricsDashboardAvance()
+        controls = dashboard.create_advanced_sidebar()
+        controls.update(selection=selection, scenario=scenario, n_trajectoires=n_trajectoires)
+        df, config = dashboard.get_cached_data(selection)
+        dashboard.render_section(section, df, config, controls)
+    finally:
+        Dashboard.st = streamlit
+    figures = []
+    fragment = html_blocs(rendu.page.blocs, f"fig-{indice}", figures)
+    return indice, section, fragment, len(figures), time.perf_counter() - depart
+
+
+def html_blocs(blocs, prefixe, figures):
+    """HTML des blocs enregistrés ; chaque figure est sérialisée et ajoutée à `figures`"""
+    morceaux = []
+    for bloc in blocs:
+        genre = bloc[0]
+        if genre == "html":
+            morceaux.append(bloc[1])
+        elif genre == "markdown":
+            morceaux.append(html_markdown(bloc[1]))
+        elif genre == "legende":
+            morceaux.append(f'<p class="rapport-legende">{html.escape(bloc[1])}</p>')
+        elif genre == "info":
+            morceaux.append(f'<div class="rapport-info">{html.escape(bloc[1])}</div>')
+        elif genre == "metrique":
+            _, libelle, valeur, delta = bloc
+            classe = "delta negatif" if str(delta).startswith("-") else "delta"
+            morceaux.append(
+                f'<div class="rapport-metrique"><div>{html.escape(libelle)}</div>'
+                f'<div class="valeur">{html.escape(str(valeur))}</div>'
+                + (f'<div class="{classe}">{html.escape(str(delta))}</div>' if delta is not None else "")
+                + "</div>"
+            )
+        elif genre == "figure":
+            morceaux.append(html_figure(bloc[1], f"{prefixe}-{len(figures)}"))
+            figures.append(bloc[1])
+        elif genre == "colonnes":
+            _, largeurs, colonnes = bloc
+            morceaux.append('<div class="rapport-colonnes">' + "".join(
+                f'<div style="flex: {largeur}">{html_blocs(colonne.blocs, prefixe, figures)}</div>'
+                for largeur, colonne in zip(largeurs, colonnes)
+            ) + "</div>")
+    return "\n".join(morceaux)
+
+
+def html_markdown(texte):
+    """Markdown simple des sections : titres « # » et paragraphes, texte échappé"""
+    texte = texte.strip()
+    titre = re.match(r"(#{1,6})\s+(.*)", texte)
+    if titre:
+        niveau = len(titre.group(1))
+        return f"<h{niveau}>{html.escape(titre.group(2))}</h{niveau}>"
+    return f"<p>{html.escape(texte)}</p>"
+
+
+def html_figure(fig, identifiant):
+    """Emplacement de la figure et ses données JSON (« </ » échappé pour rester dans le script)"""
+    donnees = pio.to_json(fig, validate=False).replace("</", "<\\/")
+    hauteur = fig.layout.height or 450
+    return (f'<div class="rapport-figure" id="{identifiant}" style="min-height: {hauteur}px"></div>\n'
+            f'<script type="application/json" id="{identifiant}-json">{donnees}</script>')
+
+
+def script_plotly(plotlyjs):
+    """plotly.js une seule fois pour tout le rapport : intégré (hors ligne) ou depuis le CDN"""
+    if plotlyjs == "cdn":
+        version = plotly_offline.get_plotlyjs_version()
+        return f'<script src="{CDN_PLOTLY.format(version=version)}" charset="utf-8"></script>'
+    return f'<script type="text/javascript">{plotly_offline.get_plotlyjs()}</script>'
+
+
+def assembler(sections, selection, scenario, n_trajectoires, plotlyjs="inline"):
+    """Document HTML complet : en-tête, sommaire puis un bloc par onglet"""
+    sommaire = "".join(f'<a href="#section-{indice}">{html.escape(section)}</a>'
+                       for indice, section, _ in sections)
+    corps = "".join(
+        f'<section class="rapport-section" id="section-{indice}">'
+        f"<h2>{html.escape(section)}</h2>\n{fragment}</section>\n"
+        for indice, section, fragment in sections
+    )
+    meta = (f"Sélection : {selection} • Scénario : {scenario} • {n_trajectoires:,} trajectoires Monte Carlo"
+            f" • Généré le {datetime.now():%d/%m/%Y %H:%M}")
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Analyse Stratégique Avancée - BRICS</title>
+{Dashboard.CSS_DASHBOARD}
+{CSS_RAPPORT}
+{script_plotly(plotlyjs)}
+</head>
+<body>
+<h1 class="main-header">🌍 ANALYSE STRATÉGIQUE AVANCÉE - BRICS</h1>
+<p class="meta">{html.escape(meta)}</p>
+<nav>{sommaire}</nav>
+{corps}
+{SCRIPT_FIGURES}
+</body>
+</html>
+"""
+
+
+def generer_rapport(chemin, selection=BRANCHES_OPTIONS[0], scenario=next(iter(SCENARIOS)),
+                    n_trajectoires=N_TRAJECTOIRES, processus=None, plotlyjs="inline"):
+    """Écrit le rapport de tous les onglets ; renvoie {'sections', 'figures', 'octets', 'secondes'}
+
+    Par défaut un processus par cœur ; avec un seul, les onglets sont construits
+    dans le processus courant, sans pool.
+    """
+    depart = time.perf_counter()
+    sections = Dashboard.DefenseBricsDashboardAvance().sections_options
+    taches = [(indice, section, selection, scenario, n_trajectoires) for indice, section in enumerate(sections)]
+    processus = min(processus or os.cpu_count() or 1, len(taches))
+    if processus == 1:
+        resultats = [construire_section(*tache) for tache in taches]
+    else:
+        # spawn : chaque processus importe le dashboard et construit ses onglets de bout en bout
+        contexte = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processus, mp_context=contexte) as pool:
+            resultats = list(pool.map(construire_section, *zip(*taches)))
+
+    document = assembler([(indice, section, fragment) for indice, section, fragment, _, _ in resultats],
+                         selection, scenario, n_trajectoires, plotlyjs)
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        fichier.write(document)
+    return {
+        "sections": {section: secondes for _, section, _, _, secondes in resultats},
+        "figures": sum(n_figures for _, _, _, n_figures, _ in resultats),
+        "octets": os.path.getsize(chemin),
+        "secondes": time.perf_counter() - depart
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], epilog="\n".join(__doc__.splitlines()[9:]),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--selection", default=BRANCHES_OPTIONS[0], help="Sélection analysée")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), default=next(iter(SCENARIOS)))
+    parser.add_argument("--trajectoires", type=int, default=N_TRAJECTOIRES, help="Trajectoires Monte Carlo")
+    parser.add_argument("--processus", type=int, default=None, help="Processus de construction (1 : sans pool)")
+    parser.add_argument("--plotlyjs", choices=("inline", "cdn"), default="inline",
+                        help="plotly.js intégré au fichier (hors ligne) ou chargé depuis le CDN")
+    parser.add_argument("--sortie", default="rapport_brics.html")
+    args = parser.parse_args(argv)
+
+    if args.selection not in toutes_les_selections():
+        parser.error(f"sélection inconnue : {args.selection}")
+
+    stats = generer_rapport(args.sortie, args.selection, args.scenario, args.trajectoires, args.processus,
+                            args.plotlyjs)
+    for section, secondes in stats["sections"].items():
+        print(f"  {section:<36}{secondes * 1e3:>8.0f} ms", file=sys.stderr)
+    print(f"{args.sortie} : {len(stats['sections'])} onglets, {stats['figures']} figures, "
+          f"{stats['octets'] / 1e6:.1f} Mo en {stats['secondes']:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
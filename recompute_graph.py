@@ -0,0 +1,107 @@
+# recompute_graph.py
+"""Graphe de recalcul incrémental des données et figures du dashboard.
+
+Chaque nœud déclare les contrôles du sidebar et les nœuds parents dont il
+dépend. Sa clé est la valeur de tous les contrôles qu'il atteint (directement
+ou via ses parents) : si elle n'a pas changé depuis le rerun précédent de la
+session, la valeur mémorisée est reprise sans recalcul.
+"""
+from collections import namedtuple
+
+Noeud = namedtuple("Noeud", ["nom", "calcul", "controles", "parents", "arguments"])
+
+# Arguments comparés par valeur ; tous les autres (DataFrame, bandes...) par identité
+TYPES_SCALAIRES = (str, int, float, bool, type(None))
+
+
+def memes_arguments(arguments, attendus):
+    """Vrai si les arguments d'un appel sont ceux avec lesquels le nœud est construit"""
+    return len(arguments) == len(attendus) and all(
+        a is b or (isinstance(a, TYPES_SCALAIRES) and isinstance(b, TYPES_SCALAIRES) and a == b)
+        for a, b in zip(arguments, attendus)
+    )
+
+
+class GrapheRecalcul:
+    """Nœuds de calcul et leurs dépendances (contrôles, nœuds parents)"""
+
+    def __init__(self):
+        self.noeuds = {}
+
+    def ajouter(self, nom, calcul, controles=(), parents=(), arguments=None):
+        """Déclare un nœud : calcul(*arguments(**entrées)), ou calcul(**entrées) sans `arguments`
+
+        Les entrées sont les contrôles et les valeurs des parents ; `arguments` les
+        traduit en arguments positionnels de la fonction de construction, que les
+        appelants peuvent comparer aux leurs (ExecutionGraphe.arguments).
+        """
+        inconnus = [parent for parent in parents if parent not in self.noeuds]
+        if inconnus:
+            raise ValueError(f"Nœud {nom!r} : parents non déclarés {inconnus}")
+        self.noeuds[nom] = Noeud(nom, calcul, tuple(controles), tuple(parents), arguments)
+
+    def dependances(self, nom):
+        """Contrôles dont dépend un nœud, directement ou via ses parents (ordre stable)"""
+        noeud = self.noeuds[nom]
+        controles = list(noeud.controles)
+        for parent in noeud.parents:
+            controles.extend(self.dependances(parent))
+        return tuple(dict.fromkeys(controles))
+
+    def affectes(self, controles_modifies):
+        """Nœuds à recalculer lorsque ces contrôles changent"""
+        modifies = set(controles_modifies)
+        return [nom for nom in self.noeuds if modifies.intersection(self.dependances(nom))]
+
+    def executer(self, controls, memoire):
+        """Exécution d'un rerun ; `memoire` (état de session) conserve les valeurs entre reruns"""
+        return ExecutionGraphe(self, controls, memoire)
+
+
+class ExecutionGraphe:
+    """Évaluation paresseuse des nœuds pour un rerun, avec compteurs de réutilisation"""
+
+    def __init__(self, graphe, controls, memoire):
+        self.graphe = graphe
+        self.controls = controls
+        self.memoire = memoire  # nom -> (cle, valeur)
+        self.recalcules = []
+        self.reutilises = []
+        self._resolus = {}
+
+    def valeur(self, nom):
+        """Valeur du nœud, recalculée uniquement si l'un de ses contrôles a changé"""
+        if nom in self._resolus:
+            return self._resolus[nom]
+        noeud = self.graphe.noeuds[nom]
+        cle = tuple(self.controls[controle] for controle in self.graphe.dependances(nom))
+
+        precedent = self.memoire.get(nom)
+        if precedent is not None and precedent[0] == cle:
+            valeur = precedent[1]
+            self.reutilises.append(nom)
+        else:
+            entrees = self._entrees(noeud)
+            valeur = noeud.calcul(*noeud.arguments(**entrees)) if noeud.arguments else noeud.calcul(**entrees)
+            self.memoire[nom] = (cle, valeur)
+            self.recalcules.append(nom)
+        self._resolus[nom] = valeur
+        return valeur
+
+    def _entrees(self, noeud):
+        entrees = {controle: self.controls[controle] for controle in noeud.controles}
+        entrees.update((parent, self.valeur(parent)) for parent in noeud.parents)
+        return entrees
+
+    def arguments(self, nom):
+        """Arguments de construction du nœud sur ce rerun, ou None s'il n'en déclare pas"""
+        noeud = self.graphe.noeuds[nom]
+        return noeud.arguments(**self._entrees(noeud)) if noeud.arguments else None
+
+    def compteurs(self):
+        """Nœuds réutilisés, recalculés et non demandés sur ce rerun"""
+        return {
+            "reutilises": len(self.reutilises),
+            "recalcules": len(self.recalcules),
+            "non_evalues": len(self.graphe.noeuds) - len(self._resolus)
+        }
@@ -0,0 +1,107 @@
+# records.py
+"""Enregistrements compacts des configurations et des données de référence.
+
+Classes à __slots__ (aucun __dict__ par instance) dont les champs catégoriels
+(pays, type, statut, nucléaire, priorités) sont internés : toutes les
+occurrences d'une même valeur partagent un seul objet chaîne, qu'elles
+viennent du code ou d'une ligne SQLite. Les enregistrements sont immuables,
+donc partagés sans copie, et se lisent comme des dictionnaires en lecture
+seule (get, [], in, dict(...)) ; un champ à None se comporte comme une clé
+absente, comme une colonne NULL de la base.
+"""
+import sys
+from collections.abc import Mapping
+
+
+def interner(valeur):
+    """Chaîne internée ; séquence de chaînes -> tuple interné ; autres valeurs inchangées"""
+    if isinstance(valeur, str):
+        return sys.intern(valeur)
+    if isinstance(valeur, (list, tuple)):
+        return tuple(interner(element) for element in valeur)
+    return valeur
+
+
+class Enregistrement(Mapping):
+    """Champs déclarés dans __slots__, lus comme un dictionnaire en lecture seule"""
+
+    __slots__ = ()
+    # Champs dont les valeurs sont internées
+    CATEGORIELS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._champs = frozenset(cls.__slots__)
+
+    def __init__(self, **champs):
+        inconnus = set(champs) - self._champs
+        if inconnus:
+            raise TypeError(f"{type(self).__name__} : champs inconnus {sorted(inconnus)}")
+        for nom in self.__slots__:
+            valeur = champs.get(nom)
+            if nom in self.CATEGORIELS:
+                valeur = interner(valeur)
+            elif isinstance(valeur, list):
+                valeur = tuple(valeur)
+            object.__setattr__(self, nom, valeur)
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __getitem__(self, nom):
+        valeur = getattr(self, nom) if nom in self._champs else None
+        if valeur is None:
+            raise KeyError(nom)
+        return valeur
+
+    def __iter__(self):
+        return (nom for nom in self.__slots__ if getattr(self, nom) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{nom}={valeur!r}' for nom, valeur in self.items())})"
+
+    def __reduce__(self):
+        return (_reconstruire, (type(self), dict(self)))
+
+
+def _reconstruire(classe, champs):
+    return classe(**champs)
+
+
+class ConfigAvancee(Enregistrement):
+    """Configuration d'une sélection (paramètres du moteur et descriptifs)"""
+
+    __slots__ = ("type", "budget_base", "personnel_base", "exercices_base", "priorites",
+                 "doctrines", "doctrine", "objectifs", "capacites", "projets")
+    CATEGORIELS = ("type", "priorites")
+
+
+class CapaciteMembre(Enregistrement):
+    """Capacités de référence d'un pays membre"""
+
+    __slots__ = ("pays", "budget", "personnel", "nucleaire", "porte_avions", "icbm", "forces", "technologies")
+    CATEGORIELS = ("pays", "nucleaire")
+
+
+class ProjetCooperation(Enregistrement):
+    """Projet de coopération entre membres"""
+
+    __slots__ = ("nom", "pays", "type", "statut", "frequence", "objectif", "localisation", "domaines", "satellites")
+    CATEGORIELS = ("pays", "type", "statut", "frequence")
+
+
+def enregistrements(classe, donnees, cle):
+    """{clé: dict} -> {clé: enregistrement}, la clé étant aussi stockée dans le champ `cle`"""
+    return {interner(nom): classe(**{cle: nom}, **champs) for nom, champs in donnees.items()}
+
+
+def tableau(enregistrements, colonnes):
+    """Colonnes {libellé: [valeurs]} d'un DataFrame dérivé, lues champ par champ
+
+    `colonnes` associe chaque libellé au champ lu ; un champ absent donne None.
+    """
+    return {libelle: [getattr(enregistrement, champ) for enregistrement in enregistrements]
+            for libelle, champ in colonnes.items()}
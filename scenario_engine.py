@@ -0,0 +1,214 @@
+# scenario_engine.py
+"""Moteur de scénarios Monte Carlo pour le sélecteur « Scénario » du sidebar.
+
+Chaque scénario perturbe les trajectoires de référence du moteur de simulation
+par une marche aléatoire log-normale (dérive + volatilité) à partir de l'année
+pivot. Les trajectoires sont tirées par lots vectorisés ; les grands ensembles
+sont répartis sur un pool de processus.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Indicateurs simulés et plafond de chacun (les indicateurs en % sont bornés à 100)
+INDICATEURS_SCENARIO = {
+    "Budget_Defense_Mds": np.inf,
+    "Readiness_Operative": 100.0,
+    "Capacite_Navale": 100.0,
+    "Cyber_Capabilities": 100.0
+}
+
+PERCENTILES = (5, 50, 95)
+
+# Année à partir de laquelle la dérive propre au scénario s'applique
+ANNEE_PIVOT = 2022
+
+# Volatilité annuelle (log) de la période historique, commune à tous les scénarios
+VOLATILITE_HISTORIQUE = 0.01
+
+# Dérive et volatilité annuelles (log) par scénario et par indicateur
+SCENARIOS = {
+    "Coopération Renforcée": {
+        "Budget_Defense_Mds": (0.015, 0.03),
+        "Readiness_Operative": (0.006, 0.015),
+        "Capacite_Navale": (0.010, 0.020),
+        "Cyber_Capabilities": (0.012, 0.020)
+    },
+    "Expansion BRICS+": {
+        "Budget_Defense_Mds": (0.025, 0.04),
+        "Readiness_Operative": (0.004, 0.020),
+        "Capacite_Navale": (0.012, 0.025),
+        "Cyber_Capabilities": (0.010, 0.025)
+    },
+    "Confrontation avec l'Occident": {
+        "Budget_Defense_Mds": (0.035, 0.06),
+        "Readiness_Operative": (0.010, 0.030),
+        "Capacite_Navale": (0.015, 0.035),
+        "Cyber_Capabilities": (0.020, 0.040)
+    },
+    "Autonomie Stratégique": {
+        "Budget_Defense_Mds": (0.010, 0.025),
+        "Readiness_Operative": (0.005, 0.015),
+        "Capacite_Navale": (0.006, 0.020),
+        "Cyber_Capabilities": (0.015, 0.020)
+    }
+}
+
+# Au-delà de ce nombre de valeurs tirées (trajectoires × indicateurs × pas), les lots
+# sont répartis sur le pool de processus
+SEUIL_PARALLELE = 20_000_000
+
+# Trajectoires par lot : borne la mémoire d'un tirage (~45 Mo en float32 sur 2000-2027)
+TAILLE_LOT_MAX = 100_000
+
+# Nombres de trajectoires proposés par le sidebar, jusqu'au maximum autorisé (BRICS_TRAJECTOIRES_MAX) :
+# au-delà d'un lot, les tirages occupent un pool de processus du serveur
+TRAJECTOIRES_MAX = int(os.environ.get("BRICS_TRAJECTOIRES_MAX", TAILLE_LOT_MAX))
+OPTIONS_TRAJECTOIRES = tuple(n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= TRAJECTOIRES_MAX)
+
+# Classes des histogrammes fusionnant les lots, sur ±ECARTS_HISTOGRAMME écarts types
+# de la marche aléatoire : résolution d'environ 0,016 écart type
+CLASSES_HISTOGRAMME = 1024
+ECARTS_HISTOGRAMME = 8.0
+
+_pool = None
+_verrou_pool = threading.Lock()
+
+
+def _obtenir_pool():
+    """Pool de processus partagé, créé au premier grand ensemble"""
+    global _pool
+    with _verrou_pool:
+        if _pool is None:
+            # spawn : pas de fork d'un serveur Streamlit multi-thread
+            contexte = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=contexte)
+            atexit.register(fermer_pool)
+        return _pool
+
+
+def fermer_pool():
+    """Arrête le pool de processus (à la sortie de l'interpréteur)"""
+    global _pool
+    with _verrou_pool:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def parametres_scenario(t, scenario):
+    """Dérive (K, T) et volatilité (K, T) par pas de temps pour un scénario"""
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Scénario inconnu : {scenario!r}")
+    t = np.asarray(t, dtype=float)
+    pas = 1.0 / max(int(round(1 / np.min(np.diff(t)))), 1) if t.size > 1 else 1.0
+    apres_pivot = t >= ANNEE_PIVOT
+
+    derive = np.zeros((len(INDICATEURS_SCENARIO), t.size))
+    volatilite = np.full((len(INDICATEURS_SCENARIO), t.size), VOLATILITE_HISTORIQUE)
+    for k, nom in enumerate(INDICATEURS_SCENARIO):
+        mu, sigma = SCENARIOS[scenario][nom]
+        derive[k, apres_pivot] = mu
+        volatilite[k, apres_pivot] = sigma
+    # Paramètres annuels ramenés au pas de temps (mensuel, trimestriel)
+    return derive * pas, volatilite * np.sqrt(pas)
+
+
+def _marches_lot(derive, volatilite, n, graine):
+    """Tire n marches aléatoires d'un coup : logarithmes des facteurs (n, K, T)"""
+    rng = np.random.default_rng(graine)
+    chocs = rng.standard_normal((n,) + derive.shape, dtype=np.float32)
+    chocs *= volatilite.astype(np.float32)
+    chocs += derive.astype(np.float32)
+    np.cumsum(chocs, axis=2, out=chocs)
+    return chocs
+
+
+def _percentiles_lot(base, derive, volatilite, plafonds, n, graine):
+    """Tire n trajectoires d'un coup et renvoie leurs percentiles (P, K, T)"""
+    chocs = _marches_lot(derive, volatilite, n, graine)
+    np.exp(chocs, out=chocs)
+    chocs *= base.astype(np.float32)
+    np.minimum(chocs, plafonds.astype(np.float32), out=chocs)
+    return np.percentile(chocs, PERCENTILES, axis=0)
+
+
+def _bornes_histogramme(derive, volatilite):
+    """Borne basse et largeur de classe (K, T) des histogrammes, centrés sur la marche moyenne"""
+    moyenne = np.cumsum(derive, axis=1)
+    ecart = np.sqrt(np.cumsum(volatilite ** 2, axis=1))
+    return moyenne - ECARTS_HISTOGRAMME * ecart, 2 * ECARTS_HISTOGRAMME * ecart / CLASSES_HISTOGRAMME
+
+
+def _histogramme_lot(derive, volatilite, n, graine):
+    """Tire n marches aléatoires et renvoie leur histogramme (K, T, classes) en log"""
+    chocs = _marches_lot(derive, volatilite, n, graine)
+    bas, largeur = _bornes_histogramme(derive, volatilite)
+    chocs -= bas.astype(np.float32)
+    chocs /= largeur.astype(np.float32)
+    classes = np.clip(chocs, 0, CLASSES_HISTOGRAMME - 1).astype(np.int64)
+    classes += np.arange(derive.size).reshape(derive.shape) * CLASSES_HISTOGRAMME
+    comptes = np.bincount(classes.ravel(), minlength=derive.size * CLASSES_HISTOGRAMME)
+    return comptes.reshape(derive.shape + (CLASSES_HISTOGRAMME,)).astype(np.int32)
+
+
+def _percentiles_histogramme(comptes, bas, largeur):
+    """Percentiles (P, K, T) des logarithmes d'après l'histogramme fusionné de tous les lots
+
+    Même définition que np.percentile (rang q * (n - 1)), valeurs réparties
+    uniformément dans leur classe.
+    """
+    cumules = np.cumsum(comptes, axis=2)
+    n = cumules[..., -1:]
+    resultats = []
+    for q in PERCENTILES:
+        rang = q / 100 * (n - 1)
+        classe = np.argmax(cumules > rang, axis=2)[..., None]
+        avant = np.take_along_axis(cumules, classe, axis=2) - np.take_along_axis(comptes, classe, axis=2)
+        fraction = (rang - avant + 0.5) / np.take_along_axis(comptes, classe, axis=2)
+        resultats.append(bas + (classe[..., 0] + fraction[..., 0]) * largeur)
+    return np.stack(resultats)
+
+
+def simuler_scenario(t, base, scenario, n_trajectoires=10_000, graine=None):
+    """Bandes P5/P50/P95 de chaque indicateur du scénario : {nom: array (3, T)}
+
+    `base` associe à chaque indicateur de INDICATEURS_SCENARIO sa trajectoire
+    de référence. Les grands ensembles sont découpés en lots indépendants
+    (graines filles d'une même SeedSequence), calculés en parallèle quand
+    l'ensemble est grand. Chaque lot renvoie alors l'histogramme de ses
+    marches aléatoires ; les percentiles sont pris sur la somme des
+    histogrammes, puis ramenés aux indicateurs (transformation croissante :
+    exponentielle, base, plafond).
+    """
+    base = np.vstack([np.asarray(base[nom], dtype=float) for nom in INDICATEURS_SCENARIO])
+    derive, volatilite = parametres_scenario(t, scenario)
+    plafonds = np.array(list(INDICATEURS_SCENARIO.values()))[:, None]
+    if graine is None:
+        # Graine stable par scénario : les bandes sont reproductibles et se mettent en cache
+        graine = zlib.crc32(scenario.encode("utf-8"))
+    sequence = np.random.SeedSequence(graine)
+
+    n_lots = -(-n_trajectoires // TAILLE_LOT_MAX)
+    tailles = np.full(n_lots, n_trajectoires // n_lots)
+    tailles[:n_trajectoires % n_lots] += 1
+    if n_lots == 1:
+        percentiles = _percentiles_lot(base, derive, volatilite, plafonds, n_trajectoires, sequence)
+    else:
+        arguments = [(derive, volatilite, int(taille), graine_lot)
+                     for taille, graine_lot in zip(tailles, sequence.spawn(n_lots))]
+        if (os.cpu_count() or 1) > 1 and n_trajectoires * base.size > SEUIL_PARALLELE:
+            pool = _obtenir_pool()
+            lots = [pool.submit(_histogramme_lot, *args) for args in arguments]
+            comptes = sum(lot.result().astype(np.int64) for lot in lots)
+        else:
+            comptes = sum(_histogramme_lot(*args).astype(np.int64) for args in arguments)
+        logarithmes = _percentiles_histogramme(comptes, *_bornes_histogramme(derive, volatilite))
+        percentiles = np.minimum(base * np.exp(logarithmes), plafonds)
+
+    return {nom: percentiles[:, k, :] for k, nom in enumerate(INDICATEURS_SCENARIO)}
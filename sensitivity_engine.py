@@ -0,0 +1,191 @@
+# sensitivity_engine.py
+"""Analyse de sensibilité des indicateurs aux coefficients du moteur de simulation.
+
+Les paramètres d'un indicateur (croissance et chocs du budget, croissance
+des effectifs, base, pente et plafond des rampes...) sont balayés autour de
+leur valeur nominale sur une grille complète ou un hypercube latin. Toutes
+les évaluations sont faites en un seul calcul NumPy : chaque paramètre
+devient une colonne de valeurs diffusée sur l'axe temporel. Le même lot
+contient les variations un à un de chaque paramètre (diagramme en tornade) ;
+les élasticités sont estimées par moindres carrés sur l'échantillon.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from scenario_engine import PERCENTILES
+from simulation_engine import (COEFFICIENTS, GROUPES, PARAMETRES_PAR_DEFAUT, RAMPES, evaluer_rampes, simuler_budget,
+                               simuler_dissuasion, simuler_exercices, simuler_exercices_conjoints,
+                               simuler_personnel, simuler_pib_militaire, simuler_readiness)
+
+# Paramètres de configuration et coefficients des indicateurs simulés par formule
+PARAMETRES_INDICATEURS = {
+    "Budget_Defense_Mds": ("budget_base", "budget_croissance", "budget_facteur_crise", "budget_facteur_brics"),
+    "Personnel_Milliers": ("personnel_base", "personnel_croissance"),
+    "PIB_Militaire_Pourcent": ("pib_base", "pib_pente"),
+    "Exercices_Militaires": ("exercices_base", "exercices_pente", "exercices_amplitude", "exercices_periode"),
+    "Readiness_Operative": ("readiness_base", "readiness_pente", "readiness_palier_2008", "readiness_palier_2014",
+                            "readiness_palier_2020", "readiness_plafond"),
+    "Capacite_Dissuasion": ("dissuasion_base", "dissuasion_palier_2006", "dissuasion_palier_2014",
+                            "dissuasion_palier_2020", "dissuasion_plafond"),
+    "Exercices_Conjoints": ("conjoints_initial", "conjoints_base_2010", "conjoints_pente_2010",
+                            "conjoints_base_2015", "conjoints_pente_2015")
+}
+
+SIMULATEURS = {
+    "Budget_Defense_Mds": lambda t, parametres: simuler_budget(t, parametres, parametres),
+    "Personnel_Milliers": lambda t, parametres: simuler_personnel(t, parametres, parametres),
+    "PIB_Militaire_Pourcent": lambda t, parametres: simuler_pib_militaire(t, parametres),
+    "Exercices_Militaires": lambda t, parametres: simuler_exercices(t, parametres, parametres),
+    "Readiness_Operative": lambda t, parametres: simuler_readiness(t, parametres),
+    "Capacite_Dissuasion": lambda t, parametres: simuler_dissuasion(t, parametres),
+    "Exercices_Conjoints": lambda t, parametres: simuler_exercices_conjoints(t, parametres)
+}
+
+# Champs des rampes balayés (les bornes infinies sont ignorées)
+CHAMPS_SENSIBLES = ("base", "pente", "plafond", "plancher")
+
+RAMPES_PAR_NOM = {rampe.nom: rampe for rampe in RAMPES}
+
+# Indicateurs dépendant d'au moins un paramètre, dans l'ordre des colonnes du moteur
+INDICATEURS_SENSIBLES = tuple(nom for noms in GROUPES.values() for nom in noms
+                              if nom in PARAMETRES_INDICATEURS or nom in RAMPES_PAR_NOM)
+
+LIBELLES_PARAMETRES = {
+    "budget_base": "Budget initial (Mds)",
+    "budget_croissance": "Croissance du budget",
+    "budget_facteur_crise": "Choc crise 2008-2010",
+    "budget_facteur_brics": "Choc formation BRICS 2014",
+    "personnel_base": "Effectifs initiaux",
+    "personnel_croissance": "Croissance des effectifs",
+    "pib_base": "Part du PIB initiale",
+    "pib_pente": "Pente de la part du PIB",
+    "exercices_base": "Exercices initiaux",
+    "exercices_pente": "Pente des exercices",
+    "exercices_amplitude": "Amplitude saisonnière",
+    "exercices_periode": "Période du cycle",
+    "readiness_base": "Préparation initiale",
+    "readiness_pente": "Pente de la préparation",
+    "readiness_palier_2008": "Palier 2008",
+    "readiness_palier_2014": "Palier 2014",
+    "readiness_palier_2020": "Palier 2020",
+    "readiness_plafond": "Plafond de préparation",
+    "dissuasion_base": "Dissuasion initiale",
+    "dissuasion_palier_2006": "Palier 2006",
+    "dissuasion_palier_2014": "Palier 2014",
+    "dissuasion_palier_2020": "Palier 2020",
+    "dissuasion_plafond": "Plafond de dissuasion",
+    "conjoints_initial": "Exercices conjoints avant 2010",
+    "conjoints_base_2010": "Exercices conjoints en 2010",
+    "conjoints_pente_2010": "Pente 2010-2014",
+    "conjoints_base_2015": "Exercices conjoints en 2015",
+    "conjoints_pente_2015": "Pente depuis 2015",
+    "base": "Valeur initiale",
+    "pente": "Pente annuelle",
+    "plafond": "Plafond",
+    "plancher": "Plancher"
+}
+
+PLANS = {"hypercube": "Hypercube latin", "grille": "Grille complète"}
+
+Sensibilite = namedtuple("Sensibilite", ["indicateur", "parametres", "nominaux", "annees", "reference", "bas", "haut",
+                                         "percentiles", "elasticites", "n_evaluations", "secondes"])
+
+
+def parametres_indicateur(indicateur, config):
+    """Paramètres dont dépend l'indicateur et leur valeur nominale : {nom: valeur}"""
+    if indicateur in PARAMETRES_INDICATEURS:
+        valeurs = {**PARAMETRES_PAR_DEFAUT, **config, **COEFFICIENTS}
+        return {nom: float(valeurs[nom]) for nom in PARAMETRES_INDICATEURS[indicateur]}
+    if indicateur not in RAMPES_PAR_NOM:
+        raise ValueError(f"Indicateur sans paramètre : {indicateur!r}")
+    rampe = RAMPES_PAR_NOM[indicateur]
+    return {champ: float(getattr(rampe, champ)) for champ in CHAMPS_SENSIBLES if np.isfinite(getattr(rampe, champ))}
+
+
+def evaluer(t, indicateur, config, valeurs):
+    """Indicateur pour chaque jeu de paramètres : matrice (évaluation × temps)
+
+    `valeurs` associe à des paramètres de l'indicateur un vecteur de valeurs
+    (une par évaluation) ; les autres gardent leur valeur nominale.
+    """
+    t = np.asarray(t, dtype=float)
+    n = len(next(iter(valeurs.values())))
+    if indicateur in SIMULATEURS:
+        parametres = {**PARAMETRES_PAR_DEFAUT, **config, **COEFFICIENTS,
+                      **{nom: colonne[:, None] for nom, colonne in valeurs.items()}}
+        resultat = SIMULATEURS[indicateur](t, parametres)
+    else:
+        resultat = evaluer_rampes(t, [RAMPES_PAR_NOM[indicateur]._replace(**valeurs)])[0]
+    return np.broadcast_to(resultat, (n, t.size))
+
+
+def plan_hypercube(n, p, graine=0):
+    """Hypercube latin de n points dans [0, 1]^p : une valeur par strate et par paramètre"""
+    rng = np.random.default_rng(graine)
+    strates = rng.permuted(np.tile(np.arange(n), (p, 1)), axis=1).T
+    return (strates + rng.random((n, p))) / n
+
+
+def plan_grille(n, p):
+    """Grille complète d'au plus n points dans [0, 1]^p, autant de niveaux par paramètre"""
+    niveaux = max(int(n ** (1 / p) + 1e-9), 2)
+    axes = [np.linspace(0.0, 1.0, niveaux)] * p
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, p)
+
+
+def estimer_elasticites(x, y, x0, y0):
+    """Élasticités (paramètre × temps) : pentes des variations relatives de y sur celles de x
+
+    Une seule régression par moindres carrés pour tous les pas de temps, par les
+    équations normales (quelques paramètres tirés indépendamment : système bien
+    conditionné) ; NaN là où l'indicateur nominal est nul (rampe avant son origine).
+    """
+    valides = y0 != 0
+    variations_x = np.hstack([x / x0 - 1, np.ones((len(x), 1))])
+    variations_y = y[:, valides] / y0[valides] - 1
+    elasticites = np.full((x.shape[1], y0.size), np.nan)
+    pentes = np.linalg.solve(variations_x.T @ variations_x, variations_x.T @ variations_y)
+    elasticites[:, valides] = pentes[:-1]
+    return elasticites
+
+
+def analyser_sensibilite(indicateur, config, t, plan="hypercube", n_evaluations=100_000, amplitude=0.2, graine=0):
+    """Sensibilité d'un indicateur à ses paramètres, chacun varié de ±amplitude (relative)
+
+    Le lot évalué d'un coup contient la valeur nominale, les variations un à un
+    (borne basse puis haute de chaque paramètre) et l'échantillon du plan.
+    """
+    if plan not in PLANS:
+        raise ValueError(f"Plan inconnu : {plan!r} (attendu : {', '.join(PLANS)})")
+    depart = time.perf_counter()
+    nominaux = parametres_indicateur(indicateur, config)
+    noms = list(nominaux)
+    x0 = np.array([nominaux[nom] for nom in noms])
+    p = len(noms)
+
+    echantillon = plan_hypercube(n_evaluations, p, graine) if plan == "hypercube" else plan_grille(n_evaluations, p)
+    un_a_un = np.full((2 * p + 1, p), 0.5)
+    un_a_un[1 + np.arange(p), np.arange(p)] = 0.0
+    un_a_un[1 + p + np.arange(p), np.arange(p)] = 1.0
+    # Position dans [0, 1] -> valeur : 0.5 est la valeur nominale
+    x = x0 * (1 + amplitude * (2 * np.vstack([un_a_un, echantillon]) - 1))
+    y = evaluer(t, indicateur, config, dict(zip(noms, x.T)))
+
+    reference, bas, haut = y[0], y[1:p + 1], y[p + 1:2 * p + 1]
+    x_plan, y_plan = x[2 * p + 1:], y[2 * p + 1:]
+    return Sensibilite(
+        indicateur=indicateur,
+        parametres=tuple(noms),
+        nominaux=x0,
+        annees=np.asarray(t),
+        reference=reference,
+        bas=bas,
+        haut=haut,
+        # Sélection par ligne temporelle : plus rapide que sur les colonnes de la matrice
+        percentiles=np.percentile(y_plan.T, PERCENTILES, axis=1),
+        elasticites=estimer_elasticites(x_plan, y_plan, x0, reference),
+        n_evaluations=len(y),
+        secondes=time.perf_counter() - depart
+    )
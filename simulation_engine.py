@@ -0,0 +1,283 @@
+# simulation_engine.py
+"""Moteur de simulation vectorisé des indicateurs de défense BRICS.
+
+Tous les indicateurs sont évalués en une passe sous forme d'une matrice
+(indicateur × temps) à partir d'expressions par morceaux masquées.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Nombre de pas de temps par année selon la résolution
+RESOLUTIONS = {
+    "annuelle": 1,
+    "trimestrielle": 4,
+    "mensuelle": 12
+}
+
+# Coefficients des indicateurs dépendant de la configuration
+COEFFICIENTS = {
+    "budget_croissance": 0.055,
+    "budget_facteur_crise": 1.08,    # Crise financière 2008-2010
+    "budget_facteur_brics": 1.10,    # Formation BRICS formelle (2014+)
+    "personnel_croissance": 0.008,
+    "pib_base": 2.2,
+    "pib_pente": 0.12,
+    "exercices_pente": 6.0,
+    "exercices_amplitude": 8.0,
+    "exercices_periode": 4.0,
+    "readiness_base": 65.0,
+    "readiness_pente": 1.8,
+    "readiness_palier_2008": 6.0,
+    "readiness_palier_2014": 5.0,
+    "readiness_palier_2020": 4.0,
+    "readiness_plafond": 90.0,
+    "dissuasion_base": 60.0,
+    "dissuasion_palier_2006": 3.0,
+    "dissuasion_palier_2014": 5.0,
+    "dissuasion_palier_2020": 7.0,
+    "dissuasion_plafond": 88.0,
+    "conjoints_initial": 2.0,       # Avant 2010
+    "conjoints_base_2010": 5.0,
+    "conjoints_pente_2010": 1.0,
+    "conjoints_base_2015": 10.0,
+    "conjoints_pente_2015": 2.0
+}
+
+# Valeurs des paramètres absents de la configuration
+PARAMETRES_PAR_DEFAUT = {
+    "budget_base": 350.0,
+    "personnel_base": 4500,
+    "exercices_base": 120
+}
+
+# Rampe plafonnée : clip(base + pente * (t - origine), plancher, plafond),
+# nulle avant l'origine lorsque `masque` est vrai
+Rampe = namedtuple("Rampe", ["nom", "groupe", "base", "pente", "origine", "plafond", "plancher", "masque"])
+
+CHAMPS_NUMERIQUES = ("base", "pente", "origine", "plafond", "plancher")
+
+RAMPES = [
+    Rampe("Temps_Mobilisation_Jours", "socle", 50, -1.5, 2000, np.inf, 15, False),
+    Rampe("Developpement_Technologique", "socle", 55, 2.8, 2000, 88, -np.inf, False),
+    Rampe("Capacite_Navale", "socle", 45, 3.2, 2000, 85, -np.inf, False),
+    Rampe("Couverture_AD", "socle", 50, 2.5, 2000, 86, -np.inf, False),
+    Rampe("Cooperation_Structured", "socle", 20, 4, 2009, 75, -np.inf, True),
+    Rampe("Cyber_Capabilities", "socle", 50, 3.5, 2000, 87, -np.inf, False),
+    Rampe("Production_Armements", "socle", 60, 2.8, 2000, 89, -np.inf, False),
+    Rampe("Projets_Cooperation", "cooperation", 2, 3, 2009, 25, -np.inf, True),
+    Rampe("Echanges_Technologiques", "cooperation", 10, 4, 2009, 60, -np.inf, True),
+    Rampe("Exercices_BRICS", "cooperation", 1, 2, 2014, 15, -np.inf, True),
+    Rampe("Stock_Ogives_Nucleaires", "nucleaire", 3000, 100, 2000, 6000, -np.inf, False),
+    Rampe("Portee_Missiles_Km", "nucleaire", 2000, 150, 2000, 8000, -np.inf, False),
+    Rampe("Triade_Nucleaire", "nucleaire", 40, 3, 2000, 85, -np.inf, False),
+    Rampe("Porte_Avions", "marine", 1, 0.3, 2000, 6, -np.inf, False),
+    Rampe("Sous_Marins", "marine", 10, 2, 2000, 50, -np.inf, False),
+    Rampe("Projection_Maritime", "marine", 30, 3, 2000, 80, -np.inf, False),
+    Rampe("Recherche_Defense", "innovation", 40, 3.2, 2000, 84, -np.inf, False),
+    Rampe("Technologies_Emergentes", "innovation", 35, 4, 2000, 82, -np.inf, False),
+    Rampe("Exportations_Armes", "innovation", 5, 1.5, 2000, 30, -np.inf, False)
+]
+
+# Ordre des colonnes du DataFrame généré, par groupe
+GROUPES = {
+    "socle": [
+        "Budget_Defense_Mds", "Personnel_Milliers", "PIB_Militaire_Pourcent",
+        "Exercices_Militaires", "Readiness_Operative", "Capacite_Dissuasion",
+        "Temps_Mobilisation_Jours", "Exercices_Conjoints", "Developpement_Technologique",
+        "Capacite_Navale", "Couverture_AD", "Cooperation_Structured",
+        "Cyber_Capabilities", "Production_Armements"
+    ],
+    "cooperation": ["Projets_Cooperation", "Echanges_Technologiques", "Exercices_BRICS"],
+    "nucleaire": ["Stock_Ogives_Nucleaires", "Portee_Missiles_Km", "Triade_Nucleaire"],
+    "marine": ["Porte_Avions", "Sous_Marins", "Projection_Maritime"],
+    "innovation": ["Recherche_Defense", "Technologies_Emergentes", "Exportations_Armes"]
+}
+
+
+def axe_temporel(debut=2000, fin=2027, resolution="annuelle"):
+    """Axe temporel en années fractionnaires, bornes incluses"""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Résolution inconnue : {resolution!r} (attendu : {', '.join(RESOLUTIONS)})")
+    if fin < debut:
+        raise ValueError(f"Période vide : {debut}-{fin}")
+    pas = RESOLUTIONS[resolution]
+    if pas == 1:
+        return np.arange(debut, fin + 1)
+    return debut + np.arange((fin - debut + 1) * pas) / pas
+
+
+def axe_temporel_par_lots(debut=2000, fin=2027, resolution="annuelle", taille_lot=100_000):
+    """Axe temporel découpé en lots successifs, sans matérialiser l'axe complet"""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Résolution inconnue : {resolution!r} (attendu : {', '.join(RESOLUTIONS)})")
+    if fin < debut:
+        raise ValueError(f"Période vide : {debut}-{fin}")
+    pas = RESOLUTIONS[resolution]
+    n_points = (fin - debut + 1) * pas
+    for premier in range(0, n_points, taille_lot):
+        indices = np.arange(premier, min(premier + taille_lot, n_points))
+        yield debut + indices if pas == 1 else debut + indices / pas
+
+
+def noms_indicateurs(config):
+    """Noms des indicateurs produits pour une configuration, dans l'ordre des colonnes"""
+    return [nom for groupe in groupes_actifs(config) for nom in GROUPES[groupe]]
+
+
+def groupes_actifs(config):
+    """Groupes d'indicateurs à produire selon les priorités de la configuration"""
+    priorites = config.get('priorites', [])
+    return ["socle"] + [groupe for groupe in GROUPES if groupe != "socle" and groupe in priorites]
+
+
+def _champs_rampes(rampes):
+    """Champs numériques des rampes empilés (champ × rampe × 1)
+
+    Un champ donné comme vecteur de valeurs (une par évaluation) ajoute un
+    axe : (champ × rampe × évaluation × 1), les autres champs y sont diffusés.
+    """
+    champs = [getattr(r, champ) for champ in CHAMPS_NUMERIQUES for r in rampes]
+    if not any(isinstance(valeur, np.ndarray) for valeur in champs):
+        return np.array(champs, dtype=float).reshape(len(CHAMPS_NUMERIQUES), len(rampes), 1)
+    valeurs = np.broadcast_arrays(*[np.asarray(valeur, dtype=float) for valeur in champs])
+    return np.stack(valeurs).reshape((len(CHAMPS_NUMERIQUES), len(rampes)) + valeurs[0].shape + (1,))
+
+
+def evaluer_rampes(t, rampes=RAMPES):
+    """Évalue toutes les rampes plafonnées en une seule opération matricielle
+
+    Les champs d'une rampe peuvent être des vecteurs de valeurs (une par
+    évaluation) : le résultat est alors un cube (rampe × évaluation × temps).
+    """
+    t = np.asarray(t, dtype=float)
+    base, pente, origine, plafond, plancher = _champs_rampes(rampes)
+    masque = np.array([r.masque for r in rampes]).reshape((len(rampes),) + (1,) * (base.ndim - 1))
+
+    # Opérations en place : une seule matrice (rampe × temps) allouée
+    valeurs = np.empty(np.broadcast_shapes(base.shape, t.shape))
+    np.subtract(t, origine, out=valeurs)
+    valeurs *= pente
+    valeurs += base
+    np.minimum(valeurs, plafond, out=valeurs)
+    np.maximum(valeurs, plancher, out=valeurs)
+    np.copyto(valeurs, 0.0, where=masque & (t < origine))
+    return valeurs
+
+
+def simuler_budget(t, config, coefficients=COEFFICIENTS):
+    """Budget avec chocs géopolitiques (crise 2008-2010, formalisation 2014)"""
+    annee = np.floor(t)
+    base = config.get('budget_base', PARAMETRES_PAR_DEFAUT['budget_base'])
+    budget = base * (1 + coefficients["budget_croissance"] * (t - 2000))
+    facteur = np.select(
+        [(annee >= 2008) & (annee <= 2010), annee >= 2014],
+        [coefficients["budget_facteur_crise"], coefficients["budget_facteur_brics"]],
+        default=1.0
+    )
+    return budget * facteur
+
+
+def simuler_personnel(t, config, coefficients=COEFFICIENTS):
+    """Effectifs en croissance linéaire"""
+    base = config.get('personnel_base', PARAMETRES_PAR_DEFAUT['personnel_base'])
+    return base * (1 + coefficients["personnel_croissance"] * (t - 2000))
+
+
+def simuler_pib_militaire(t, coefficients=COEFFICIENTS):
+    """Pourcentage du PIB consacré à la défense"""
+    return coefficients["pib_base"] + coefficients["pib_pente"] * (t - 2000)
+
+
+def simuler_exercices(t, config, coefficients=COEFFICIENTS):
+    """Exercices militaires avec saisonnalité"""
+    base = config.get('exercices_base', PARAMETRES_PAR_DEFAUT['exercices_base'])
+    return (base + coefficients["exercices_pente"] * (t - 2000)
+            + coefficients["exercices_amplitude"] * np.sin(2 * np.pi * (t - 2000) / coefficients["exercices_periode"]))
+
+
+def simuler_readiness(t, coefficients=COEFFICIENTS):
+    """Préparation opérationnelle : paliers 2008/2014/2020, plafonnée"""
+    c = coefficients
+    base = (c["readiness_base"] + c["readiness_pente"] * (t - 2000) + c["readiness_palier_2008"] * (t >= 2008)
+            + c["readiness_palier_2014"] * (t >= 2014) + c["readiness_palier_2020"] * (t >= 2020))
+    return np.minimum(base, c["readiness_plafond"])
+
+
+def simuler_dissuasion(t, coefficients=COEFFICIENTS):
+    """Capacité de dissuasion : paliers 2006/2014/2020, plafonnée"""
+    c = coefficients
+    base = (c["dissuasion_base"] + c["dissuasion_palier_2006"] * (t >= 2006)
+            + c["dissuasion_palier_2014"] * (t >= 2014) + c["dissuasion_palier_2020"] * (t >= 2020))
+    return np.minimum(base, c["dissuasion_plafond"]).astype(float)
+
+
+def simuler_exercices_conjoints(t, coefficients=COEFFICIENTS):
+    """Exercices conjoints BRICS par paliers"""
+    c = coefficients
+    return np.select(
+        [t < 2010, t < 2015],
+        [c["conjoints_initial"], c["conjoints_base_2010"] + c["conjoints_pente_2010"] * (t - 2010)],
+        default=c["conjoints_base_2015"] + c["conjoints_pente_2015"] * (t - 2015)
+    )
+
+
+def _lignes(t, config, groupes, coefficients):
+    """Séries des indicateurs par nom ; les paramètres de `config` peuvent être des colonnes (diffusion)"""
+    lignes = {
+        "Budget_Defense_Mds": simuler_budget(t, config, coefficients),
+        "Personnel_Milliers": simuler_personnel(t, config, coefficients),
+        "PIB_Militaire_Pourcent": simuler_pib_militaire(t, coefficients),
+        "Exercices_Militaires": simuler_exercices(t, config, coefficients),
+        "Readiness_Operative": simuler_readiness(t, coefficients),
+        "Capacite_Dissuasion": simuler_dissuasion(t, coefficients),
+        "Exercices_Conjoints": simuler_exercices_conjoints(t, coefficients)
+    }
+    rampes = [r for r in RAMPES if r.groupe in groupes]
+    lignes.update(zip([r.nom for r in rampes], evaluer_rampes(t, rampes)))
+    return lignes
+
+
+def simuler_indicateurs(t, config, groupes=None, coefficients=COEFFICIENTS):
+    """Calcule tous les indicateurs sous forme d'une matrice (indicateur × temps)"""
+    t = np.asarray(t, dtype=float)
+    groupes = groupes_actifs(config) if groupes is None else groupes
+    lignes = _lignes(t, config, groupes, coefficients)
+
+    noms = [nom for groupe in groupes for nom in GROUPES[groupe]]
+    matrice = np.empty((len(noms), t.size))
+    for i, nom in enumerate(noms):
+        matrice[i] = lignes[nom]
+    return noms, matrice
+
+
+def simuler_cube(t, configs, coefficients=COEFFICIENTS):
+    """Indicateurs de plusieurs configurations en un seul calcul : cube (configuration × temps × indicateur)
+
+    Les paramètres des configurations sont empilés en colonnes et diffusés sur
+    l'axe temporel ; les indicateurs indépendants de la configuration ne sont
+    calculés qu'une fois, pour l'union des groupes actifs des configurations.
+    Un indicateur hors des groupes actifs d'une configuration vaut NaN, comme
+    une colonne absente de son DataFrame.
+    """
+    t = np.asarray(t, dtype=float)
+    # Seuls les groupes actifs d'au moins une configuration sont calculés
+    actives = {groupe for config in configs for groupe in groupes_actifs(config)}
+    groupes = [groupe for groupe in GROUPES if groupe in actives]
+    parametres = {cle: np.array([config.get(cle, defaut) for config in configs], dtype=float)[:, None]
+                  for cle, defaut in PARAMETRES_PAR_DEFAUT.items()}
+    lignes = _lignes(t, parametres, groupes, coefficients)
+
+    noms = [nom for groupe in groupes for nom in GROUPES[groupe]]
+    cube = np.full((len(configs), len(noms), t.size), np.nan)
+    i = 0
+    for groupe in groupes:
+        # Lignes des seules configurations où le groupe est actif, les autres restent à NaN
+        actives = [k for k, config in enumerate(configs) if groupe in groupes_actifs(config)]
+        membres = slice(None) if len(actives) == len(configs) else actives
+        for nom in GROUPES[groupe]:
+            ligne = lignes[nom]
+            cube[membres, i] = ligne[membres] if np.ndim(ligne) == 2 else ligne
+            i += 1
+    # Vue transposée : axes (configuration, temps, indicateur) sans copie
+    return noms, cube.transpose(0, 2, 1)